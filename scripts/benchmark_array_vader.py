@@ -0,0 +1,98 @@
+import os
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE
+from array_vader import ArrayVader
+from data_store import load_news_data
+
+# Largest accepted difference between the array scorer's and vaderSentiment's scores
+TOLERANCE = 1e-4
+
+# Throughput ArrayVader should reach relative to vaderSentiment
+MIN_SPEEDUP = 10
+
+# Plain words mixed into synthetic headlines
+FILLER_WORDS = ['Apple', 'Tesla', 'shares', 'stock', 'quarter', 'earnings', 'Q2', 'report', 'to', 'the', 'on', 'at',
+                'but', 'least', 'kind', 'of', 'without', 'doubt', 'EPS', 'guidance', '52-Week', 'Highs', 'Friday']
+
+
+def synthetic_headlines(count, seed=0):
+    """
+    Build headlines from lexicon words, boosters, negations and filler words, with some
+    ALL CAPS words and trailing punctuation, for machines without the news feed.
+
+    Args:
+        count (int): Number of headlines.
+        seed (int): Seed of the random choices.
+
+    Returns:
+        pd.Series: Distinct headlines.
+    """
+    rng = np.random.default_rng(seed)
+    lexicon = list(SentimentIntensityAnalyzer().lexicon)
+    vocabulary = np.array(lexicon[::7] + list(BOOSTER_DICT)[::3] + NEGATE[::2] + FILLER_WORDS * 20, dtype=object)
+    headlines = []
+    for length in rng.integers(3, 16, count):
+        words = [w.upper() if rng.random() < 0.05 else w for w in rng.choice(vocabulary, length)]
+        headlines.append(' '.join(words) + rng.choice(['', '', '!', '!!', '?', '.']))
+    return pd.Series(pd.unique(pd.Series(headlines)), dtype=object)
+
+
+def benchmark_array_vader(headlines, tolerance=TOLERANCE, min_speedup=MIN_SPEEDUP):
+    """
+    Score every headline with vaderSentiment and with ArrayVader, and compare the scores
+    and the throughput of both.
+
+    Args:
+        headlines (pd.Series): Distinct headlines to score.
+        tolerance (float): Largest accepted absolute difference per score.
+        min_speedup (float): Expected throughput ratio of ArrayVader over vaderSentiment.
+
+    Returns:
+        dict: Largest difference, number of headlines above the tolerance and speedup.
+    """
+    print(f"Comparing scores on {len(headlines)} distinct headlines")
+
+    start_time = time.perf_counter()
+    array_scores = ArrayVader().polarity_scores(headlines)
+    array_time = time.perf_counter() - start_time
+
+    analyzer = SentimentIntensityAnalyzer()
+    start_time = time.perf_counter()
+    vader_scores = pd.DataFrame([analyzer.polarity_scores(text) for text in headlines])[array_scores.columns]
+    vader_time = time.perf_counter() - start_time
+
+    differences = np.abs(array_scores.to_numpy() - vader_scores.to_numpy())
+    mismatched = np.flatnonzero(differences.max(axis=1) > tolerance)
+    speedup = vader_time / array_time if array_time > 0 else float('inf')
+
+    print(f"vaderSentiment: {len(headlines) / vader_time:,.0f} headlines/s")
+    print(f"ArrayVader:     {len(headlines) / array_time:,.0f} headlines/s ({speedup:.1f}x)")
+    print(f"Largest difference: {differences.max(initial=0):.2e} ({len(mismatched)} headlines above {tolerance})")
+    for i in mismatched[:10]:
+        print(f"  {headlines[i]!r}: {array_scores.iloc[i].tolist()} vs {vader_scores.iloc[i].tolist()}")
+    print(f"Scores {'match' if len(mismatched) == 0 else 'DIFFER'}; speedup "
+          f"{'reaches' if speedup >= min_speedup else 'is BELOW'} {min_speedup}x")
+    return {'largest_difference': differences.max(initial=0), 'mismatched': len(mismatched), 'speedup': speedup}
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Compare ArrayVader with vaderSentiment on the news corpus.')
+    arg_parser.add_argument('--news-file', default=os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv'),
+                            help='Cleaned news CSV whose distinct headlines are scored.')
+    arg_parser.add_argument('--synthetic', type=int, default=None,
+                            help='Score this many synthetic headlines instead of the news file.')
+    args = arg_parser.parse_args()
+
+    if args.synthetic:
+        corpus = synthetic_headlines(args.synthetic)
+    else:
+        news = load_news_data(args.news_file, columns=['headline'])
+        corpus = pd.Series(news['headline'].dropna().astype(str).unique(), dtype=object)
+    benchmark_array_vader(corpus)
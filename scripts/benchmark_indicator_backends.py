@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from indicator_backends import BACKENDS, INDICATORS, get_backend
+
+# Indicator settings of quantitative_analysis, timed per backend
+BENCHMARK_INDICATORS = [
+    ('SMA', {'timeperiod': 20}),
+    ('EMA', {'timeperiod': 20}),
+    ('RSI', {'timeperiod': 14}),
+    ('MACD', {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}),
+    ('BBANDS', {'timeperiod': 20, 'nbdevup': 2, 'nbdevdn': 2, 'matype': 0}),
+    ('ATR', {'timeperiod': 14}),
+    ('STOCH', {'fastk_period': 14, 'slowk_period': 3, 'slowd_period': 3}),
+]
+
+# Series lengths timed: a ticker file, a long daily history, an intraday history
+SERIES_LENGTHS = [2500, 25000, 250000]
+
+
+def time_call(function, repeats):
+    """Best wall time of a call over several repeats, in seconds."""
+    best = float('inf')
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start_time)
+    return best
+
+
+def benchmark_indicator_backends(lengths=SERIES_LENGTHS, seed=0):
+    """
+    Time every indicator on every available backend and print the throughput in
+    million price rows per second.
+
+    Args:
+        lengths (list): Series lengths to time.
+        seed (int): Seed of the random walk.
+
+    Returns:
+        dict: (backend, indicator, length) -> best time in seconds.
+    """
+    backends = []
+    for name in BACKENDS:
+        try:
+            backends.append(get_backend(name))
+        except ImportError:
+            print(f"Backend '{name}' is not available, skipped")
+
+    rng = np.random.default_rng(seed)
+    timings = {}
+    for length in lengths:
+        close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, length)))
+        spread = close * rng.uniform(0.0, 0.03, length)
+        prices = {'High': close + spread, 'Low': close - spread, 'Close': close}
+        repeats = max(3, 250000 // length)
+
+        print(f"\n{length} rows")
+        print(f"{'indicator':<9}" + ''.join(f"{backend.name:>16}" for backend in backends))
+        for indicator, params in BENCHMARK_INDICATORS:
+            inputs = [prices[column] for column in INDICATORS[indicator][0]]
+            row = f"{indicator:<9}"
+            for backend in backends:
+                elapsed = time_call(lambda: backend.compute(indicator, *inputs, **params), repeats)
+                timings[(backend.name, indicator, length)] = elapsed
+                row += f"{length / elapsed / 1e6:>10.1f} Mrow/s"
+            print(row)
+    return timings
+
+
+if __name__ == '__main__':
+    benchmark_indicator_backends()
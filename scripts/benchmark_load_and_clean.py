@@ -0,0 +1,112 @@
+import os
+import sys
+import time
+import argparse
+import tempfile
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from data_sources import LocalMirrorSource, fetch_dataset
+from data_store import save_cleaned_data
+from load_and_clean_data import load_and_clean_data
+from price_cleaning import clean_price_file
+
+# Simulated network latency per downloaded file, in seconds
+FETCH_LATENCY = 0.05
+
+
+class DelayedMirrorSource(LocalMirrorSource):
+    """
+    Local mirror that waits before every copy, standing in for a remote source.
+    """
+
+    def __init__(self, directory, latency=FETCH_LATENCY):
+        super().__init__(directory)
+        self.latency = latency
+
+    def fetch(self, name, output_path):
+        time.sleep(self.latency)
+        super().fetch(name, output_path)
+
+
+def write_mirror(directory, tickers, rows, seed=0):
+    """
+    Write synthetic raw price files <ticker>_historical_data.csv into a mirror directory.
+
+    Returns:
+        list: Dataset names written.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2000-01-03', periods=rows).strftime('%Y-%m-%d')
+    names = []
+    for number in range(tickers):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+        prices = pd.DataFrame({'Date': dates, 'Open': close, 'High': close * 1.01, 'Low': close * 0.99,
+                               'Close': close, 'Adj Close': close, 'Volume': rng.integers(1000, 5000, rows),
+                               'Dividends': 0.0, 'Stock Splits': 0.0})
+        name = f't{number:04d}_historical_data'
+        prices.to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+        names.append(name)
+    return names
+
+
+def serial_load(source, datasets, raw_folder, cleaned_folder):
+    """Fetch, clean and save one file after another, as the loader used to."""
+    for name in datasets:
+        raw_path, _ = fetch_dataset(source, name, os.path.join(raw_folder, f'{name}.csv'))
+        data, _ = clean_price_file(raw_path)
+        save_cleaned_data(data, os.path.join(cleaned_folder, f'{name}.csv'))
+
+
+def benchmark_load_and_clean(tickers=100, rows=2500, latency=FETCH_LATENCY, fetch_workers=8, clean_workers=None):
+    """
+    Time the serial loop against the concurrent fetch-and-clean pipeline on a delayed
+    local mirror, and print the throughput in files per second.
+
+    Args:
+        tickers (int): Number of synthetic price files.
+        rows (int): Rows per file.
+        latency (float): Simulated latency per fetched file, in seconds.
+        fetch_workers (int): Concurrent downloads of the pipeline.
+        clean_workers (int): Cleaning processes of the pipeline (default: one per CPU).
+
+    Returns:
+        dict: 'serial' and 'concurrent' -> wall time in seconds.
+    """
+    timings = {}
+    with tempfile.TemporaryDirectory() as workspace:
+        mirror = os.path.join(workspace, 'mirror')
+        os.makedirs(mirror)
+        datasets = write_mirror(mirror, tickers, rows)
+        source = DelayedMirrorSource(mirror, latency)
+
+        for mode in ['serial', 'concurrent']:
+            raw_folder = os.path.join(workspace, mode, 'raw')
+            cleaned_folder = os.path.join(workspace, mode, 'cleaned')
+            os.makedirs(raw_folder)
+            os.makedirs(cleaned_folder)
+            start_time = time.perf_counter()
+            if mode == 'serial':
+                serial_load(source, datasets, raw_folder, cleaned_folder)
+            else:
+                load_and_clean_data(source=source, datasets=datasets, fetch_workers=fetch_workers,
+                                    clean_workers=clean_workers, raw_folder=raw_folder, cleaned_folder=cleaned_folder,
+                                    manifest_path=os.path.join(workspace, mode, 'manifest.json'))
+            timings[mode] = time.perf_counter() - start_time
+
+    print(f"\n{tickers} files of {rows} rows, {latency * 1000:.0f} ms simulated latency per fetch")
+    for mode, elapsed in timings.items():
+        print(f"{mode:<10} {elapsed:7.2f}s  {tickers / elapsed:7.1f} files/s")
+    print(f"Speed-up: {timings['serial'] / timings['concurrent']:.1f}x")
+    return timings
+
+
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Benchmark serial and concurrent fetch-and-clean.')
+    arg_parser.add_argument('--tickers', type=int, default=100, help='Number of synthetic price files.')
+    arg_parser.add_argument('--rows', type=int, default=2500, help='Rows per price file.')
+    arg_parser.add_argument('--latency', type=float, default=FETCH_LATENCY, help='Seconds of latency per fetch.')
+    args = arg_parser.parse_args()
+    benchmark_load_and_clean(tickers=args.tickers, rows=args.rows, latency=args.latency)
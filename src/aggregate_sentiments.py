@@ -1,7 +1,8 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+from data_store import load_cleaned_data, load_news_data
+from news_index import NewsIndex, merge_on_dates
+from sentiment_scoring import score_headlines
 
 def normalize_dates(news_file, input_folder_stock, output_folder):
     """
@@ -19,24 +20,19 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
     os.makedirs(output_folder, exist_ok=True)
     
     # Load the news data
-    news_df = pd.read_csv(news_file, parse_dates=['date'])
-    news_df['date'] = news_df['date'].dt.normalize()  # Normalize dates to yyyy-mm-dd
+    news_df = load_news_data(news_file, columns=['date', 'headline', 'stock'])
     
-    # Initialize VADER sentiment analyzer
-    analyzer = SentimentIntensityAnalyzer()
-    
-    # Function to calculate sentiment score for each headline
-    def get_sentiment_score(text):
-        sentiment = analyzer.polarity_scores(text)
-        return sentiment['compound']  # We use the 'compound' score for sentiment
-    
-    # Calculate sentiment score for each headline
-    news_df['sentiment_score'] = news_df['headline'].apply(get_sentiment_score)
+    # Calculate VADER sentiment score for each headline (cached scores are reused)
+    news_df['sentiment_score'] = score_headlines(news_df['headline'], implementation='array')['compound']  # We use the 'compound' score for sentiment
 
     # Print sentiment scores for the first few rows
     print("\nSentiment analysis results (headline and sentiment score):")
     print(news_df[['headline', 'sentiment_score']].head())
     
+    # Group the news by ticker once; each stock below takes its slice from the index. The
+    # full timestamps are kept so headlines can be matched to their trading session.
+    news_index = NewsIndex(news_df)
+
     # List all stock files
     stock_files = [f for f in os.listdir(input_folder_stock) if f.endswith('.csv')]
 
@@ -45,21 +41,19 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
         stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
         
         # Load each stock dataset
-        stock_df = pd.read_csv(os.path.join(input_folder_stock, stock_file), parse_dates=['Date'])
+        stock_df = load_cleaned_data(os.path.join(input_folder_stock, stock_file), columns=['Date'])
         stock_df['Date'] = stock_df['Date'].dt.normalize()
 
-        # Filter the news data for the corresponding stock symbol
-        stock_news_df = news_df[news_df['stock'] == stock_symbol]
-        
-        if stock_news_df.empty:
+        # Look up the news data for the corresponding stock symbol
+        if stock_symbol not in news_index:
             print(f"Warning: No news data found for stock {stock_symbol}. Skipping...")
             continue
         
-        # Aggregate sentiment scores by date (compute average daily sentiment score)
-        daily_sentiment_df = stock_news_df.groupby('date')['sentiment_score'].mean().reset_index()
+        # Aggregate sentiment scores by trading session (compute average daily sentiment score)
+        daily_sentiment_df = news_index.session_mean(stock_symbol, 'sentiment_score', stock_df['Date'])
         
         # Merge aggregated sentiment with stock data
-        aligned_df = pd.merge(daily_sentiment_df, stock_df, left_on='date', right_on='Date', how='inner')
+        aligned_df = merge_on_dates(daily_sentiment_df, stock_df, 'date', 'Date')
         
         # Save results into output subfolder
         stock_output_folder = os.path.join(output_folder, stock_symbol)
@@ -67,11 +61,11 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
         
         # Visualization: Group data by quarter for NVDA, else group by month
         if stock_symbol == 'NVDA':
-            aligned_df['period'] = aligned_df['date'].dt.to_period('Q')  # Group by quarter
+            aligned_df['period'] = aligned_df['Date'].dt.to_period('Q')  # Group by quarter
             grouped_counts = aligned_df['period'].value_counts().sort_index()
             x_label = "Quarter"
         else:
-            aligned_df['period'] = aligned_df['date'].dt.to_period('M')  # Group by month
+            aligned_df['period'] = aligned_df['Date'].dt.to_period('M')  # Group by month
             grouped_counts = aligned_df['period'].value_counts().sort_index()
             x_label = "Month"
 
@@ -91,10 +85,11 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
 
         print(f"Normalized data and plot saved for {stock_symbol}.")
 
-# Define file and folder paths
-news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
-input_folder_stock = os.path.join('cleaned_data', 'yfinance_data')
-output_folder = os.path.join('results', 'normalized_dates_with_sentiment')
+if __name__ == '__main__':
+    # Define file and folder paths
+    news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
+    input_folder_stock = os.path.join('cleaned_data', 'yfinance_data')
+    output_folder = os.path.join('results', 'normalized_dates_with_sentiment')
 
-# Run the normalization function
-normalize_dates(news_file, input_folder_stock, output_folder)
+    # Run the normalization function
+    normalize_dates(news_file, input_folder_stock, output_folder)
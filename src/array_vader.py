@@ -0,0 +1,328 @@
+import string
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from vaderSentiment.vaderSentiment import (SentimentIntensityAnalyzer, BOOSTER_DICT, NEGATE, SPECIAL_CASES,
+                                           C_INCR, N_SCALAR)
+
+# Words the VADER rules look for, resolved to token IDs once per corpus
+RULE_WORDS = ['no', 'or', 'nor', 'kind', 'of', 'never', 'so', 'this', 'without', 'doubt', 'least', 'at', 'very', 'but']
+
+# Idioms and multi-word boosters, checked as sequences of token IDs
+PHRASE_BOOSTERS = {phrase: value for phrase, value in BOOSTER_DICT.items() if ' ' in phrase}
+PHRASE_WORDS = sorted({w for phrase in list(SPECIAL_CASES) + list(PHRASE_BOOSTERS) for w in phrase.split(' ')} | set(RULE_WORDS))
+
+# Damping applied to boosters one, two and three words before a lexicon word
+BOOSTER_DAMPING = [1.0, 0.95, 0.9]
+
+
+class ArrayVader:
+    """
+    VADER scorer that works on a whole headline corpus at once.
+
+    The corpus is split into tokens once and every distinct token is resolved to an
+    integer ID; lexicon valences, booster scalars and negation flags live in NumPy arrays
+    indexed by those IDs. VADER's rules (booster and dampener words, ALL CAPS emphasis,
+    "no"/negation handling, "least", idioms, "but" and punctuation emphasis) are applied to
+    all tokens of all headlines as array operations, following vaderSentiment's
+    SentimentIntensityAnalyzer.polarity_scores rule by rule and in the same order.
+    """
+
+    def __init__(self):
+        # Reuse vaderSentiment's own lexicon parsing so both scorers see the same valences
+        analyzer = SentimentIntensityAnalyzer()
+        self.lexicon = analyzer.lexicon
+        self.emojis = analyzer.emojis
+        # VADER replaces emojis character by character, so only one-character entries can match
+        self.emoji_chars = frozenset(c for c in self.emojis if len(c) == 1)
+
+    def _replace_emojis(self, text):
+        """Replace emojis by their descriptions, exactly like polarity_scores does."""
+        text_no_emoji = ''
+        prev_space = True
+        for char in text:
+            if char in self.emojis:
+                if not prev_space:
+                    text_no_emoji += ' '
+                text_no_emoji += self.emojis[char]
+                prev_space = False
+            else:
+                text_no_emoji += char
+                prev_space = char == ' '
+        return text_no_emoji.strip()
+
+    def tokenize(self, texts):
+        """
+        Split a corpus into VADER tokens and map them to integer IDs.
+
+        The split and the encoding of the tokens run in Arrow, whose Unicode whitespace
+        matches str.split(); only the distinct tokens are handled as Python strings.
+
+        Args:
+            texts (list): Headlines as strings (emojis already replaced).
+
+        Returns:
+            tuple: (lengths, token_ids, vocabulary, upper, marks) where `lengths` holds the
+            number of tokens per headline, `token_ids` the lower-cased token ID of every token in
+            corpus order, `vocabulary` the distinct lower-cased tokens, `upper` whether each token
+            is written in ALL CAPS and `marks` its number of '!' and '?' characters.
+        """
+        split = pc.utf8_split_whitespace(pa.array(texts, type=pa.large_string()))
+        tokens = pc.list_flatten(split)
+        parents = pc.list_parent_indices(split).to_numpy()
+
+        # Leading and trailing whitespace leave empty strings that str.split() doesn't produce
+        non_empty = pc.greater(pc.binary_length(tokens), 0)
+        tokens = tokens.filter(non_empty)
+        lengths = np.bincount(parents[non_empty.to_numpy(zero_copy_only=False)], minlength=len(texts))
+        encoded = pc.dictionary_encode(tokens)
+        raw_codes = encoded.indices.to_numpy()
+
+        # Strip punctuation around each distinct token unless that leaves two characters or
+        # fewer (emoticons like ':)' are kept whole)
+        raw_tokens = encoded.dictionary.to_pylist()
+        words = []
+        for token in raw_tokens:
+            stripped = token.strip(string.punctuation)
+            words.append(token if len(stripped) <= 2 else stripped)
+
+        lower_codes, vocabulary = pd.factorize(np.array([w.lower() for w in words], dtype=object))
+        token_ids = lower_codes[raw_codes]
+        upper = np.array([w.isupper() for w in words], dtype=bool)[raw_codes]
+
+        # Punctuation emphasis counts the marks of the whole text, none of which are whitespace
+        marks = np.array([(token.count('!'), token.count('?')) for token in raw_tokens], dtype=float).reshape(-1, 2)[raw_codes]
+        return lengths, token_ids, pd.Index(vocabulary, dtype=object), upper, marks
+
+    def polarity_scores(self, headlines):
+        """
+        Score a corpus of headlines.
+
+        Args:
+            headlines (pd.Series): Headlines as strings.
+
+        Returns:
+            pd.DataFrame: neg/neu/pos/compound columns aligned with `headlines`, rounded like
+            vaderSentiment (3 and 4 decimals).
+        """
+        texts = headlines.to_numpy(dtype=object).tolist()
+
+        # All emojis are non-ASCII, so only those headlines need a closer look
+        for i in np.flatnonzero([not text.isascii() for text in texts]):
+            if not self.emoji_chars.isdisjoint(texts[i]):
+                texts[i] = self._replace_emojis(texts[i])
+
+        lengths, token_ids, vocabulary, upper, marks = self.tokenize(texts)
+        sentiments = self._token_sentiments(lengths, token_ids, vocabulary, upper)
+        scores = self._score_valence(sentiments, lengths, marks)
+        return pd.DataFrame(scores, columns=['neg', 'neu', 'pos', 'compound'], index=headlines.index)
+
+    def _token_sentiments(self, lengths, token_ids, vocabulary, upper):
+        """
+        Compute the valence of every token with VADER's word-level rules.
+
+        Returns:
+            np.ndarray: One valence per token, in corpus order.
+        """
+        n_headlines = len(lengths)
+        n_tokens = len(token_ids)
+        headline = np.repeat(np.arange(n_headlines), lengths)
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if n_headlines else np.zeros(0, dtype=np.int64)
+        position = np.arange(n_tokens) - starts[headline]
+
+        # Per-vocabulary lookup tables; the extra last entry stands for "no token here"
+        none = len(vocabulary)
+        valence = np.array([self.lexicon.get(w, np.nan) for w in vocabulary] + [np.nan])
+        in_lexicon = ~np.isnan(valence)
+        valence = np.nan_to_num(valence)
+        booster = np.array([BOOSTER_DICT.get(w, np.nan) for w in vocabulary] + [np.nan])
+        is_booster = ~np.isnan(booster)
+        booster = np.nan_to_num(booster)
+        negate = set(NEGATE)
+        negation = np.array([w in negate or "n't" in w for w in vocabulary] + [False])
+        word = dict(zip(PHRASE_WORDS, vocabulary.get_indexer(PHRASE_WORDS)))
+
+        # ALL CAPS only counts as emphasis when some, but not all, tokens are capitalized
+        caps_count = np.bincount(headline, weights=upper, minlength=n_headlines)
+        cap_diff = (caps_count > 0) & (caps_count < lengths)
+
+        # Only lexicon words that aren't boosters can carry a valence, so the rules below only
+        # run on those tokens and look their neighbours up by offset
+        idx = np.flatnonzero(in_lexicon[token_ids] & ~is_booster[token_ids])
+        pos = position[idx]
+        length = lengths[headline[idx]]
+
+        def neighbour(offset, values=token_ids, fill=none):
+            target = pos + offset
+            inside = (target >= 0) & (target < length)
+            return np.where(inside, values[np.clip(idx + offset, 0, max(n_tokens - 1, 0))], fill)
+
+        current = token_ids[idx]
+        prev = [neighbour(-1), neighbour(-2), neighbour(-3)]
+        prev_upper = [neighbour(-1, upper, False), neighbour(-2, upper, False), neighbour(-3, upper, False)]
+        next1, next2 = neighbour(1), neighbour(2)
+        cap_diff = cap_diff[headline[idx]]
+
+        # "kind of" carries no valence of its own
+        scored = ~((current == word['kind']) & (next1 == word['of']))
+
+        v = valence[current]
+        v = np.where((current == word['no']) & in_lexicon[next1], 0.0, v)
+        after_no = ((prev[0] == word['no']) | (prev[1] == word['no'])
+                    | ((prev[2] == word['no']) & ((prev[0] == word['or']) | (prev[0] == word['nor']))))
+        v = np.where(after_no, valence[current] * N_SCALAR, v)
+        v = np.where(upper[idx] & cap_diff, np.where(v > 0, v + C_INCR, v - C_INCR), v)
+
+        # Up to three preceding words that aren't lexicon words can boost, dampen or negate
+        for start_i in range(3):
+            p = prev[start_i]
+            active = (p != none) & ~in_lexicon[p]
+
+            scalar = np.where(v < 0, -booster[p], booster[p])
+            caps_booster = is_booster[p] & prev_upper[start_i] & cap_diff
+            scalar = np.where(caps_booster, np.where(v > 0, scalar + C_INCR, scalar - C_INCR), scalar)
+            v = np.where(active, v + scalar * BOOSTER_DAMPING[start_i], v)
+
+            v = np.where(active, self._negation_check(v, start_i, prev, negation, word), v)
+            if start_i == 2:
+                v = np.where(active, self._special_idioms_check(v, current, prev, next1, next2, word), v)
+
+        # "least" before a word negates it, unless it's "at least" or "very least"
+        least = (prev[0] == word['least']) & ~in_lexicon[prev[0]]
+        least &= (prev[1] == none) | ((prev[1] != word['at']) & (prev[1] != word['very']))
+        v = np.where(least, v * N_SCALAR, v)
+
+        sentiments = np.zeros(n_tokens)
+        sentiments[idx[scored]] = v[scored]
+        return self._but_check(sentiments, headline, position, lengths, token_ids == word['but'])
+
+    @staticmethod
+    def _negation_check(v, start_i, prev, negation, word):
+        """Vectorized SentimentIntensityAnalyzer._negation_check for one look-back distance."""
+        so_this = [(p == word['so']) | (p == word['this']) for p in prev]
+        if start_i == 0:
+            return np.where(negation[prev[0]], v * N_SCALAR, v)
+        if start_i == 1:
+            emphasis = (prev[1] == word['never']) & so_this[0]
+            keep = (prev[1] == word['without']) & (prev[0] == word['doubt'])
+            negate = negation[prev[1]]
+        else:
+            emphasis = ((prev[2] == word['never']) & so_this[1]) | so_this[0]
+            keep = (prev[2] == word['without']) & ((prev[1] == word['doubt']) | (prev[0] == word['doubt']))
+            negate = negation[prev[2]]
+        return np.where(emphasis, v * 1.25, np.where(keep, v, np.where(negate, v * N_SCALAR, v)))
+
+    @staticmethod
+    def _special_idioms_check(v, current, prev, next1, next2, word):
+        """Vectorized SentimentIntensityAnalyzer._special_idioms_check."""
+        def matches(sequence, phrase):
+            ids = [word[w] for w in phrase.split(' ')]
+            if len(ids) != len(sequence) or min(ids) < 0:
+                return np.zeros(len(v), dtype=bool)
+            return np.logical_and.reduce([s == i for s, i in zip(sequence, ids)])
+
+        # The first of these sequences found in SPECIAL_CASES sets the valence
+        sequences = [(prev[0], current), (prev[1], prev[0], current), (prev[1], prev[0]),
+                     (prev[2], prev[1], prev[0]), (prev[2], prev[1])]
+        result = v.copy()
+        found = np.zeros(len(v), dtype=bool)
+        for sequence in sequences:
+            for phrase, value in SPECIAL_CASES.items():
+                hit = matches(sequence, phrase) & ~found
+                result[hit] = value
+                found |= hit
+
+        # Idioms starting at the word itself override that (next1/next2 are "none" past the end)
+        for sequence in [(current, next1), (current, next1, next2)]:
+            for phrase, value in SPECIAL_CASES.items():
+                result[matches(sequence, phrase)] = value
+
+        # Multi-word boosters ("kind of", "sort of", ...) right before the word
+        for sequence in [(prev[2], prev[1], prev[0]), (prev[2], prev[1]), (prev[1], prev[0])]:
+            for phrase, value in PHRASE_BOOSTERS.items():
+                result = np.where(matches(sequence, phrase), result + value, result)
+        return result
+
+    @staticmethod
+    def _but_check(sentiments, headline, position, lengths, is_but):
+        """
+        Halve the valence of words before the first "but" and add half to the words after it.
+
+        vaderSentiment locates each word through list.index(), so a valence that also occurs
+        earlier in the headline (or equals an already scaled one) gets scaled at the wrong
+        position. Headlines where that can happen are replayed with the original algorithm.
+        """
+        n_headlines = len(lengths)
+        no_but = np.iinfo(np.int64).max
+        but_position = np.full(n_headlines, no_but)
+        np.minimum.at(but_position, headline[is_but], position[is_but])
+        first_but = but_position[headline]
+        factor = np.where(position < first_but, 0.5, np.where(position > first_but, 1.5, 1.0))
+        scaled = np.where(first_but != no_but, sentiments * factor, sentiments)
+
+        # A collision needs two nonzero valences of one headline where one equals the other
+        # or half or one and a half times the other
+        nonzero = np.flatnonzero((first_but != no_but) & (sentiments != 0))
+        candidates = pd.DataFrame({
+            'headline': np.tile(headline[nonzero], 3),
+            'value': np.concatenate([sentiments[nonzero], sentiments[nonzero] * 0.5, sentiments[nonzero] * 1.5]),
+        })
+        replay = np.unique(candidates['headline'].to_numpy()[candidates.duplicated(keep=False).to_numpy()])
+
+        starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if n_headlines else np.zeros(0, dtype=np.int64)
+        for h in replay:
+            values = sentiments[starts[h]:starts[h] + lengths[h]].tolist()
+            bi = but_position[h]
+            for sentiment in values:
+                si = values.index(sentiment)
+                if si < bi:
+                    values[si] = sentiment * 0.5
+                elif si > bi:
+                    values[si] = sentiment * 1.5
+            scaled[starts[h]:starts[h] + lengths[h]] = values
+        return scaled
+
+    @staticmethod
+    def _score_valence(sentiments, lengths, marks):
+        """
+        Turn token valences into neg/neu/pos/compound per headline (SentimentIntensityAnalyzer.score_valence).
+
+        Returns:
+            np.ndarray: Array of shape (len(lengths), 4).
+        """
+        n_headlines = len(lengths)
+        headline = np.repeat(np.arange(n_headlines), lengths)
+        # bincount adds the weights in corpus order, the same order as VADER's running sums
+        sum_s = np.bincount(headline, weights=sentiments, minlength=n_headlines)
+        pos_sum = np.bincount(headline, weights=np.where(sentiments > 0, sentiments + 1, 0.0), minlength=n_headlines)
+        neg_sum = np.bincount(headline, weights=np.where(sentiments < 0, sentiments - 1, 0.0), minlength=n_headlines)
+        neu_count = np.bincount(headline, weights=sentiments == 0, minlength=n_headlines)
+
+        # Exclamation and question marks add emphasis in the direction of the sentiment
+        ep_count = np.minimum(np.bincount(headline, weights=marks[:, 0], minlength=n_headlines), 4)
+        qm_count = np.bincount(headline, weights=marks[:, 1], minlength=n_headlines)
+        amplifier = ep_count * 0.292 + np.where(qm_count > 3, 0.96, np.where(qm_count > 1, qm_count * 0.18, 0.0))
+
+        sum_s = np.where(sum_s > 0, sum_s + amplifier, np.where(sum_s < 0, sum_s - amplifier, sum_s))
+        compound = np.clip(sum_s / np.sqrt(sum_s * sum_s + 15), -1.0, 1.0)
+
+        abs_neg = np.abs(neg_sum)
+        pos_sum, neg_sum = (np.where(pos_sum > abs_neg, pos_sum + amplifier, pos_sum),
+                            np.where(pos_sum < abs_neg, neg_sum - amplifier, neg_sum))
+        total = pos_sum + np.abs(neg_sum) + neu_count
+        empty = lengths == 0
+        total = np.where(empty, 1.0, total)
+        scores = np.column_stack([np.abs(neg_sum / total), np.abs(neu_count / total), np.abs(pos_sum / total), compound])
+        scores[empty] = 0.0
+
+        # Round like Python's round(); np.round can differ on values within a hair of a tie,
+        # so those few go through round() itself
+        for column, digits in enumerate([3, 3, 3, 4]):
+            values = scores[:, column]
+            scaled = values * 10 ** digits
+            near_tie = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+            rounded = np.round(values, digits)
+            rounded[near_tie] = [round(x, digits) for x in values[near_tie].tolist()]
+            scores[:, column] = rounded
+        return scores
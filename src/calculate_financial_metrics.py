@@ -1,57 +1,34 @@
 import os
-import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
+from data_store import load_cleaned_data
+from panel_metrics import TRADING_DAYS, load_returns_panel, panel_financial_metrics
 
-def calculate_financial_metrics(file_path, output_folder):
+def calculate_financial_metrics(file_path, output_folder, risk_free_rate=0.0, trading_days=TRADING_DAYS):
     """
     Calculate financial metrics, print values to console, create plots, and save as PNG images.
 
     Args:
         file_path (str): Path to the cleaned stock price CSV file.
         output_folder (str): Path to the folder where output PNG files will be saved.
+        risk_free_rate (float): Annual risk-free rate used by the Sharpe and Sortino ratios.
+        trading_days (int): Trading days per year used to annualize returns.
 
     Returns:
         None
     """
-    # Load the CSV file into a DataFrame
-    df = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
+    # Load the date and price columns from the cleaned data store
+    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    df = load_cleaned_data(file_path, columns=['Date'] + required_columns).set_index('Date')
 
     # Ensure necessary columns are present
-    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     if not all(col in df.columns for col in required_columns):
         raise ValueError(f"File '{file_path}' is missing required columns.")
 
     # Calculate returns
     df['Returns'] = df['Close'].pct_change()
 
-    # Calculate financial metrics
-    daily_returns = df['Returns'].dropna()
-    mean_return = daily_returns.mean()
-    volatility = daily_returns.std()
-    annualized_return = mean_return * 252  # Assuming 252 trading days in a year
-    annualized_volatility = volatility * np.sqrt(252)
-    
-    # Sharpe Ratio (assuming risk-free rate is 0)
-    sharpe_ratio = annualized_return / annualized_volatility
-
-    # Sortino Ratio (assuming target return of 0)
-    downside_returns = daily_returns[daily_returns < 0]
-    sortino_ratio = annualized_return / (downside_returns.std() * np.sqrt(252))
-
-    # Max Drawdown
-    cumulative_returns = (1 + daily_returns).cumprod()
-    running_max = cumulative_returns.cummax()
-    drawdown = (cumulative_returns - running_max) / running_max
-    max_drawdown = drawdown.min()
-
-    # Store metrics
-    financial_metrics = {
-        'Sharpe Ratio': sharpe_ratio,
-        'Sortino Ratio': sortino_ratio,
-        'Annualized Volatility': annualized_volatility,
-        'Max Drawdown': max_drawdown
-    }
+    # Calculate all financial metrics in one pass over the returns
+    financial_metrics = panel_financial_metrics(df['Returns'], risk_free_rate, trading_days).iloc[0]
 
     # Print metrics to the console
     stock_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -59,8 +36,9 @@ def calculate_financial_metrics(file_path, output_folder):
     for metric, value in financial_metrics.items():
         print(f"{metric}: {value:.4f}")
 
-    # Convert metrics to a DataFrame
-    metrics_df = pd.DataFrame.from_dict(financial_metrics, orient='index', columns=['Value'])
+    # Convert metrics to a DataFrame; the drawdown duration is in days, not a ratio, so it
+    # is printed but left out of the plot
+    metrics_df = financial_metrics.drop('Max Drawdown Duration').astype(float).to_frame('Value')
 
     # Determine the stock name and create a subfolder for the stock
     stock_output_folder = os.path.join(output_folder, stock_name)
@@ -82,13 +60,40 @@ def calculate_financial_metrics(file_path, output_folder):
 
     print(f"Financial metrics plotted and saved to {output_file}")
 
-# Define the folder paths
-input_folder = os.path.join('cleaned_data', 'yfinance_data')
-output_folder = os.path.join('results', 'financial_metrics')
+def calculate_universe_metrics(input_folder_stock, output_folder, risk_free_rate=0.0, trading_days=TRADING_DAYS):
+    """
+    Calculate the financial metrics of every stock at once from a (date x ticker) returns
+    matrix and save them as one table.
+
+    Args:
+        input_folder_stock (str): Path to the folder containing stock CSV files.
+        output_folder (str): Path to the folder where the CSV file will be saved.
+        risk_free_rate (float): Annual risk-free rate used by the Sharpe and Sortino ratios.
+        trading_days (int): Trading days per year used to annualize returns.
+
+    Returns:
+        pd.DataFrame: One row per stock and one column per metric.
+    """
+    metrics = panel_financial_metrics(load_returns_panel(input_folder_stock), risk_free_rate, trading_days)
+
+    os.makedirs(output_folder, exist_ok=True)
+    output_file = os.path.join(output_folder, 'financial_metrics.csv')
+    metrics.to_csv(output_file)
+    print(metrics.to_string(float_format='{:.4f}'.format))
+    print(f"Financial metrics of {len(metrics)} stocks saved to {output_file}")
+    return metrics
+
+if __name__ == '__main__':
+    # Define the folder paths
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    output_folder = os.path.join('results', 'financial_metrics')
+
+    # Save the metrics of all stocks as one table
+    calculate_universe_metrics(input_folder, output_folder)
 
-# Apply the function to all files in the input folder
-stock_files = [f for f in os.listdir(input_folder) if f.endswith('.csv')]
+    # Apply the function to all files in the input folder
+    stock_files = [f for f in os.listdir(input_folder) if f.endswith('.csv')]
 
-for stock_file in stock_files:
-    file_path = os.path.join(input_folder, stock_file)
-    calculate_financial_metrics(file_path, output_folder)
\ No newline at end of file
+    for stock_file in stock_files:
+        file_path = os.path.join(input_folder, stock_file)
+        calculate_financial_metrics(file_path, output_folder)
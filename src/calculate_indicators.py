@@ -1,11 +1,11 @@
 import os
 import pandas as pd
-import talib
 import matplotlib.pyplot as plt
+from feature_store import IndicatorStore
 
 def apply_ta_indicators_and_save_images(file_path, output_folder):
     """
-    Apply technical analysis indicators using TA-Lib, create plots, and save as PNG images.
+    Apply technical analysis indicators from the indicator store, create plots, and save as PNG images.
 
     Args:
         file_path (str): Path to the cleaned stock price CSV file.
@@ -14,26 +14,28 @@ def apply_ta_indicators_and_save_images(file_path, output_folder):
     Returns:
         None
     """
-    # Load the CSV file into a DataFrame
-    df = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
+    # Load the price data together with its stored indicators
+    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    store = IndicatorStore(file_path)
+    df = store.prices.copy()
 
     # Ensure necessary columns are present
-    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     if not all(col in df.columns for col in required_columns):
         raise ValueError(f"File '{file_path}' is missing required columns.")
 
     # Apply technical indicators
     # 1. Moving Averages
-    df['SMA_20'] = talib.SMA(df['Close'], timeperiod=20)  # Simple Moving Average (20 days)
-    df['EMA_20'] = talib.EMA(df['Close'], timeperiod=20)  # Exponential Moving Average (20 days)
+    df['SMA_20'] = store.get('SMA', timeperiod=20)  # Simple Moving Average (20 days)
+    df['EMA_20'] = store.get('EMA', timeperiod=20)  # Exponential Moving Average (20 days)
 
     # 2. Relative Strength Index (RSI)
-    df['RSI_14'] = talib.RSI(df['Close'], timeperiod=14)
+    df['RSI_14'] = store.get('RSI', timeperiod=14)
 
     # 3. Moving Average Convergence Divergence (MACD)
-    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = talib.MACD(
-        df['Close'], fastperiod=12, slowperiod=26, signalperiod=9
+    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = store.get(
+        'MACD', fastperiod=12, slowperiod=26, signalperiod=9
     )
+    store.save()  # Persist newly computed indicators in one write
 
     # Print relevant values to the console
     print(f"\nProcessing file: {file_path}")
@@ -1,69 +1,134 @@
 import os
-import pandas as pd
-import matplotlib.pyplot as plt
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from scipy.stats import pearsonr
+from data_store import load_news_data
+from correlation_engine import (sentiment_matrix, load_returns_matrix, correlate_sentiment_returns, lagged_correlations,
+                                rolling_correlations)
+from correlation_resampling import resampled_significance
+from sentiment_scoring import score_headlines
 
-def calculate_correlation(news_file, input_folder_stock):
+def load_sentiment_and_returns(news_file, input_folder_stock):
     """
-    Calculate the Pearson correlation coefficient between average daily sentiment scores
-    and stock daily returns.
-    
+    Score the news and load the stock returns as (date x ticker) matrices.
+
     Args:
         news_file (str): Path to the single news CSV file.
         input_folder_stock (str): Path to the folder containing stock CSV files.
-    
+
     Returns:
-        None
+        tuple: (average daily sentiment per ticker, daily returns per ticker)
     """
-    # Initialize the sentiment analyzer
-    analyzer = SentimentIntensityAnalyzer()
-
     # Load the news data
-    news_df = pd.read_csv(news_file, parse_dates=['date'])
+    news_df = load_news_data(news_file, columns=['date', 'headline', 'stock'])
     news_df['date'] = news_df['date'].dt.normalize()  # Normalize dates to yyyy-mm-dd
 
     # Calculate daily sentiment scores
-    news_df['sentiment'] = news_df['headline'].apply(lambda x: analyzer.polarity_scores(str(x))['compound'])
+    news_df['sentiment'] = score_headlines(news_df['headline'], implementation='array')['compound']
+
+    # Average the sentiment per ticker and day, and load the daily returns of every stock
+    return sentiment_matrix(news_df, score_column='sentiment'), load_returns_matrix(input_folder_stock)
+
+def calculate_correlation(sentiment, returns):
+    """
+    Calculate the Pearson correlation coefficient between each ticker's average daily
+    sentiment score and its daily stock returns.
+    
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) average daily sentiment, from
+            load_sentiment_and_returns.
+        returns (pd.DataFrame): (date x ticker) daily returns, from load_sentiment_and_returns.
+    
+    Returns:
+        pd.DataFrame: One row per ticker with its correlation, p-value and number of
+        common days.
+    """
+    # Calculate the Pearson correlation of all tickers at once
+    correlations = correlate_sentiment_returns(sentiment, returns)
+    for row in correlations.itertuples(index=False):
+        if row.observations >= 2:
+            print(f"Pearson correlation between sentiment and stock returns for {row.stock}: {row.correlation:.4f} "
+                  f"(p={row.p_value:.4f}, {row.observations} days)")
+        else:
+            print(f"No common dates found for sentiment and stock returns for {row.stock}. Skipping correlation calculation.")
+
+    # Stocks without any news don't appear in the sentiment matrix
+    for stock_symbol in returns.columns.difference(correlations['stock']):
+        print(f"No common dates found for sentiment and stock returns for {stock_symbol}. Skipping correlation calculation.")
+    return correlations
+
+def calculate_lagged_correlation(sentiment, returns, max_lag=10):
+    """
+    Check whether sentiment leads (or trails) stock returns by sweeping the correlation
+    over lags of -max_lag..max_lag trading days for every ticker.
+
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) average daily sentiment, from
+            load_sentiment_and_returns.
+        returns (pd.DataFrame): (date x ticker) daily returns, from load_sentiment_and_returns.
+        max_lag (int): Largest lag in trading days, in both directions.
+
+    Returns:
+        tuple: (ticker x lag) correlation matrix and the best lag per ticker.
+    """
+    correlations, _, _, best_lags = lagged_correlations(sentiment, returns, max_lag=max_lag)
 
-    # Group by date and calculate the average sentiment score for each day
-    avg_sentiment_per_day = news_df.groupby('date')['sentiment'].mean()
+    print("\nSentiment/return correlation by lag (positive lag: sentiment leads returns):")
+    print(correlations.round(4).to_string())
+    print("\nBest lag per ticker:")
+    print(best_lags.to_string(index=False))
+    return correlations, best_lags
+
+def calculate_rolling_correlation(sentiment, returns, window=60):
+    """
+    Calculate each ticker's rolling correlation between daily sentiment and stock returns
+    over a window of trading days, to see how the relationship changes over time.
 
-    # List all stock files
-    stock_files = [f for f in os.listdir(input_folder_stock) if f.endswith('.csv')]
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) average daily sentiment, from
+            load_sentiment_and_returns.
+        returns (pd.DataFrame): (date x ticker) daily returns, from load_sentiment_and_returns.
+        window (int): Window length in trading days.
 
-    # Prepare a dictionary to store stock returns and dates
-    stock_returns = {}
+    Returns:
+        pd.DataFrame: (date x ticker) rolling correlations.
+    """
+    # Days without news for a ticker are gaps, so a window only needs a third of its days
+    correlations, _ = rolling_correlations(sentiment, returns, window=window, min_periods=window // 3)
 
-    for stock_file in stock_files:
-        # Extract stock symbol from the stock file name (e.g., AAPL_historical_data.csv -> AAPL)
-        stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
+    print(f"\nLatest {window}-day rolling correlation between sentiment and stock returns:")
+    for stock_symbol, value in correlations.ffill().iloc[-1].items():
+        print(f"{stock_symbol}: {value:.4f}")
+    return correlations
 
-        # Load the stock data
-        stock_df = pd.read_csv(os.path.join(input_folder_stock, stock_file), parse_dates=['Date'])
-        stock_df['Date'] = stock_df['Date'].dt.normalize()  # Normalize dates
+def calculate_correlation_significance(sentiment, returns, n_resamples=10000, seed=0):
+    """
+    Check how robust each ticker's sentiment/return correlation is with block-bootstrap
+    confidence intervals and block-permutation p-values, which unlike the t-test p-value
+    allow for autocorrelated, heavy-tailed returns.
 
-        # Calculate the daily stock returns
-        stock_df['Return'] = stock_df['Close'].pct_change()
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) average daily sentiment, from
+            load_sentiment_and_returns.
+        returns (pd.DataFrame): (date x ticker) daily returns, from load_sentiment_and_returns.
+        n_resamples (int): Number of bootstrap samples and of permutations per ticker.
+        seed (int): Seed of the resampling, for reproducible results.
 
-        # Group by date and get the daily return (ignoring the first NaN return)
-        stock_returns[stock_symbol] = stock_df.groupby('Date')['Return'].mean().dropna()
+    Returns:
+        pd.DataFrame: One row per ticker with its correlation, 95% confidence interval,
+        permutation p-value and number of common days.
+    """
+    significance = resampled_significance(sentiment, returns, n_resamples=n_resamples, seed=seed)
 
-    # Calculate the Pearson correlation for each stock
-    for stock_symbol, returns in stock_returns.items():
-        # Align stock returns with average sentiment data on the date
-        merged_data = pd.merge(avg_sentiment_per_day, returns, left_index=True, right_index=True, how='inner')
-        
-        if not merged_data.empty:
-            # Calculate Pearson correlation
-            corr_coefficient, _ = pearsonr(merged_data['sentiment'], merged_data['Return'])
-            print(f"Pearson correlation between sentiment and stock returns for {stock_symbol}: {corr_coefficient:.4f}")
-        else:
-            print(f"No common dates found for sentiment and stock returns for {stock_symbol}. Skipping correlation calculation.")
+    print(f"\nSentiment/return correlation with 95% block-bootstrap intervals ({n_resamples} resamples):")
+    print(significance.round(4).to_string(index=False))
+    return significance
 
-# Define file and folder paths
-news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
-input_folder_stock = os.path.join('cleaned_data', 'yfinance_data')
+if __name__ == '__main__':
+    # Define file and folder paths
+    news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
+    input_folder_stock = os.path.join('cleaned_data', 'yfinance_data')
 
-# Run the correlation function
-calculate_correlation(news_file, input_folder_stock)
\ No newline at end of file
+    # Score the news and load the returns once, then run every analysis on the matrices
+    sentiment, returns = load_sentiment_and_returns(news_file, input_folder_stock)
+    calculate_correlation(sentiment, returns)
+    calculate_lagged_correlation(sentiment, returns)
+    calculate_rolling_correlation(sentiment, returns)
+    calculate_correlation_significance(sentiment, returns)
\ No newline at end of file
@@ -0,0 +1,372 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy import stats
+from scipy.signal import fftconvolve
+from data_store import load_cleaned_data
+
+# Columns of the tidy correlation table
+CORRELATION_COLUMNS = ['stock', 'correlation', 'p_value', 'observations']
+
+# Fewest common days a lagged correlation needs to be considered for the best lag
+MIN_LAG_OBSERVATIONS = 20
+
+# Variance, as a fraction of the sum of squares it is computed from, below which the
+# running or FFT sums hold rounding noise rather than spread: the series is flat there
+FLAT_VARIANCE_TOLERANCE = 1e-10
+
+
+def sentiment_matrix(news_df, score_column='sentiment', date_column='date', ticker_column='stock'):
+    """
+    Average headline sentiment per ticker and day into a (date x ticker) matrix, grouping
+    on both keys at once.
+
+    Args:
+        news_df (pd.DataFrame): Scored headlines with normalized dates.
+        score_column (str): Column holding the sentiment score.
+        date_column (str): Column holding the (normalized) date.
+        ticker_column (str): Column holding the ticker.
+
+    Returns:
+        pd.DataFrame: Mean sentiment, indexed by date with one column per ticker (NaN on
+        days without news for that ticker).
+    """
+    daily = news_df.groupby([date_column, ticker_column], observed=True)[score_column].mean()
+    matrix = daily.unstack(ticker_column).sort_index()
+    matrix.columns = matrix.columns.astype(str)
+    matrix.columns.name = 'stock'
+    return matrix
+
+
+def load_returns_matrix(input_folder_stock):
+    """
+    Load the daily close-to-close returns of every stock file into a (date x ticker) matrix.
+
+    Args:
+        input_folder_stock (str): Path to the folder containing stock CSV files.
+
+    Returns:
+        pd.DataFrame: Daily returns, indexed by normalized date with one column per ticker
+        (e.g. aapl_historical_data.csv -> AAPL).
+    """
+    returns = {}
+    for stock_file in sorted(f for f in os.listdir(input_folder_stock) if f.endswith('.csv')):
+        stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
+        stock_df = load_cleaned_data(os.path.join(input_folder_stock, stock_file), columns=['Date', 'Close'])
+        stock_df['Date'] = stock_df['Date'].dt.normalize()
+        stock_df['Return'] = stock_df['Close'].pct_change()
+        returns[stock_symbol] = stock_df.groupby('Date')['Return'].mean()
+
+    matrix = pd.DataFrame(returns).sort_index()
+    matrix.index.name = 'date'
+    matrix.columns.name = 'stock'
+    return matrix
+
+
+def masked_pearson(x, y):
+    """
+    Pearson correlation of every column pair of two equally shaped arrays, using only the
+    rows where both values are present.
+
+    Gives the same correlation and two-sided p-value as scipy.stats.pearsonr on each
+    column's common rows, without looping over the columns.
+
+    Args:
+        x (np.ndarray): Array of shape (observations, series), NaN where missing.
+        y (np.ndarray): Array of the same shape, NaN where missing.
+
+    Returns:
+        tuple: (correlation, p-value, number of common observations), one entry per column.
+        Columns with fewer than two common observations or no variance get NaN.
+    """
+    mask = np.isfinite(x) & np.isfinite(y)
+    n = mask.sum(axis=0)
+    x = np.where(mask, x, 0.0)
+    y = np.where(mask, y, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        # Center on the masked means first; it is more accurate than the raw-sum formula
+        dx = np.where(mask, x - x.sum(axis=0) / n, 0.0)
+        dy = np.where(mask, y - y.sum(axis=0) / n, 0.0)
+        var_x = (dx * dx).sum(axis=0)
+        var_y = (dy * dy).sum(axis=0)
+        r = (dx * dy).sum(axis=0) / np.sqrt(var_x * var_y)
+        r = np.clip(r, -1.0, 1.0)
+        # The mean of a flat column isn't exact unless the value is, leaving rounding noise
+        # in the deviations; compare the variance with the column's sum of squares instead of zero
+        flat_x = var_x <= FLAT_VARIANCE_TOLERANCE * (x * x).sum(axis=0)
+        flat_y = var_y <= FLAT_VARIANCE_TOLERANCE * (y * y).sum(axis=0)
+        r[(n < 2) | flat_x | flat_y] = np.nan
+    return r, pearson_p_values(r, n), n
+
+
+def pearson_p_values(r, n):
+    """
+    Two-sided p-values of Pearson correlations, as scipy.stats.pearsonr reports them.
+
+    Args:
+        r (np.ndarray): Correlations (NaN where undefined).
+        n (np.ndarray): Number of observations behind each correlation.
+
+    Returns:
+        np.ndarray: p-values of the t statistic with n - 2 degrees of freedom.
+    """
+    dof = n - 2
+    with np.errstate(invalid='ignore', divide='ignore'):
+        t = r * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p = 2 * stats.t.sf(np.abs(t), np.maximum(dof, 1))
+    p = np.where(dof == 0, 1.0, p)
+    return np.where(np.isnan(r), np.nan, p)
+
+
+def correlate_sentiment_returns(sentiment, returns):
+    """
+    Correlate daily sentiment with daily returns for every ticker in one vectorized pass.
+
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) sentiment matrix from sentiment_matrix.
+        returns (pd.DataFrame): (date x ticker) returns matrix from load_returns_matrix.
+
+    Returns:
+        pd.DataFrame: Tidy table with CORRELATION_COLUMNS, one row per ticker present in
+        both matrices.
+    """
+    tickers = sentiment.columns.intersection(returns.columns)
+    dates = sentiment.index.union(returns.index)
+    x = sentiment.reindex(index=dates, columns=tickers).to_numpy(dtype=float)
+    y = returns.reindex(index=dates, columns=tickers).to_numpy(dtype=float)
+
+    r, p, n = masked_pearson(x, y)
+    return pd.DataFrame({'stock': tickers, 'correlation': r, 'p_value': p, 'observations': n})
+
+
+def _cross_sums(a, b):
+    """
+    Sum of a[t - k] * b[t] over t for every shift k in -(T-1)..T-1, column by column.
+
+    Returns:
+        np.ndarray: Array of shape (2T - 1, columns); row k + T - 1 holds shift k.
+    """
+    return fftconvolve(b, a[::-1], mode='full', axes=0)
+
+
+def lagged_correlations(sentiment, returns, max_lag=10, min_lag=None, min_observations=MIN_LAG_OBSERVATIONS):
+    """
+    Correlate sentiment with returns at every lag in a range, for every ticker at once.
+
+    Both matrices are put on the returns' trading calendar, so a lag counts trading days.
+    At lag k the sentiment of day t - k is paired with the return of day t: positive lags
+    test whether sentiment leads returns, negative lags whether returns lead sentiment.
+
+    Instead of shifting and re-aligning the data once per lag, the six sums a masked
+    Pearson correlation needs (pair count, sums, sums of squares and cross products over
+    the days where both values exist) are computed for all lags together as FFT
+    cross-correlations along the date axis. As in masked_pearson, a lag whose common days
+    leave either series without variance gets NaN.
+
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) sentiment matrix from sentiment_matrix.
+        returns (pd.DataFrame): (date x ticker) returns matrix from load_returns_matrix.
+        max_lag (int): Largest lag in trading days.
+        min_lag (int): Smallest lag (default: -max_lag).
+        min_observations (int): Fewest common days for a lag to be eligible as best lag.
+
+    Returns:
+        tuple: (correlations, p-values, observations) as (ticker x lag) DataFrames, and the
+        best lag per ticker (largest absolute correlation) as a tidy table with columns
+        stock, best_lag, correlation, p_value and observations.
+    """
+    min_lag = -max_lag if min_lag is None else min_lag
+    tickers = sentiment.columns.intersection(returns.columns)
+    x = sentiment.reindex(index=returns.index, columns=tickers).to_numpy(dtype=float)
+    y = returns.reindex(columns=tickers).to_numpy(dtype=float)
+    n_days = len(returns.index)
+
+    mx = np.isfinite(x).astype(float)
+    my = np.isfinite(y).astype(float)
+    x = np.where(mx > 0, x, 0.0)
+    y = np.where(my > 0, y, 0.0)
+    # Centering on the overall means leaves r unchanged and keeps the sums well conditioned
+    x -= mx * (x.sum(axis=0) / np.maximum(mx.sum(axis=0), 1))
+    y -= my * (y.sum(axis=0) / np.maximum(my.sum(axis=0), 1))
+
+    lags = np.arange(min_lag, max_lag + 1)
+    rows = np.clip(lags + n_days - 1, 0, max(2 * n_days - 2, 0))
+    out_of_range = np.abs(lags) >= n_days
+
+    def sums(a, b):
+        result = _cross_sums(a, b)[rows]
+        result[out_of_range] = 0.0
+        return result
+
+    n = np.rint(sums(mx, my))
+    sx, sy = sums(x, my), sums(mx, y)
+    sxx, syy, sxy = sums(x * x, my), sums(mx, y * y), sums(x, y)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        var_x = n * sxx - sx * sx
+        var_y = n * syy - sy * sy
+        r = (n * sxy - sx * sy) / np.sqrt(var_x * var_y)
+    r = np.clip(r, -1.0, 1.0)
+    # The FFT turns a flat series' zero variance into noise, so compare it with the
+    # series' overall spread instead of zero
+    flat_x = var_x <= FLAT_VARIANCE_TOLERANCE * n * (x * x).sum(axis=0)
+    flat_y = var_y <= FLAT_VARIANCE_TOLERANCE * n * (y * y).sum(axis=0)
+    r[(n < 2) | flat_x | flat_y] = np.nan
+    p = pearson_p_values(r, n)
+
+    lag_index = pd.Index(lags, name='lag')
+    correlations = pd.DataFrame(r.T, index=tickers, columns=lag_index)
+    p_values = pd.DataFrame(p.T, index=tickers, columns=lag_index)
+    observations = pd.DataFrame(n.T.astype(int), index=tickers, columns=lag_index)
+
+    # Best lag: the eligible lag with the strongest correlation in either direction
+    strength = np.where(n >= min_observations, np.abs(r), np.nan)
+    eligible = ~np.isnan(strength).all(axis=0)
+    best = np.zeros(len(tickers), dtype=int)
+    best[eligible] = np.nanargmax(strength[:, eligible], axis=0)
+    columns = np.arange(len(tickers))
+    best_lags = pd.DataFrame({
+        'stock': tickers,
+        'best_lag': np.where(eligible, lags[best] if len(lags) else 0, np.nan),
+        'correlation': np.where(eligible, r[best, columns], np.nan),
+        'p_value': np.where(eligible, p[best, columns], np.nan),
+        'observations': np.where(eligible, n[best, columns], 0).astype(int),
+    })
+    return correlations, p_values, observations, best_lags
+
+
+class RollingCorrelation:
+    """
+    Rolling-window Pearson correlation of many series pairs (e.g. every ticker's sentiment
+    and returns), updated one day at a time.
+
+    For each ticker the engine keeps running sums of x, y, x^2, y^2 and xy over the days
+    in the window where both values exist, plus a ring buffer of the window's values so
+    the day that drops out can be subtracted again. Each new day therefore costs the same
+    regardless of the window length, and new days can be appended at any time without
+    recomputing the history.
+
+    To keep the running sums accurate, values are shifted by each ticker's first value
+    before summing, and the sums are rebuilt from the ring buffer once per window length
+    of updates, which keeps the amortized cost per day constant. Results agree with
+    pd.Series.rolling(window, min_periods).corr() on each ticker.
+    """
+
+    def __init__(self, window=60, min_periods=None):
+        """
+        Args:
+            window (int): Number of days in the window.
+            min_periods (int): Fewest common days for a correlation (default: window, as in
+                pandas).
+        """
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.tickers = None
+        self.updates = 0
+
+    def _start(self, tickers):
+        self.tickers = pd.Index(tickers)
+        size = len(self.tickers)
+        self.buffer_x = np.full((self.window, size), np.nan)
+        self.buffer_y = np.full((self.window, size), np.nan)
+        self.shift_x = np.full(size, np.nan)
+        self.shift_y = np.full(size, np.nan)
+        self.sums = np.zeros((6, size))  # n, x, y, xx, yy, xy
+
+    def _pair_sums(self, x, y):
+        """Sums over the days where both shifted values exist, along the first axis."""
+        mask = np.isfinite(x) & np.isfinite(y)
+        x = np.where(mask, x, 0.0)
+        y = np.where(mask, y, 0.0)
+        return np.stack([mask.sum(axis=0), x.sum(axis=0), y.sum(axis=0),
+                         (x * x).sum(axis=0), (y * y).sum(axis=0), (x * y).sum(axis=0)])
+
+    def update(self, x, y):
+        """
+        Add one day and get every ticker's correlation over the window ending on it.
+
+        Args:
+            x (np.ndarray): The day's values of the first series per ticker (NaN if missing).
+            y (np.ndarray): The day's values of the second series per ticker.
+
+        Returns:
+            np.ndarray: Correlation per ticker (NaN with fewer than min_periods common days).
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        if self.tickers is None:
+            self._start(range(len(x)))
+
+        # The first value seen for a ticker becomes its shift
+        both = np.isfinite(x) & np.isfinite(y)
+        new = both & np.isnan(self.shift_x)
+        self.shift_x[new] = x[new]
+        self.shift_y[new] = y[new]
+        x = x - self.shift_x
+        y = y - self.shift_y
+
+        slot = self.updates % self.window
+        self.sums += self._pair_sums(x[np.newaxis], y[np.newaxis])
+        if self.updates >= self.window:
+            self.sums -= self._pair_sums(self.buffer_x[slot][np.newaxis], self.buffer_y[slot][np.newaxis])
+        self.buffer_x[slot] = x
+        self.buffer_y[slot] = y
+        self.updates += 1
+
+        # Rebuild the sums from the buffer once per window so rounding errors can't pile up
+        if self.updates % self.window == 0:
+            self.sums = self._pair_sums(self.buffer_x, self.buffer_y)
+        return self._correlation()
+
+    def _correlation(self):
+        n, sx, sy, sxx, syy, sxy = self.sums
+        with np.errstate(invalid='ignore', divide='ignore'):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            r = cov / np.sqrt(var_x * var_y)
+        r = np.clip(r, -1.0, 1.0)
+        # A flat window leaves rounding noise in the variance rather than an exact zero
+        flat = (var_x <= FLAT_VARIANCE_TOLERANCE * sxx) | (var_y <= FLAT_VARIANCE_TOLERANCE * syy)
+        r[(n < max(self.min_periods, 2)) | flat] = np.nan
+        return r
+
+    def append(self, x, y):
+        """
+        Add a block of new days, e.g. the days since the last run.
+
+        Args:
+            x (pd.DataFrame): (date x ticker) values of the first series.
+            y (pd.DataFrame): (date x ticker) values of the second series, same dates.
+
+        Returns:
+            pd.DataFrame: (date x ticker) rolling correlations of the new days.
+        """
+        if self.tickers is None:
+            self._start(x.columns.intersection(y.columns))
+        x_values = x.reindex(columns=self.tickers).to_numpy(dtype=float)
+        y_values = y.reindex(index=x.index, columns=self.tickers).to_numpy(dtype=float)
+        result = np.array([self.update(x_row, y_row) for x_row, y_row in zip(x_values, y_values)])
+        return pd.DataFrame(result.reshape(len(x.index), len(self.tickers)), index=x.index, columns=self.tickers)
+
+
+def rolling_correlations(sentiment, returns, window=60, min_periods=None):
+    """
+    Rolling-window correlation of sentiment and returns for every ticker, on the returns'
+    trading calendar.
+
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) sentiment matrix from sentiment_matrix.
+        returns (pd.DataFrame): (date x ticker) returns matrix from load_returns_matrix.
+        window (int): Window length in trading days.
+        min_periods (int): Fewest common days for a correlation (default: window).
+
+    Returns:
+        tuple: ((date x ticker) rolling correlations, the RollingCorrelation engine, which can
+        be fed later days with its append method)
+    """
+    engine = RollingCorrelation(window, min_periods)
+    tickers = sentiment.columns.intersection(returns.columns)
+    correlations = engine.append(sentiment.reindex(index=returns.index, columns=tickers), returns[tickers])
+    return correlations, engine
@@ -0,0 +1,158 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+# Columns of the resampling result table
+RESAMPLING_COLUMNS = ['stock', 'correlation', 'ci_low', 'ci_high', 'permutation_p_value', 'observations', 'block_length']
+
+# Resamples drawn per NumPy call (and per random stream)
+DEFAULT_CHUNK_SIZE = 500
+
+
+def default_block_length(n):
+    """Block length for n observations, the usual n^(1/3) rule of thumb."""
+    return max(1, int(round(n ** (1 / 3))))
+
+
+def _row_correlations(x, y):
+    """
+    Pearson correlation of each row pair of two (resamples x observations) arrays.
+
+    Uses single-pass sums, so the rows should be drawn from series centered beforehand to
+    keep the cancellation error small.
+    """
+    n = x.shape[1]
+    sum_x = x.sum(axis=1)
+    sum_y = y.sum(axis=1)
+    sxy = np.einsum('ij,ij->i', x, y) - sum_x * sum_y / n
+    sxx = np.einsum('ij,ij->i', x, x) - sum_x * sum_x / n
+    syy = np.einsum('ij,ij->i', y, y) - sum_y * sum_y / n
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.clip(sxy / np.sqrt(sxx * syy), -1.0, 1.0)
+
+
+def block_bootstrap_indices(rng, size, n, block_length):
+    """
+    Draw moving-block bootstrap samples: each sample strings together random blocks of
+    `block_length` consecutive days (wrapping around at the end) until it has n days.
+
+    Returns:
+        np.ndarray: Index array of shape (size, n).
+    """
+    n_blocks = -(-n // block_length)
+    starts = rng.integers(0, n, size=(size, n_blocks))
+    indices = (starts[:, :, np.newaxis] + np.arange(block_length)) % n
+    return indices.reshape(size, -1)[:, :n]
+
+
+def block_permutation_indices(rng, size, n, block_length):
+    """
+    Draw block permutations: the days are cut into consecutive blocks of `block_length`
+    (the last one may be shorter) and the blocks are put in random order, keeping the
+    order of the days inside each block.
+
+    Returns:
+        np.ndarray: Index array of shape (size, n).
+    """
+    n_blocks = -(-n // block_length)
+    order = np.argsort(rng.random((size, n_blocks)), axis=1)
+    indices = (order[:, :, np.newaxis] * block_length + np.arange(block_length)).reshape(size, -1)
+    # Only the short last block runs past the end; dropping its overhang leaves n days per row
+    return indices[indices < n].reshape(size, n)
+
+
+def _resample_ticker(task):
+    """
+    Bootstrap and permutation-test one ticker's correlation.
+
+    Every chunk of resamples gets its own random stream, seeded from (seed, ticker
+    position, chunk number), so the results don't depend on how tickers are spread over
+    worker processes.
+
+    Returns:
+        tuple: (bootstrap correlations, number of permuted correlations at least as extreme
+        as the observed one)
+    """
+    x, y, ticker_position, n_resamples, block_length, seed, chunk_size = task
+    # Permuting x leaves its mean and spread unchanged, so a permuted correlation is a dot
+    # product of the centered series scaled by the same constant as the observed one
+    x_centered = x - x.mean()
+    y_centered = y - y.mean()
+    scale = np.sqrt((x_centered @ x_centered) * (y_centered @ y_centered))
+    observed = abs(x_centered @ y_centered)
+    bootstrap = np.empty(n_resamples)
+    extreme = 0
+    for chunk, start in enumerate(range(0, n_resamples, chunk_size)):
+        size = min(chunk_size, n_resamples - start)
+        rng = np.random.default_rng([seed, ticker_position, chunk])
+        indices = block_bootstrap_indices(rng, size, len(x), block_length)
+        bootstrap[start:start + size] = _row_correlations(x_centered[indices], y_centered[indices])
+        permuted = x_centered[block_permutation_indices(rng, size, len(x), block_length)] @ y_centered
+        extreme += int(np.count_nonzero(np.abs(permuted) >= observed - 1e-12 * scale))
+    return bootstrap, extreme
+
+
+def resampled_significance(sentiment, returns, n_resamples=10000, block_length=None, confidence=0.95, seed=0,
+                           workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Block-bootstrap confidence intervals and block-permutation p-values for every ticker's
+    sentiment/return correlation.
+
+    Returns are autocorrelated and heavy-tailed, so the t-test p-value of pearsonr can be
+    misleading. Resampling whole blocks of consecutive days keeps the short-range
+    dependence: the bootstrap draws blocks with replacement to get the spread of the
+    correlation, and the permutation test shuffles blocks of sentiment against the
+    returns to get its distribution under no relationship.
+
+    Resamples are drawn in chunks of `chunk_size` per NumPy call, tickers are spread over a
+    process pool, and each chunk's random stream is derived from `seed`, so the results
+    are identical for any number of workers.
+
+    Args:
+        sentiment (pd.DataFrame): (date x ticker) sentiment matrix from sentiment_matrix.
+        returns (pd.DataFrame): (date x ticker) returns matrix from load_returns_matrix.
+        n_resamples (int): Number of bootstrap samples and of permutations per ticker.
+        block_length (int): Days per block (default: n^(1/3) of each ticker's common days).
+        confidence (float): Coverage of the percentile confidence interval.
+        seed (int): Seed of all random streams.
+        workers (int): Number of worker processes (default: one per CPU).
+        chunk_size (int): Resamples per NumPy call.
+
+    Returns:
+        pd.DataFrame: Tidy table with RESAMPLING_COLUMNS, one row per ticker present in
+        both matrices. Tickers with fewer than three common days get NaN statistics and a
+        block length of 0.
+    """
+    tickers = sentiment.columns.intersection(returns.columns)
+    dates = sentiment.index.union(returns.index)
+    x_all = sentiment.reindex(index=dates, columns=tickers).to_numpy(dtype=float)
+    y_all = returns.reindex(index=dates, columns=tickers).to_numpy(dtype=float)
+
+    common = np.isfinite(x_all) & np.isfinite(y_all)
+    counts = common.sum(axis=0)
+    tasks = []
+    for position in range(len(tickers)):
+        mask = common[:, position]
+        n = int(counts[position])
+        if n >= 3:
+            length = block_length or default_block_length(n)
+            tasks.append((x_all[mask, position], y_all[mask, position], position, n_resamples, length, seed, chunk_size))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(tasks) <= 1:
+        results = [_resample_ticker(task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+            results = list(pool.map(_resample_ticker, tasks))
+
+    table = pd.DataFrame({'stock': tickers}).assign(correlation=np.nan, ci_low=np.nan, ci_high=np.nan,
+                                                    permutation_p_value=np.nan, observations=counts, block_length=0)
+    alpha = (1 - confidence) / 2
+    for task, (bootstrap, extreme) in zip(tasks, results):
+        x, y, position, _, length, _, _ = task
+        table.loc[position, 'correlation'] = _row_correlations((x - x.mean())[np.newaxis], (y - y.mean())[np.newaxis])[0]
+        table.loc[position, ['ci_low', 'ci_high']] = np.nanquantile(bootstrap, [alpha, 1 - alpha])
+        table.loc[position, 'permutation_p_value'] = (extreme + 1) / (n_resamples + 1)
+        table.loc[position, 'block_length'] = length
+    return table[RESAMPLING_COLUMNS]
@@ -1,5 +1,6 @@
 import os
 import pandas as pd
+from data_store import load_cleaned_data
 
 def compute_daily_returns(input_folder_stock, output_folder):
     """
@@ -23,7 +24,7 @@ def compute_daily_returns(input_folder_stock, output_folder):
         stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
         
         # Load each stock dataset
-        stock_df = pd.read_csv(os.path.join(input_folder_stock, stock_file), parse_dates=['Date'])
+        stock_df = load_cleaned_data(os.path.join(input_folder_stock, stock_file), columns=['Date', 'Close'])
         
         # Ensure that the Date column is in the correct datetime format
         stock_df['Date'] = pd.to_datetime(stock_df['Date'])
@@ -0,0 +1,82 @@
+import os
+import shutil
+import urllib.request
+from manifest import file_hash
+from load_and_clean_ratings import download_from_gdrive
+
+
+class GoogleDriveSource:
+    """
+    Fetch raw dataset files from Google Drive by file ID.
+    """
+
+    def __init__(self, file_ids):
+        """
+        Args:
+            file_ids (dict): Dataset name (e.g. 'aapl_historical_data') -> Google Drive file ID.
+        """
+        self.file_ids = file_ids
+
+    def fetch(self, name, output_path):
+        download_from_gdrive(self.file_ids[name], output_path)
+
+
+class LocalMirrorSource:
+    """
+    Fetch raw dataset files from a local directory holding <name>.csv copies, e.g. an
+    internal mirror mounted on the worker.
+    """
+
+    def __init__(self, directory):
+        """
+        Args:
+            directory (str): Directory containing the mirrored CSV files.
+        """
+        self.directory = directory
+
+    def fetch(self, name, output_path):
+        shutil.copyfile(os.path.join(self.directory, f'{name}.csv'), output_path)
+
+
+class HTTPSource:
+    """
+    Fetch raw dataset files over HTTP from <base_url>/<name>.csv, e.g. a local
+    `python -m http.server` stand-in or an internal mirror.
+    """
+
+    def __init__(self, base_url, timeout=60):
+        """
+        Args:
+            base_url (str): URL of the directory serving the CSV files.
+            timeout (float): Seconds to wait for each request.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+
+    def fetch(self, name, output_path):
+        with urllib.request.urlopen(f"{self.base_url}/{name}.csv", timeout=self.timeout) as response:
+            with open(output_path, 'wb') as f:
+                shutil.copyfileobj(response, f)
+
+
+def fetch_dataset(source, name, output_path):
+    """
+    Fetch a raw dataset file if it isn't on disk yet and hash its contents. Meant to run
+    on an I/O thread pool.
+
+    Args:
+        source: Object with a fetch(name, output_path) method (one of the sources above).
+        name (str): Dataset name.
+        output_path (str): Where the raw file is stored locally.
+
+    Returns:
+        tuple: (output_path, SHA-256 of the file)
+    """
+    # Download the file if it doesn't exist; write to a temporary name so an interrupted
+    # fetch never leaves a partial file behind
+    if not os.path.exists(output_path):
+        print(f"Downloading {name}...")
+        partial_path = output_path + '.part'
+        source.fetch(name, partial_path)
+        os.replace(partial_path, output_path)
+    return output_path, file_hash(output_path)
@@ -0,0 +1,387 @@
+import os
+import shutil
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Date columns of the cleaned datasets (news uses 'date', price files use 'Date')
+DATE_COLUMNS = ['date', 'Date']
+
+# Low-cardinality text columns stored as categoricals in the columnar copy
+CATEGORICAL_COLUMNS = ['stock', 'publisher']
+
+# Free-text columns of the news data that can be held as Arrow-backed strings
+TEXT_COLUMNS = ['headline', 'url']
+
+# File name of each part of a columnar copy; appending rows adds a part instead of
+# rewriting the rows already stored
+PART_NAME = 'part-{:05d}.parquet'
+
+
+def store_path(csv_path):
+    """
+    Return the path of the columnar (Parquet) copy that sits next to a cleaned CSV file.
+
+    The copy is a directory of part files, one per write, that pandas and pyarrow read as
+    one dataset. Copies written before parts existed are a single .parquet file at the
+    same path and are read the same way.
+
+    Args:
+        csv_path (str): Path to the cleaned CSV file.
+
+    Returns:
+        str: Path to the matching .parquet directory (or file).
+    """
+    return os.path.splitext(csv_path)[0] + '.parquet'
+
+
+def _store_parts(parquet_path):
+    """
+    List the part files of a columnar copy, oldest first; a single-file copy is its only part.
+    """
+    if os.path.isfile(parquet_path):
+        return [parquet_path]
+    if not os.path.isdir(parquet_path):
+        return []
+    return [os.path.join(parquet_path, f) for f in sorted(os.listdir(parquet_path)) if f.endswith('.parquet')]
+
+
+def _reset_store(parquet_path):
+    """
+    Remove a columnar copy and create an empty part directory in its place.
+    """
+    if os.path.isdir(parquet_path):
+        shutil.rmtree(parquet_path)
+    elif os.path.exists(parquet_path):
+        os.remove(parquet_path)
+    os.makedirs(parquet_path)
+
+
+def _arrow_table(data, schema=None):
+    """
+    Convert cleaned rows to an Arrow table in the store schema.
+
+    Args:
+        data (pd.DataFrame): Cleaned rows.
+        schema (pa.Schema): Schema of the parts already stored, so every part has the same
+            types. None derives it from the rows, with dictionary indices widened so later
+            parts with more distinct publishers/tickers still fit.
+
+    Returns:
+        pa.Table: The rows.
+    """
+    table = pa.Table.from_pandas(to_store_schema(data), preserve_index=False)
+    if schema is None:
+        schema = pa.schema([
+            pa.field(field.name, pa.dictionary(pa.int32(), field.type.value_type))
+            if pa.types.is_dictionary(field.type) else field
+            for field in table.schema
+        ], metadata=table.schema.metadata)
+    return table.cast(schema)
+
+
+def _write_part(table, parquet_path):
+    """
+    Add a table to a columnar copy as its next part. The part is written under a hidden
+    name and renamed, so readers never see a partial file.
+    """
+    parts = _store_parts(parquet_path)
+    part_name = PART_NAME.format(len(parts))
+    partial_path = os.path.join(parquet_path, '.' + part_name)
+    pq.write_table(table, partial_path, compression='zstd')
+    os.replace(partial_path, os.path.join(parquet_path, part_name))
+
+
+def to_store_schema(data):
+    """
+    Convert a cleaned DataFrame to the types used by the columnar store: native datetimes
+    for date columns and categoricals for publisher/ticker columns.
+
+    Args:
+        data (pd.DataFrame): Cleaned data.
+
+    Returns:
+        pd.DataFrame: Converted copy of the data.
+    """
+    data = data.copy()
+    for col in DATE_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_datetime(data[col], format='ISO8601', errors='coerce')
+    for col in CATEGORICAL_COLUMNS:
+        if col in data.columns:
+            data[col] = data[col].astype('category')
+    return data
+
+
+def save_cleaned_data(data, csv_path, date_format=None):
+    """
+    Save a cleaned dataset as CSV and as a typed, zstd-compressed Parquet copy next to it.
+
+    Args:
+        data (pd.DataFrame): Cleaned data.
+        csv_path (str): Path of the CSV file to write; the Parquet copy uses the same name.
+        date_format (str): strftime format for datetime columns in the CSV (default: pandas' choice).
+
+    Returns:
+        None
+    """
+    data.to_csv(csv_path, index=False, date_format=date_format)  # Save without the index column
+    _reset_store(store_path(csv_path))
+    _write_part(_arrow_table(data), store_path(csv_path))
+
+
+def append_cleaned_data(data, csv_path, date_format=None):
+    """
+    Append rows to a cleaned dataset written by save_cleaned_data.
+
+    The rows are appended to the CSV and added to the columnar copy as a new part, so the
+    cost depends on the new rows only. A columnar copy that is out of date is rebuilt
+    from the CSV instead.
+
+    Args:
+        data (pd.DataFrame): Cleaned rows with the same columns as the existing file.
+        csv_path (str): Path of the CSV file to append to.
+        date_format (str): strftime format for datetime columns in the CSV.
+
+    Returns:
+        None
+    """
+    if not os.path.exists(csv_path):
+        save_cleaned_data(data, csv_path, date_format=date_format)
+        return
+
+    parquet_path = store_path(csv_path)
+    store_is_current = _store_is_current(csv_path)
+    data.to_csv(csv_path, mode='a', header=False, index=False, date_format=date_format)
+
+    if not store_is_current:
+        stored = load_cleaned_data(csv_path)
+        _reset_store(parquet_path)
+        _write_part(_arrow_table(stored), parquet_path)
+        return
+
+    if os.path.isfile(parquet_path):
+        # Single-file copy from before parts existed: it becomes the first part
+        legacy_path = parquet_path + '.legacy'
+        os.replace(parquet_path, legacy_path)
+        os.makedirs(parquet_path)
+        os.replace(legacy_path, os.path.join(parquet_path, PART_NAME.format(0)))
+    schema = pq.read_schema(_store_parts(parquet_path)[0])
+    _write_part(_arrow_table(data, schema), parquet_path)
+
+
+class ChunkedDataWriter:
+    """
+    Append cleaned chunks to a CSV file and its Parquet copy, so a dataset can be written
+    without ever holding all of it in memory.
+
+    The CSV gets its header from the first chunk only; every chunk becomes one row group
+    of a single Parquet part. Use it as a context manager so both files are closed.
+    """
+
+    def __init__(self, csv_path, date_format=None):
+        """
+        Args:
+            csv_path (str): Path of the CSV file to write; the Parquet copy uses the same name.
+            date_format (str): strftime format for datetime columns in the CSV. Pass a fixed
+                format when the output must match a single to_csv call of the full data.
+        """
+        self.csv_path = csv_path
+        self.date_format = date_format
+        self.rows_written = 0
+        self._csv_file = None
+        self._parquet_writer = None
+        self._schema = None
+
+    def __enter__(self):
+        self._csv_file = open(self.csv_path, 'w', newline='', encoding='utf-8')
+        _reset_store(store_path(self.csv_path))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def write(self, chunk):
+        """
+        Append one cleaned chunk to both files.
+
+        Args:
+            chunk (pd.DataFrame): Cleaned rows; every chunk must have the same columns.
+
+        Returns:
+            None
+        """
+        chunk.to_csv(self._csv_file, index=False, header=self.rows_written == 0, date_format=self.date_format)
+
+        # The first chunk fixes the schema every later chunk is cast to
+        table = _arrow_table(chunk, self._schema)
+        if self._parquet_writer is None:
+            self._schema = table.schema
+            part_path = os.path.join(store_path(self.csv_path), PART_NAME.format(0))
+            self._parquet_writer = pq.ParquetWriter(part_path, self._schema, compression='zstd')
+        self._parquet_writer.write_table(table)
+        self.rows_written += len(chunk)
+
+    def close(self):
+        """
+        Close both output files.
+        """
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+
+
+def compact_news_data(data, arrow_strings=False):
+    """
+    Convert news data to the compact in-memory schema shared by the analysis modules:
+    datetime64 dates, categorical stock/publisher columns, int32 integer columns and,
+    optionally, Arrow-backed headline/url strings.
+
+    Args:
+        data (pd.DataFrame): News data.
+        arrow_strings (bool): Store headline/url as string[pyarrow] instead of Python objects.
+
+    Returns:
+        pd.DataFrame: Converted copy of the data.
+    """
+    data = to_store_schema(data)
+    for col in data.select_dtypes('integer').columns:
+        values = data[col]
+        if values.empty or (values.min() >= -2**31 and values.max() < 2**31):
+            data[col] = values.astype('int32')
+    if arrow_strings:
+        for col in TEXT_COLUMNS:
+            if col in data.columns:
+                data[col] = data[col].astype('string[pyarrow]')
+    return data
+
+
+def object_memory(data):
+    """
+    Deep memory use of a DataFrame with its categorical and string columns held as Python
+    objects, the layout the modules loaded the news data in before the compact schema.
+    Columns are converted one at a time, so only one object column exists at once.
+
+    Args:
+        data (pd.DataFrame): Data in any schema.
+
+    Returns:
+        int: Bytes, including the index.
+    """
+    total = data.index.memory_usage(deep=True)
+    for col in data.columns:
+        values = data[col]
+        if isinstance(values.dtype, pd.CategoricalDtype) or pd.api.types.is_string_dtype(values.dtype):
+            values = values.astype(object)
+        total += values.memory_usage(deep=True, index=False)
+    return int(total)
+
+
+def load_news_data(csv_path, columns=None, arrow_strings=False):
+    """
+    Load the cleaned news data in the compact schema and report its memory use before and
+    after the conversion. The 'before' figure holds the text columns as Python objects,
+    since the columnar copy already stores stock/publisher as categoricals.
+
+    Args:
+        csv_path (str): Path to the cleaned news CSV file.
+        columns (list): Columns to load (default: all columns).
+        arrow_strings (bool): Store headline/url as Arrow-backed strings.
+
+    Returns:
+        pd.DataFrame: The news data.
+    """
+    data = load_cleaned_data(csv_path, columns=columns)
+    memory_before = object_memory(data)
+    data = compact_news_data(data, arrow_strings=arrow_strings)
+    memory_after = data.memory_usage(deep=True).sum()
+    ratio = memory_before / memory_after if memory_after else 1.0
+    print(f"News data memory: {memory_before / 1e6:.1f} MB -> {memory_after / 1e6:.1f} MB ({ratio:.1f}x smaller)")
+    return data
+
+
+def available_columns(csv_path):
+    """
+    List the columns of a cleaned dataset without loading any rows.
+
+    Args:
+        csv_path (str): Path to the cleaned CSV file.
+
+    Returns:
+        list: Column names, read from the Parquet schema when a copy exists.
+    """
+    if _store_is_current(csv_path):
+        return list(pq.read_schema(_store_parts(store_path(csv_path))[0]).names)
+    return list(pd.read_csv(csv_path, nrows=0).columns)
+
+
+def load_cleaned_data(csv_path, columns=None):
+    """
+    Load a cleaned dataset, preferring the columnar copy over re-parsing the CSV.
+
+    Dates come back as datetime64 either way, with NaT for values that are not valid
+    dates. Requested columns that the dataset doesn't
+    have are skipped, so callers can keep their own checks for required columns.
+
+    Args:
+        csv_path (str): Path to the cleaned CSV file.
+        columns (list): Columns to load (default: all columns).
+
+    Returns:
+        pd.DataFrame: The loaded data.
+    """
+    if columns is not None:
+        existing = set(available_columns(csv_path))
+        columns = [col for col in columns if col in existing]
+
+    if _store_is_current(csv_path):
+        data = pd.read_parquet(store_path(csv_path), columns=columns)
+        # Files written in chunks list categories in order of first appearance; sort them
+        # so the result doesn't depend on how the file was written
+        for col in CATEGORICAL_COLUMNS:
+            if col in data.columns and isinstance(data[col].dtype, pd.CategoricalDtype):
+                data[col] = data[col].cat.reorder_categories(sorted(data[col].cat.categories))
+        return data
+
+    # No (up to date) columnar copy yet: fall back to the CSV and parse dates here; a
+    # malformed date becomes NaT instead of failing the whole file
+    data = pd.read_csv(csv_path, usecols=columns)
+    for col in DATE_COLUMNS:
+        if col in data.columns:
+            data[col] = pd.to_datetime(data[col], format='ISO8601', errors='coerce')
+    return data
+
+
+def load_cleaned_rows_at(csv_path, date_column, timestamp):
+    """
+    Load the rows of a cleaned dataset dated exactly at a timestamp, reading only the
+    matching rows of the columnar copy.
+
+    Args:
+        csv_path (str): Path to the cleaned CSV file.
+        date_column (str): Column holding the row dates.
+        timestamp (pd.Timestamp): Date of the rows to load.
+
+    Returns:
+        pd.DataFrame: The matching rows.
+    """
+    if _store_is_current(csv_path):
+        return pd.read_parquet(store_path(csv_path), filters=[(date_column, '==', timestamp)])
+    data = load_cleaned_data(csv_path)
+    return data[data[date_column] == timestamp]
+
+
+def _store_is_current(csv_path):
+    """
+    Check whether the Parquet copy of a CSV exists and its newest part is at least as new
+    as the CSV.
+    """
+    parts = _store_parts(store_path(csv_path))
+    if not parts:
+        return False
+    if not os.path.exists(csv_path):
+        return True
+    return max(os.path.getmtime(part) for part in parts) >= os.path.getmtime(csv_path)
@@ -0,0 +1,66 @@
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from dateutil import parser
+
+# Timestamp layouts seen in the news and price feeds, as (regex, strptime format) pairs.
+# The regex only covers the wall-clock part; any trailing UTC offset is matched separately
+# and dropped, which is what parser.parse(..., ignoretz=True) does.
+TIMESTAMP_FORMATS = [
+    (r'\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}', '%Y-%m-%d %H:%M:%S'),
+    (r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}', '%Y-%m-%dT%H:%M:%S'),
+    (r'\d{4}-\d{2}-\d{2}', '%Y-%m-%d'),
+]
+UTC_OFFSET = r'(?:Z|[+-]\d{2}(?::?\d{2})?)?'
+
+
+@lru_cache(maxsize=65536)
+def _parse_fallback(value):
+    """
+    Parse a single timestamp string with dateutil. Memoized so repeated strings across
+    calls (e.g. consecutive chunks of the same file) are only parsed once.
+    """
+    return parser.parse(value, fuzzy=True, ignoretz=True)
+
+
+def parse_timestamps(values):
+    """
+    Parse a column of timestamp strings into naive datetimes, giving the same result as
+    values.apply(lambda x: parser.parse(x, fuzzy=True, ignoretz=True)).
+
+    Each distinct string is parsed only once. Strings matching one of TIMESTAMP_FORMATS
+    are parsed in one vectorized pass per format with any UTC offset stripped; everything
+    else falls back to dateutil.
+
+    Args:
+        values (pd.Series): Column of timestamp strings.
+
+    Returns:
+        tuple: (pd.Series of datetime64 values aligned with `values`, number of rows that
+        needed the dateutil fallback)
+    """
+    # Reduce the column to its distinct strings; codes map every row back to one of them
+    codes, uniques = pd.factorize(values, use_na_sentinel=False)
+    uniques = pd.Series(uniques, dtype=object)
+    parsed = pd.Series(pd.NaT, index=uniques.index, dtype='datetime64[ns]')
+    pending = pd.Series(True, index=uniques.index)
+
+    strings = uniques[uniques.map(lambda x: isinstance(x, str))].str.strip()
+    for pattern, fmt in TIMESTAMP_FORMATS:
+        candidates = strings[pending[strings.index]]
+        if candidates.empty:
+            break
+        # Keep the wall-clock part of strings that match the layout, drop the UTC offset
+        wall_clock = candidates.str.extract(f'^({pattern}){UTC_OFFSET}$', expand=False).dropna()
+        converted = pd.to_datetime(wall_clock, format=fmt, errors='coerce').dropna()
+        parsed[converted.index] = converted
+        pending[converted.index] = False
+
+    # Anything left over (other layouts, invalid dates, non-strings) goes through dateutil
+    fallback_index = pending[pending].index
+    if len(fallback_index) > 0:
+        parsed[fallback_index] = pd.to_datetime([_parse_fallback(x) for x in uniques[fallback_index]])
+
+    fallback_rows = int(np.count_nonzero(pending.to_numpy()[codes]))
+    result = pd.Series(parsed.to_numpy()[codes], index=values.index, name=values.name)
+    return result, fallback_rows
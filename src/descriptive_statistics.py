@@ -1,10 +1,11 @@
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
+from data_store import load_news_data
 
 def generate_headline_length_stats_image(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the cleaned data (all columns, duplicates are detected on full rows)
+    df = load_news_data(file_path)
 
     # Check dataset size
     print(f"Total rows in DataFrame: {df.shape[0]}")
@@ -17,7 +18,7 @@ def generate_headline_length_stats_image(file_path):
     print(f"Null values in 'headline': {df['headline'].isnull().sum()}")
 
     # Step 1: Calculate headline length
-    df['headline_length'] = df['headline'].apply(len)
+    df['headline_length'] = df['headline'].str.len().astype('int32')
 
     # Step 2: Descriptive Statistics on headline length
     headline_length_stats = df['headline_length'].describe()
@@ -48,8 +49,8 @@ def generate_headline_length_stats_image(file_path):
 
 
 def count_articles_per_publisher(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the publisher column from the cleaned data store
+    df = load_news_data(file_path, columns=['publisher'])
 
     # Step 1: Count the number of articles per publisher
     publisher_counts = df['publisher'].value_counts()
@@ -75,8 +76,8 @@ def count_articles_per_publisher(file_path):
 
 
 def analyze_publication_dates_over_time(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the date column from the cleaned data store
+    df = load_news_data(file_path, columns=['date'])
 
     df['date'] = pd.to_datetime(df['date'], errors='coerce')
 
@@ -103,8 +104,8 @@ def analyze_publication_dates_over_time(file_path):
     plt.savefig('results/descriptive_statistics/articles_per_day.png', dpi=300)
 
 def analyze_publication_dates_per_week(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the date column from the cleaned data store
+    df = load_news_data(file_path, columns=['date'])
 
     # Step 1: Ensure 'date' column is in datetime format
     df['date'] = pd.to_datetime(df['date'], errors='coerce')
@@ -115,13 +116,13 @@ def analyze_publication_dates_per_week(file_path):
 
     # Step 3: Extract the day of the week from the 'date' column
     # .dt.weekday: Monday=0, Tuesday=1, ..., Sunday=6
-    df['publication_day_of_week'] = df['date'].dt.weekday  # Monday = 0, Sunday = 6
+    df['publication_day_of_week'] = df['date'].dt.weekday.astype('int32')  # Monday = 0, Sunday = 6
 
     # Step 4: Map weekdays to names (optional for readability)
     weekday_map = {
         0: 'Monday', 1: 'Tuesday', 2: 'Wednesday', 3: 'Thursday', 4: 'Friday', 5: 'Saturday', 6: 'Sunday'
     }
-    df['weekday_name'] = df['publication_day_of_week'].map(weekday_map)
+    df['weekday_name'] = df['publication_day_of_week'].map(weekday_map).astype('category')
 
     # Step 5: Count the number of articles published per day of the week
     weekday_publication_counts = df['weekday_name'].value_counts().sort_index()
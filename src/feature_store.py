@@ -0,0 +1,121 @@
+import os
+import hashlib
+import pandas as pd
+from data_store import load_cleaned_data
+from indicator_backends import INDICATORS, get_backend
+
+# On-disk indicator store, one folder per ticker file
+STORE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'feature_store'))
+
+# Price columns the indicators are computed from
+PRICE_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def feature_key(indicator, params):
+    """
+    Build the key of one indicator series, e.g. 'MACD(fastperiod=12,signalperiod=9,slowperiod=26)'.
+
+    Args:
+        indicator (str): Indicator name, one of INDICATORS.
+        params (dict): Keyword arguments of the indicator.
+
+    Returns:
+        str: Indicator name with its parameters in sorted order.
+    """
+    if indicator not in INDICATORS:
+        raise ValueError(f"Unknown indicator '{indicator}'.")
+    return f"{indicator}({','.join(f'{name}={value}' for name, value in sorted(params.items()))})"
+
+
+def price_hash(prices):
+    """
+    Hash a ticker's price data, so stored indicators are only reused for identical input.
+
+    Args:
+        prices (pd.DataFrame): Price data indexed by date.
+
+    Returns:
+        str: Hex digest of the dates and values.
+    """
+    return hashlib.sha256(pd.util.hash_pandas_object(prices, index=True).to_numpy().tobytes()).hexdigest()
+
+
+class IndicatorStore:
+    """
+    Technical indicators of one ticker, each (indicator, parameters) series computed once
+    and shared by every analysis and plotting module.
+
+    Series are persisted in a Parquet file keyed by the indicator backend and the hash of
+    the ticker's price data, so a later run over an unchanged file is a cache hit and a
+    changed file (or another backend) starts afresh. New series are kept in memory until
+    save() is called, so a caller requesting several indicators writes the file once.
+    """
+
+    def __init__(self, file_path, store_folder=STORE_FOLDER, backend=None):
+        """
+        Args:
+            file_path (str): Path to the cleaned stock price CSV file.
+            store_folder (str): Folder holding the stored indicators.
+            backend (str): Indicator backend, 'talib' or 'numpy'. None uses TA-Lib when it
+                is installed and the NumPy backend otherwise.
+        """
+        self.name = os.path.splitext(os.path.basename(file_path))[0]
+        self.backend = get_backend(backend)
+        self.prices = load_cleaned_data(file_path, columns=['Date'] + PRICE_COLUMNS).set_index('Date')
+        self.folder = os.path.join(store_folder, self.name)
+        engine_key = f"{self.backend.name}-{self.backend.version}"
+        self.path = os.path.join(self.folder, f"{engine_key}-{price_hash(self.prices)}.parquet")
+        if os.path.exists(self.path):
+            self.features = pd.read_parquet(self.path)
+            self.features.index = self.prices.index
+        else:
+            self.features = pd.DataFrame(index=self.prices.index)
+        self.unsaved = False
+
+    def get(self, indicator, **params):
+        """
+        Get an indicator series, computing it on the first request. Call save() to
+        persist newly computed series.
+
+        Args:
+            indicator (str): Indicator name, e.g. 'SMA' or 'MACD'.
+            **params: Keyword arguments as for the TA-Lib function, e.g. timeperiod=20.
+
+        Returns:
+            pd.Series or tuple: The series for single-output indicators, otherwise a tuple
+            of series in TA-Lib's output order (like talib.MACD returns).
+        """
+        key = feature_key(indicator, params)
+        inputs, outputs = INDICATORS[indicator]
+        columns = [f"{key}.{output}" for output in outputs]
+        if not all(column in self.features.columns for column in columns):
+            missing = [col for col in inputs if col not in self.prices.columns]
+            if missing:
+                raise ValueError(f"Price data of '{self.name}' is missing columns {missing} for {indicator}.")
+            results = self.backend.compute(indicator, *(self.prices[col] for col in inputs), **params)
+            for column, values in zip(columns, results):
+                self.features[column] = values
+            self.unsaved = True
+
+        series = [self.features[column].rename(None) for column in columns]
+        return series[0] if len(series) == 1 else tuple(series)
+
+    def save(self):
+        """
+        Persist the stored series if any were computed since the last save, and drop this
+        backend's files left from earlier versions of the prices. The file is written
+        under a temporary name and then renamed, so readers never see a partial file.
+        """
+        if not self.unsaved:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        temp_path = os.path.join(self.folder, f".{os.path.basename(self.path)}.tmp")
+        self.features.reset_index(drop=True).to_parquet(temp_path, index=False)
+        os.replace(temp_path, self.path)
+        self.unsaved = False
+
+        # Files of other backends stay, so switching backends doesn't recompute everything
+        for file_name in os.listdir(self.folder):
+            file_path = os.path.join(self.folder, file_name)
+            if file_name.startswith(f"{self.backend.name}-") and file_path != self.path:
+                os.remove(file_path)
@@ -0,0 +1,102 @@
+import numpy as np
+from panel_indicators import matrix_indicator
+
+try:
+    import talib
+except ImportError:
+    talib = None
+
+# Indicators every backend computes -> (price inputs, output names in TA-Lib's order)
+INDICATORS = {
+    'SMA': (['Close'], ['real']),
+    'EMA': (['Close'], ['real']),
+    'RSI': (['Close'], ['real']),
+    'MACD': (['Close'], ['macd', 'macdsignal', 'macdhist']),
+    'BBANDS': (['Close'], ['upperband', 'middleband', 'lowerband']),
+    'ATR': (['High', 'Low', 'Close'], ['real']),
+    'STOCH': (['High', 'Low', 'Close'], ['slowk', 'slowd']),
+}
+
+
+class TalibBackend:
+    """
+    Compute indicators with the TA-Lib C library.
+    """
+
+    name = 'talib'
+
+    def __init__(self):
+        if talib is None:
+            raise ImportError("TA-Lib is not installed; use the 'numpy' indicator backend.")
+        self.version = talib.__version__
+
+    def compute(self, indicator, *inputs, **params):
+        """
+        Args:
+            indicator (str): Indicator name, one of INDICATORS.
+            *inputs: Price arrays in the order of INDICATORS[indicator][0].
+            **params: Keyword arguments of the TA-Lib function, e.g. timeperiod=20.
+
+        Returns:
+            tuple: One np.ndarray per output, in TA-Lib's output order.
+        """
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{indicator}'.")
+        results = getattr(talib, indicator)(*(np.asarray(values, dtype=float) for values in inputs), **params)
+        return results if isinstance(results, tuple) else (results,)
+
+
+class NumpyBackend:
+    """
+    Compute indicators with the vectorized NumPy kernels of panel_indicators, for
+    environments without the TA-Lib C library. Results match TA-Lib to rounding error for
+    complete price series; a row with a missing price is skipped instead of turning the
+    rest of the series into NaN. Moving-average types other than simple (matype=0) are
+    not supported.
+    """
+
+    name = 'numpy'
+
+    def __init__(self):
+        self.version = np.__version__
+
+    def compute(self, indicator, *inputs, **params):
+        """
+        Args:
+            indicator (str): Indicator name, one of INDICATORS.
+            *inputs: Price arrays in the order of INDICATORS[indicator][0].
+            **params: Keyword arguments as for the TA-Lib function, e.g. timeperiod=20.
+
+        Returns:
+            tuple: One np.ndarray per output, in TA-Lib's output order.
+        """
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown indicator '{indicator}'.")
+        # One ticker: each input becomes a single-column price matrix
+        columns = [np.asarray(values, dtype=float).reshape(-1, 1) for values in inputs]
+        return tuple(values[:, 0] for values in matrix_indicator(indicator, *columns, **params))
+
+
+# Indicator backends by name
+BACKENDS = {
+    'talib': TalibBackend,
+    'numpy': NumpyBackend,
+}
+
+
+def get_backend(name=None):
+    """
+    Create an indicator backend.
+
+    Args:
+        name (str): 'talib' or 'numpy'. None picks TA-Lib when it can be imported and
+            falls back to the NumPy backend otherwise.
+
+    Returns:
+        TalibBackend or NumpyBackend: The backend.
+    """
+    if name is None:
+        name = 'numpy' if talib is None else 'talib'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown indicator backend '{name}'.")
+    return BACKENDS[name]()
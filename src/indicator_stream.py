@@ -0,0 +1,473 @@
+import os
+import json
+import math
+import pandas as pd
+from data_store import load_cleaned_data, save_cleaned_data, append_cleaned_data
+
+# Checkpoint of the streaming indicator state, kept next to the cleaned datasets
+STATE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'indicator_state.json'))
+
+# Indicator values of every ticker, one cleaned dataset per ticker file
+VALUES_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'streaming_indicators'))
+
+# Indicators kept up to date per ticker, as (output columns, indicator, parameters); the
+# columns and parameters are those of quantitative_analysis.apply_ta_indicators_and_save_images
+DEFAULT_INDICATORS = [
+    (['SMA_20'], 'SMA', {'timeperiod': 20}),
+    (['EMA_20'], 'EMA', {'timeperiod': 20}),
+    (['RSI_14'], 'RSI', {'timeperiod': 14}),
+    (['MACD', 'MACD_Signal', 'MACD_Hist'], 'MACD', {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}),
+    (['Bollinger_Upper', 'Bollinger_Middle', 'Bollinger_Lower'], 'BBANDS',
+     {'timeperiod': 20, 'nbdevup': 2, 'nbdevdn': 2, 'matype': 0}),
+    (['ATR'], 'ATR', {'timeperiod': 14}),
+    (['Stochastic_K', 'Stochastic_D'], 'STOCH', {'fastk_period': 14, 'slowk_period': 3, 'slowd_period': 3}),
+]
+
+# Price columns a bar needs
+BAR_COLUMNS = ['High', 'Low', 'Close']
+
+NAN = float('nan')
+
+
+class StreamingIndicator:
+    """
+    Base class of the streaming indicators. Each one keeps only the state the next bar
+    needs (ring buffers or smoothed averages) and follows TA-Lib's recursions step by step,
+    so a stream fed from a ticker's first bar gives TA-Lib's values, warm-up included.
+
+    All state is plain numbers and lists, so it can be checkpointed as JSON.
+    """
+
+    def state(self):
+        """Get the indicator's state as a JSON-serializable dict."""
+        state = {}
+        for name, value in vars(self).items():
+            if isinstance(value, StreamingIndicator):
+                value = {'indicator': type(value).__name__, 'state': value.state()}
+            elif isinstance(value, list):
+                value = list(value)
+            state[name] = value
+        return state
+
+    @classmethod
+    def from_state(cls, state):
+        """Restore an indicator from the output of state()."""
+        indicator = cls.__new__(cls)
+        for name, value in state.items():
+            if isinstance(value, dict) and 'indicator' in value:
+                value = STREAMING_INDICATORS[value['indicator']][0].from_state(value['state'])
+            setattr(indicator, name, value)
+        return indicator
+
+
+class SMA(StreamingIndicator):
+    """Simple moving average over a ring buffer, with TA-Lib's running sum."""
+
+    def __init__(self, timeperiod=30):
+        self.period = timeperiod
+        self.buffer = [0.0] * timeperiod
+        self.count = 0
+        self.total = 0.0
+
+    def update(self, value):
+        """
+        Args:
+            value (float): The new input value.
+
+        Returns:
+            float: The moving average, NaN during the warm-up.
+        """
+        self.total += value
+        self.buffer[self.count % self.period] = value
+        self.count += 1
+        if self.count < self.period:
+            return NAN
+        result = self.total / self.period
+        # Drop the oldest value so the total is ready for the next bar
+        self.total -= self.buffer[self.count % self.period]
+        return result
+
+
+class EMA(StreamingIndicator):
+    """Exponential moving average seeded with the simple average of the first bars."""
+
+    def __init__(self, timeperiod=30):
+        self.period = timeperiod
+        self.k = 2.0 / (timeperiod + 1)
+        self.count = 0
+        self.value = 0.0
+
+    def seed(self, value):
+        """Start the average at `value` (used by MACD, whose seeds TA-Lib takes elsewhere)."""
+        self.count = self.period
+        self.value = value
+
+    def update(self, value):
+        if self.count < self.period:
+            self.value += value
+            self.count += 1
+            if self.count < self.period:
+                return NAN
+            self.value /= self.period
+            return self.value
+        self.value = (value - self.value) * self.k + self.value
+        return self.value
+
+
+class RSI(StreamingIndicator):
+    """Relative strength index with Wilder smoothing of the average gain and loss."""
+
+    def __init__(self, timeperiod=14):
+        self.period = timeperiod
+        self.count = 0
+        self.previous = NAN
+        self.gain = 0.0
+        self.loss = 0.0
+
+    def update(self, value):
+        difference = value - self.previous
+        self.previous = value
+        self.count += 1
+        if self.count == 1:
+            return NAN
+        if self.count <= self.period + 1:
+            if difference < 0:
+                self.loss -= difference
+            else:
+                self.gain += difference
+            if self.count <= self.period:
+                return NAN
+            self.loss /= self.period
+            self.gain /= self.period
+        else:
+            self.loss *= self.period - 1
+            self.gain *= self.period - 1
+            if difference < 0:
+                self.loss -= difference
+            else:
+                self.gain += difference
+            self.loss /= self.period
+            self.gain /= self.period
+        total = self.gain + self.loss
+        # TA-Lib reports 0 when the total is exactly zero, and also once a NaN bar has made it NaN
+        return 100.0 * (self.gain / total) if total > 0.0 or total < 0.0 else 0.0
+
+
+class MACD(StreamingIndicator):
+    """
+    Moving average convergence/divergence. As in TA-Lib, both EMAs start at the slow
+    period's first bar: the fast EMA is seeded with the simple average of the `fastperiod`
+    bars up to there, not of the first bars.
+    """
+
+    def __init__(self, fastperiod=12, slowperiod=26, signalperiod=9):
+        if slowperiod < fastperiod:
+            fastperiod, slowperiod = slowperiod, fastperiod
+        self.fast = EMA(fastperiod)
+        self.slow = EMA(slowperiod)
+        self.signal = EMA(signalperiod)
+        self.recent = []
+
+    def update(self, value):
+        slow_value = self.slow.update(value)
+        if self.fast.count < self.fast.period:
+            # Keep the last `fastperiod` values until the slow EMA has its seed
+            self.recent = (self.recent + [value])[-self.fast.period:]
+            if math.isnan(slow_value):
+                return NAN, NAN, NAN
+            self.fast.seed(_sequential_sum(self.recent) / self.fast.period)
+            self.recent = []
+            fast_value = self.fast.value
+        else:
+            fast_value = self.fast.update(value)
+
+        macd = fast_value - slow_value
+        signal_value = self.signal.update(macd)
+        if math.isnan(signal_value):
+            return NAN, NAN, NAN
+        return macd, signal_value, macd - signal_value
+
+
+class BBANDS(StreamingIndicator):
+    """
+    Bollinger bands around a simple moving average, using the population std.
+
+    The running sums are taken about an anchor, moved to the newest value once per cycle
+    of the buffer, so they stay at the scale of the recent price changes rather than of
+    the price level and the variance loses little precision to cancellation. Windows
+    whose values are all equal get exactly zero width rather than rounding noise.
+    """
+
+    def __init__(self, timeperiod=5, nbdevup=2, nbdevdn=2, matype=0):
+        if matype != 0:
+            raise ValueError("Streaming Bollinger bands only support a simple moving average (matype=0).")
+        self.period = timeperiod
+        self.nbdevup = nbdevup
+        self.nbdevdn = nbdevdn
+        self.buffer = [0.0] * timeperiod
+        self.count = 0
+        self.anchor = 0.0
+        # Sums of the values in the window minus the anchor, and of their squares
+        self.total = 0.0
+        self.total_squares = 0.0
+        # Neighbouring values in the window that differ; zero in a flat window
+        self.changes = 0
+
+    def update(self, value):
+        if self.count % self.period == 0 and not math.isnan(self.total):
+            # Recompute the sums of the values held so far about the new anchor, which
+            # costs one pass over the buffer per cycle. A NaN bar leaves the sums NaN for
+            # good, as TA-Lib's running sums are
+            self.anchor = value
+            held = [self.buffer[i % self.period] - value for i in range(max(self.count - self.period + 1, 0), self.count)]
+            self.total = _sequential_sum(held)
+            self.total_squares = _sequential_sum([deviation * deviation for deviation in held])
+
+        centered = value - self.anchor
+        self.total += centered
+        self.total_squares += centered * centered
+        if self.count > 0 and value != self.buffer[(self.count - 1) % self.period]:
+            self.changes += 1
+        self.buffer[self.count % self.period] = value
+        self.count += 1
+        if self.count < self.period:
+            return NAN, NAN, NAN
+        mean = self.total / self.period
+        variance = self.total_squares / self.period - mean * mean
+        flat = self.changes == 0
+        oldest = self.buffer[self.count % self.period]
+        if oldest != self.buffer[(self.count + 1) % self.period]:
+            self.changes -= 1
+        oldest -= self.anchor
+        self.total -= oldest
+        self.total_squares -= oldest * oldest
+
+        middle = self.anchor + mean
+        # Only a variance rounded to zero or below is clamped, as in TA-Lib; NaN stays NaN
+        std = math.sqrt(variance) if not (flat or variance <= 0.0) else 0.0
+        return middle + std * self.nbdevup, middle, middle - std * self.nbdevdn
+
+
+class ATR(StreamingIndicator):
+    """Average true range with Wilder smoothing, seeded with the mean of the first true ranges."""
+
+    def __init__(self, timeperiod=14):
+        self.period = timeperiod
+        self.count = 0
+        self.previous_close = NAN
+        self.value = 0.0
+
+    def update(self, high, low, close):
+        previous_close = self.previous_close
+        self.previous_close = close
+        self.count += 1
+        if self.count == 1:
+            return NAN
+        true_range = max(high - low, abs(previous_close - high), abs(previous_close - low))
+        if self.count <= self.period + 1:
+            self.value += true_range
+            if self.count <= self.period:
+                return NAN
+            self.value /= self.period
+            return self.value
+        self.value *= self.period - 1
+        self.value += true_range
+        self.value /= self.period
+        return self.value
+
+
+class STOCH(StreamingIndicator):
+    """Slow stochastic oscillator: %K over ring buffers of highs and lows, smoothed twice."""
+
+    def __init__(self, fastk_period=5, slowk_period=3, slowk_matype=0, slowd_period=3, slowd_matype=0):
+        if slowk_matype != 0 or slowd_matype != 0:
+            raise ValueError("Streaming stochastics only support simple moving averages (matype=0).")
+        self.period = fastk_period
+        self.highs = [0.0] * fastk_period
+        self.lows = [0.0] * fastk_period
+        self.count = 0
+        self.slowk = SMA(slowk_period)
+        self.slowd = SMA(slowd_period)
+
+    def update(self, high, low, close):
+        self.highs[self.count % self.period] = high
+        self.lows[self.count % self.period] = low
+        self.count += 1
+        if self.count < self.period:
+            return NAN, NAN
+        highest, lowest = max(self.highs), min(self.lows)
+        difference = (highest - lowest) / 100.0
+        fast_k = (close - lowest) / difference if difference != 0.0 else 0.0
+
+        slow_k = self.slowk.update(fast_k)
+        slow_d = self.slowd.update(slow_k) if not math.isnan(slow_k) else NAN
+        if math.isnan(slow_d):
+            return NAN, NAN
+        return slow_k, slow_d
+
+
+# Streaming indicators by TA-Lib name, with the price columns each one takes
+STREAMING_INDICATORS = {
+    'SMA': (SMA, ['Close']),
+    'EMA': (EMA, ['Close']),
+    'RSI': (RSI, ['Close']),
+    'MACD': (MACD, ['Close']),
+    'BBANDS': (BBANDS, ['Close']),
+    'ATR': (ATR, ['High', 'Low', 'Close']),
+    'STOCH': (STOCH, ['High', 'Low', 'Close']),
+}
+
+
+class IndicatorEngine:
+    """
+    Keep technical indicators of many tickers up to date one bar at a time.
+
+    Every new bar updates each indicator of its ticker in constant time, instead of
+    rerunning TA-Lib over the ticker's whole history. The engine's state can be saved and
+    loaded, so a daily run only feeds the bars added since the previous one.
+    """
+
+    def __init__(self, indicators=DEFAULT_INDICATORS):
+        """
+        Args:
+            indicators (list): (output columns, indicator, parameters) per indicator, with
+                indicator names from STREAMING_INDICATORS.
+        """
+        self.indicators = [(list(columns), name, dict(params)) for columns, name, params in indicators]
+        self.columns = [column for columns, _, _ in self.indicators for column in columns]
+        # ticker -> {'last_date': ISO date of the latest bar, 'indicators': streaming indicators}
+        self.tickers = {}
+
+    def update(self, ticker, date, bar):
+        """
+        Fold one new bar of a ticker into its indicators.
+
+        Bars must come in date order per ticker. Bars before the ticker's first complete
+        one are skipped, as TA-Lib skips leading NaNs.
+
+        Args:
+            ticker (str): Ticker name.
+            date: Date of the bar.
+            bar: Mapping with at least the 'High', 'Low' and 'Close' prices.
+
+        Returns:
+            dict: Value of every output column for this bar (NaN during the warm-up).
+        """
+        state = self.tickers.get(ticker)
+        if state is None:
+            state = self.tickers[ticker] = {
+                'last_date': None,
+                'indicators': [STREAMING_INDICATORS[name][0](**params) for _, name, params in self.indicators],
+            }
+        date = pd.Timestamp(date)
+        if state['last_date'] is not None and date <= pd.Timestamp(state['last_date']):
+            raise ValueError(f"Bar of {date.date()} for '{ticker}' is not after its latest bar ({state['last_date']}).")
+
+        prices = {column: float(bar[column]) for column in BAR_COLUMNS}
+        if state['last_date'] is None and any(math.isnan(value) for value in prices.values()):
+            return dict.fromkeys(self.columns, NAN)
+        state['last_date'] = date.isoformat()
+
+        values = {}
+        for (columns, name, _), indicator in zip(self.indicators, state['indicators']):
+            outputs = indicator.update(*(prices[column] for column in STREAMING_INDICATORS[name][1]))
+            values.update(zip(columns, outputs if len(columns) > 1 else [outputs]))
+        return values
+
+    def catch_up(self, ticker, prices):
+        """
+        Feed a ticker's bars that are newer than its latest bar in the engine.
+
+        Args:
+            ticker (str): Ticker name.
+            prices (pd.DataFrame): The ticker's price data indexed by date, in date order.
+
+        Returns:
+            pd.DataFrame: Indicator values of the new bars, indexed by date.
+        """
+        last_date = self.tickers.get(ticker, {}).get('last_date')
+        new_prices = prices if last_date is None else prices[prices.index > pd.Timestamp(last_date)]
+        rows = [self.update(ticker, date, bar) for date, bar in zip(new_prices.index, new_prices[BAR_COLUMNS].to_dict('records'))]
+        return pd.DataFrame(rows, index=new_prices.index, columns=self.columns)
+
+    def save(self, path=STATE_PATH):
+        """
+        Checkpoint the engine's state to a JSON file.
+
+        Args:
+            path (str): Path of the checkpoint file.
+
+        Returns:
+            None
+        """
+        checkpoint = {
+            'indicators': self.indicators,
+            'tickers': {
+                ticker: {'last_date': state['last_date'], 'indicators': [indicator.state() for indicator in state['indicators']]}
+                for ticker, state in self.tickers.items()
+            },
+        }
+        # Write under a temporary name and rename, so a crash never leaves a partial checkpoint
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        temp_path = os.path.join(folder, f".{os.path.basename(path)}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(checkpoint, f)
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path=STATE_PATH):
+        """
+        Restore an engine from a checkpoint written by save().
+
+        Args:
+            path (str): Path of the checkpoint file.
+
+        Returns:
+            IndicatorEngine: The restored engine.
+        """
+        with open(path, 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        engine = cls(checkpoint['indicators'])
+        for ticker, state in checkpoint['tickers'].items():
+            engine.tickers[ticker] = {
+                'last_date': state['last_date'],
+                'indicators': [STREAMING_INDICATORS[name][0].from_state(indicator_state)
+                               for (_, name, _), indicator_state in zip(engine.indicators, state['indicators'])],
+            }
+        return engine
+
+
+def _sequential_sum(values):
+    """Sum values left to right, the order TA-Lib adds them in."""
+    total = 0.0
+    for value in values:
+        total += value
+    return total
+
+
+if __name__ == '__main__':
+    # Bring the indicators of every ticker up to date with its latest bars and add the new
+    # values to the ticker's indicator dataset
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    engine = IndicatorEngine.load() if os.path.exists(STATE_PATH) else IndicatorEngine()
+    os.makedirs(VALUES_FOLDER, exist_ok=True)
+
+    for stock_file in sorted(f for f in os.listdir(input_folder) if f.endswith('.csv')):
+        stock_name = os.path.splitext(stock_file)[0]
+        prices = load_cleaned_data(os.path.join(input_folder, stock_file), columns=['Date'] + BAR_COLUMNS).set_index('Date')
+        values_path = os.path.join(VALUES_FOLDER, stock_file)
+        if not os.path.exists(values_path):
+            # Without its values file a ticker is replayed from its first bar
+            engine.tickers.pop(stock_name, None)
+        resumed = stock_name in engine.tickers
+
+        new_values = engine.catch_up(stock_name, prices)
+        print(f"{stock_name}: {len(new_values)} new bars")
+        if not resumed:
+            save_cleaned_data(new_values.reset_index(), values_path)
+        elif len(new_values):
+            append_cleaned_data(new_values.reset_index(), values_path)
+
+    # Checkpoint once the values are written, so a failed run never skips bars
+    engine.save()
@@ -0,0 +1,267 @@
+import os
+import time
+import itertools
+import numpy as np
+from scipy.signal import lfilter
+from data_store import load_cleaned_data
+
+# Parameter combinations computed at once; bounds the working memory of a sweep
+DEFAULT_CHUNK_SIZE = 256
+
+
+def _prefix_sums(close, shared):
+    """
+    Cumulative sums of the closes minus the first close, with a leading zero, so the
+    sum of any window is the difference of two entries. One array serves every window.
+    """
+    if 'prefix' not in shared:
+        shared['prefix'] = np.concatenate(([0.0], np.cumsum(close - close[0])))
+    return shared['prefix']
+
+
+def _window_means(close, period, shared):
+    """Mean of every window of `period` closes, one value per complete window."""
+    prefix = _prefix_sums(close, shared)
+    return (prefix[period:] - prefix[:-period]) / period + close[0]
+
+
+def _ema_series(close, period, shared):
+    """
+    EMA of the closes seeded, as TA-Lib does, with the mean of the first `period` closes.
+    Each period's recursion runs once per sweep, however many combinations use it.
+    """
+    emas = shared.setdefault('ema', {})
+    if period not in emas:
+        result = np.full(len(close), np.nan)
+        if period <= len(close):
+            k = 2.0 / (period + 1)
+            result[period - 1] = close[:period].mean()
+            result[period:], _ = lfilter([k], [1.0, k - 1.0], close[period:], zi=[(1.0 - k) * result[period - 1]])
+        emas[period] = result
+    return emas[period]
+
+
+def _decay_powers(period, length, shared):
+    """Powers 0..length-1 of the EMA decay factor of `period`."""
+    powers = shared.setdefault('decay', {})
+    if period not in powers or len(powers[period]) < length:
+        powers[period] = (1.0 - 2.0 / (period + 1)) ** np.arange(length)
+    return powers[period][:length]
+
+
+def _sma_chunk(close, combinations, shared, result):
+    for row, (period,) in enumerate(combinations):
+        values = result[row, 0]
+        values[:period - 1] = np.nan
+        if period <= len(close):
+            prefix = _prefix_sums(close, shared)
+            np.subtract(prefix[period:], prefix[:-period], out=values[period - 1:])
+            values[period - 1:] /= period
+            values[period - 1:] += close[0]
+
+
+def _ema_chunk(close, combinations, shared, result):
+    for row, (period,) in enumerate(combinations):
+        result[row, 0] = _ema_series(close, period, shared)
+
+
+def _rsi_chunk(close, combinations, shared, result):
+    if 'gains' not in shared:
+        changes = np.diff(close)
+        shared['gains'] = np.where(changes > 0, changes, 0.0)
+        shared['losses'] = np.where(changes < 0, -changes, 0.0)
+    gains, losses = shared['gains'], shared['losses']
+    for row, (period,) in enumerate(combinations):
+        values = result[row, 0]
+        values[:period] = np.nan
+        if period >= len(close):
+            continue
+        decay = (period - 1) / period
+        average_gain = np.empty(len(close) - period)
+        average_loss = np.empty(len(close) - period)
+        average_gain[0] = gains[:period].sum() / period
+        average_loss[0] = losses[:period].sum() / period
+        average_gain[1:], _ = lfilter([1.0 - decay], [1.0, -decay], gains[period:], zi=[decay * average_gain[0]])
+        average_loss[1:], _ = lfilter([1.0 - decay], [1.0, -decay], losses[period:], zi=[decay * average_loss[0]])
+        total = average_gain + average_loss
+        # TA-Lib reports 0 only for an exactly zero total, however small the averages get
+        with np.errstate(invalid='ignore', divide='ignore'):
+            values[period:] = np.where(total == 0.0, 0.0, 100.0 * (average_gain / total))
+
+
+def _macd_line(close, fast, slow, shared):
+    """
+    Fast minus slow EMA of one (fast, slow) pair, NaN before the slow EMA's first row.
+    Computed once per pair, however many signal periods the grid combines it with.
+    """
+    lines = shared.setdefault('macd', {})
+    if (fast, slow) not in lines:
+        length = len(close)
+        line = np.full(length, np.nan)
+        if slow <= length:
+            # TA-Lib seeds the fast EMA on the slow EMA's first row. After the seed both
+            # follow the same recursion, so the shared fast EMA plus its decaying seed
+            # difference gives the pair's fast EMA without running another recursion.
+            start = slow - 1
+            fast_ema = _ema_series(close, fast, shared)
+            seed = close[slow - fast:slow].mean()
+            np.multiply(_decay_powers(fast, length - start, shared), seed - fast_ema[start], out=line[start:])
+            line[start:] += fast_ema[start:]
+            line[start:] -= _ema_series(close, slow, shared)[start:]
+        lines[(fast, slow)] = line
+    return lines[(fast, slow)]
+
+
+def _macd_chunk(close, combinations, shared, result):
+    length = len(close)
+    macd, signal, histogram = result[:, 0], result[:, 1], result[:, 2]
+    pairs = np.sort(combinations[:, :2], axis=1)
+    for row, (fast, slow) in enumerate(pairs):
+        macd[row] = _macd_line(close, fast, slow, shared)
+
+    # The signal EMA starts on the first MACD row, so rows sharing the slow and signal
+    # periods are filtered together
+    groups = np.stack([pairs[:, 1], combinations[:, 2]], axis=1)
+    for slow, period in np.unique(groups, axis=0):
+        rows = np.flatnonzero((groups == (slow, period)).all(axis=1))
+        first = min(slow + period - 2, length)
+        if first < length:
+            k = 2.0 / (period + 1)
+            seed = macd[rows, slow - 1:first + 1].mean(axis=1)
+            signal[rows, first] = seed
+            signal[rows, first + 1:], _ = lfilter([k], [1.0, k - 1.0], macd[rows, first + 1:], axis=1, zi=(1.0 - k) * seed[:, np.newaxis])
+        macd[rows, :first] = np.nan
+        signal[rows, :first] = np.nan
+    np.subtract(macd, signal, out=histogram)
+
+
+# Indicators the sweep supports -> (chunk function, TA-Lib parameters with their
+# defaults, in grid axis order, output names)
+SWEEP_INDICATORS = {
+    'SMA': (_sma_chunk, {'timeperiod': 30}, ['real']),
+    'EMA': (_ema_chunk, {'timeperiod': 30}, ['real']),
+    'RSI': (_rsi_chunk, {'timeperiod': 14}, ['real']),
+    'MACD': (_macd_chunk, {'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}, ['macd', 'macdsignal', 'macdhist']),
+}
+
+
+def parameter_grid(indicator, **ranges):
+    """
+    Build the parameter axes of a sweep.
+
+    Args:
+        indicator (str): Indicator name, one of SWEEP_INDICATORS.
+        **ranges: Values to sweep per TA-Lib parameter, e.g. timeperiod=range(5, 201).
+            Parameters left out keep their TA-Lib default.
+
+    Returns:
+        dict: Parameter name -> np.ndarray of its values, in grid axis order.
+    """
+    if indicator not in SWEEP_INDICATORS:
+        raise ValueError(f"Unknown indicator '{indicator}'.")
+    defaults = SWEEP_INDICATORS[indicator][1]
+    unknown = [name for name in ranges if name not in defaults]
+    if unknown:
+        raise ValueError(f"{indicator} has no parameters {unknown}.")
+
+    grid = {}
+    for name, default in defaults.items():
+        values = np.atleast_1d(np.asarray(ranges.get(name, default)))
+        if values.size == 0 or not np.issubdtype(values.dtype, np.integer) or (values < 1).any():
+            raise ValueError(f"{indicator} {name} must be one or more positive integers.")
+        grid[name] = values
+    return grid
+
+
+def _sweep(close, indicator, grid, chunk_size, flat=None):
+    """
+    Compute the chunks of a sweep, into consecutive rows of `flat` if given, otherwise
+    into a new array per chunk.
+    """
+    function, _, outputs = SWEEP_INDICATORS[indicator]
+    close = np.asarray(close, dtype=float)
+    valid = np.flatnonzero(~np.isnan(close))
+    start = valid[0] if len(valid) else len(close)
+    shared = {}
+
+    combinations = np.array(list(itertools.product(*grid.values())), dtype=np.int64).reshape(-1, len(grid))
+    for offset in range(0, len(combinations), chunk_size):
+        chunk = combinations[offset:offset + chunk_size]
+        values = np.empty((len(chunk), len(outputs), len(close))) if flat is None else flat[offset:offset + len(chunk)]
+        values[:, :, :start] = np.nan
+        if start < len(close):
+            function(close[start:], chunk, shared, values[:, :, start:])
+        yield chunk, values
+
+
+def sweep_chunks(close, indicator, chunk_size=DEFAULT_CHUNK_SIZE, **ranges):
+    """
+    Compute an indicator for every combination of a parameter grid, a chunk at a time.
+
+    Work shared between combinations (the cumulative sum behind every moving average, the
+    EMA recursion of each distinct period) is done once for the whole sweep.
+
+    Args:
+        close: Closing prices of one ticker in date order. Leading NaNs are skipped, as
+            TA-Lib does.
+        indicator (str): Indicator name, one of SWEEP_INDICATORS.
+        chunk_size (int): Parameter combinations computed at once.
+        **ranges: Values to sweep per TA-Lib parameter, see parameter_grid.
+
+    Yields:
+        tuple: (combinations, values) with one row of parameter values per combination,
+        in grid order, and an array of shape (combinations, outputs, dates).
+    """
+    yield from _sweep(close, indicator, parameter_grid(indicator, **ranges), chunk_size)
+
+
+def indicator_sweep(close, indicator, chunk_size=DEFAULT_CHUNK_SIZE, out=None, **ranges):
+    """
+    Compute an indicator over a whole parameter grid as one tensor.
+
+    Args:
+        close: Closing prices of one ticker in date order.
+        indicator (str): Indicator name, one of SWEEP_INDICATORS.
+        chunk_size (int): Parameter combinations computed at once.
+        out (np.ndarray): Optional array to write into, e.g. a np.memmap for grids that
+            don't fit in memory. Must have the shape of the result.
+        **ranges: Values to sweep per TA-Lib parameter, e.g. fastperiod=range(5, 21).
+
+    Returns:
+        tuple: (grid, tensor) where grid maps each parameter to its axis values and the
+        tensor has shape (*parameter axis lengths, outputs, dates), e.g.
+        tensor[i, j, k, 0] is the MACD line of (fast[i], slow[j], signal[k]).
+    """
+    grid = parameter_grid(indicator, **ranges)
+    outputs = SWEEP_INDICATORS[indicator][2]
+    shape = tuple(len(values) for values in grid.values()) + (len(outputs), len(close))
+    if out is None:
+        out = np.empty(shape)
+    elif out.shape != shape:
+        raise ValueError(f"Output array has shape {out.shape}, the sweep needs {shape}.")
+
+    # Chunks are computed straight into the tensor, without an intermediate copy
+    for _ in _sweep(close, indicator, grid, chunk_size, out.reshape(-1, len(outputs), len(close))):
+        pass
+    return grid, out
+
+
+if __name__ == '__main__':
+    # Sweep the moving-average and MACD windows of every ticker
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    sweeps = [
+        ('SMA', {'timeperiod': range(5, 201)}),
+        ('EMA', {'timeperiod': range(5, 201)}),
+        ('RSI', {'timeperiod': range(5, 31)}),
+        ('MACD', {'fastperiod': range(5, 21), 'slowperiod': range(20, 61, 2), 'signalperiod': range(5, 13)}),
+    ]
+
+    for stock_file in sorted(f for f in os.listdir(input_folder) if f.endswith('.csv')):
+        close = load_cleaned_data(os.path.join(input_folder, stock_file), columns=['Date', 'Close'])['Close']
+        print(f"\nProcessing file: {stock_file}")
+        for indicator, ranges in sweeps:
+            start_time = time.perf_counter()
+            grid, tensor = indicator_sweep(close, indicator, **ranges)
+            elapsed = time.perf_counter() - start_time
+            combinations = int(np.prod([len(values) for values in grid.values()]))
+            print(f"{indicator:<5} {combinations:>5} combinations, tensor {tensor.shape}: {elapsed:.3f}s")
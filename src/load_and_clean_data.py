@@ -1,13 +1,37 @@
-import gdown
-import pandas as pd
-from dateutil import parser
 import os
-
-def download_from_gdrive(file_id, output_path):
-    url = f"https://drive.google.com/uc?id={file_id}"
-    gdown.download(url, output_path, quiet=False)
-
-def load_and_clean_data():
+import argparse
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from price_cleaning import clean_price_file, print_correction_summary
+from manifest import MANIFEST_PATH, load_manifest, save_manifest, is_unchanged, raw_offset, write_cleaned_rows
+from data_sources import GoogleDriveSource, fetch_dataset
+
+def load_and_clean_data(incremental=False, source=None, datasets=None, fetch_workers=8, clean_workers=None,
+                        raw_folder=None, cleaned_folder=None, manifest_path=MANIFEST_PATH):
+    """
+    Fetch (if needed) and clean the historical price files.
+
+    Files are fetched concurrently on a bounded thread pool and each one is handed to a
+    process pool for cleaning as soon as it is on disk. Fetches and cleanings are collected
+    together as they finish, so a file is cleaned and saved while others still download.
+
+    Args:
+        incremental (bool): Skip raw files whose content hash matches the manifest (as long
+            as their cleaned file exists) and append only new rows instead of rebuilding
+            cleaned_data/: the rows added to the end of a raw file, or, for a rewritten
+            file, the rows from the ticker's watermark on that are not stored yet.
+        source: Where raw files come from: an object with a fetch(name, output_path) method
+            such as data_sources.LocalMirrorSource or HTTPSource (default: Google Drive).
+        datasets (list): Dataset names to load (default: the seven files below).
+        fetch_workers (int): Number of concurrent downloads.
+        clean_workers (int): Number of cleaning processes (default: one per CPU).
+        raw_folder (str): Where fetched raw files are kept (default: data/yfinance_data).
+        cleaned_folder (str): Where cleaned files are written (default:
+            cleaned_data/yfinance_data).
+        manifest_path (str): Path to the ingestion manifest.
+
+    Returns:
+        None
+    """
 
     file_ids = {
         "nvda_historical_data": "1gEiOJZS3kBPa9U9OFcdsnAtOd7wQaVYN",
@@ -20,92 +44,74 @@ def load_and_clean_data():
     }
 
     # Define local paths to save the data temporarily
-    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'yfinance_data'))
+    base_path = raw_folder or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'yfinance_data'))
     os.makedirs(base_path, exist_ok=True)  
-    
-    # Define file paths for each dataset
-    nvda_path = os.path.join(base_path, 'nvda_historical_data.csv')
-    meta_path = os.path.join(base_path, 'meta_historical_data.csv')
-    msft_path = os.path.join(base_path, 'msft_historical_data.csv')
-    tsla_path = os.path.join(base_path, 'tsla_historical_data.csv')
-    amzn_path = os.path.join(base_path, 'amzn_historical_data.csv')
-    goog_path = os.path.join(base_path, 'goog_historical_data.csv')
-    aapl_path = os.path.join(base_path, 'aapl_historical_data.csv')
-
-    # Loop over each file ID to download and load data
-    data_frames = {}  # Dictionary to hold all the loaded data frames
-
-    for file_name, file_id in file_ids.items():
-        # Define file path for each dataset
-        file_path = os.path.join(base_path, f'{file_name}.csv')
-        
-        # Download the file if it doesn't exist
-        if not os.path.exists(file_path):
-            print(f"Downloading {file_name}...")
-            download_from_gdrive(file_id, file_path)
-        
-        # Load the data (after confirming they are downloaded)
-        data = pd.read_csv(file_path)
-
-        # Convert the 'date' column to datetime format
-        data['Date'] = data['Date'].apply(lambda x: parser.parse(x, fuzzy=True, ignoretz=True))
-
-        # Adjust for Dividends and Stock Splits
-        if 'Dividends' in data.columns:
-            # Adjust stock prices based on the dividends
-            data['Adj Close'] = data['Close'] - data['Dividends']
-        
-        if 'Stock Splits' in data.columns:
-            # Adjust stock prices based on stock splits (example: for a 2-for-1 split, price halved)
-            data['Adj Close'] = data.apply(
-                lambda row: row['Close'] / row['Stock Splits'] if row['Stock Splits'] != 0 else row['Close'], 
-                axis=1
-            )
-
-        # Check and correct negative values for stock price columns (Open, High, Low, Close)
-        stock_columns = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Dividends', 'Stock Splits']
-        for col in stock_columns:
-            if col in data.columns:
-                print(f"Checking column: {col}")
-                # Loop through each value in the column
-                for idx, value in data[col].items(): 
-                    if value < 0:
-                        print(f"Original value in {col} at index {idx}: {value}")
-                        # Convert negative value to positive
-                        data.at[idx, col] = abs(value)
-        
-        # Store the dataframe in the dictionary
-        data_frames[file_name] = data
-    
-    # Load each dataset into individual variables for cleaning
-    meta_data = data_frames['meta_historical_data']
-    tsla_data = data_frames['tsla_historical_data']
-    nvda_data = data_frames['nvda_historical_data']
-    msft_data = data_frames['msft_historical_data']
-    amzn_data = data_frames['amzn_historical_data']
-    goog_data = data_frames['goog_historical_data']
-    aapl_data = data_frames['aapl_historical_data']
-
-    print(meta_data.head())
 
-    """
-    # Print the first few rows to verify successful load
-    print(meta_data.head())
+    if source is None:
+        source = GoogleDriveSource(file_ids)
+    if datasets is None:
+        datasets = list(file_ids)
 
-    # Check the data types of the columns
-    print(meta_data.dtypes)
-
-    # Check for missing data
-    print(meta_data.isnull().sum())
-    """
-
-    # Save each cleaned dataset to a new file
-    cleaned_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'yfinance_data'))
+    # Cleaned files are written next to the other cleaned datasets
+    cleaned_path = cleaned_folder or os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'yfinance_data'))
     os.makedirs(cleaned_path, exist_ok=True)
 
-    for file_name, data in data_frames.items():
-        cleaned_file_path = os.path.join(cleaned_path, f'{file_name}.csv')
-        data.to_csv(cleaned_file_path, index=False)  # Save without the index column
-        print(f"Saved cleaned data for {file_name}.") 
-
-load_and_clean_data()
+    # Fetch and clean every dataset, overlapping downloads with cleaning
+    file_paths = {}  # Local path of each raw file
+    source_hashes = {}  # Content hash of each raw file, recorded in the manifest
+    offsets = {}  # Byte offset of each raw file's first new row (0: whole file)
+    manifest = load_manifest(manifest_path)
+
+    with ThreadPoolExecutor(max_workers=fetch_workers) as fetch_pool, \
+            ProcessPoolExecutor(max_workers=clean_workers) as clean_pool:
+        # Every pending future maps to its stage ('fetch' or 'clean') and dataset name
+        pending = {
+            fetch_pool.submit(fetch_dataset, source, file_name, os.path.join(base_path, f'{file_name}.csv')):
+                ('fetch', file_name)
+            for file_name in datasets
+        }
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage, file_name = pending.pop(future)
+                cleaned_file_path = os.path.join(cleaned_path, f'{file_name}.csv')
+
+                if stage == 'fetch':
+                    file_paths[file_name], source_hashes[file_name] = future.result()
+
+                    # In incremental mode, skip files that haven't changed since the last run
+                    # and only read the rows appended to the others
+                    if incremental and is_unchanged(manifest, file_name, source_hashes[file_name], cleaned_file_path):
+                        print(f"{file_name} unchanged since the last run, skipping.")
+                        continue
+                    offsets[file_name] = raw_offset(manifest, file_name, file_paths[file_name],
+                                                    cleaned_file_path) if incremental else 0
+
+                    # Parse dates, adjust for dividends/splits and correct negative values in a worker process
+                    pending[clean_pool.submit(clean_price_file, file_paths[file_name], offsets[file_name])] = \
+                        ('clean', file_name)
+                    continue
+
+                data, corrections = future.result()
+                print_correction_summary(file_name, corrections)
+                if file_name == 'meta_historical_data':
+                    print(data.head())
+
+                # Save the cleaned dataset: CSV plus columnar copy; incremental runs append
+                # only the new rows
+                ticker = file_name.replace('_historical_data', '').upper()
+                rows_written = write_cleaned_rows(manifest, file_name, data, cleaned_file_path, source_hashes[file_name],
+                                                  date_column='Date', ticker=ticker, incremental=incremental,
+                                                  appended=offsets[file_name] > 0,
+                                                  source_size=os.path.getsize(file_paths[file_name]))
+                print(f"Saved cleaned data for {file_name} ({rows_written} rows written).")
+
+    save_manifest(manifest, manifest_path)
+
+if __name__ == '__main__':
+    # Guarded so worker processes can import this module without re-running the pipeline
+    arg_parser = argparse.ArgumentParser(description='Fetch and clean the historical price files.')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='Skip unchanged raw files and only append rows added since the last run.')
+    args = arg_parser.parse_args()
+    load_and_clean_data(incremental=args.incremental)
@@ -1,13 +1,101 @@
+import argparse
 import gdown
 import pandas as pd
-from dateutil import parser
 import os
+from date_parsing import parse_timestamps
+from manifest import (load_manifest, save_manifest, file_hash, is_unchanged, raw_offset, read_raw_csv,
+                      write_cleaned_rows)
+
+# Timestamp layout used for the cleaned news CSV, fixed so chunked and in-memory runs match
+NEWS_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Read text columns as strings so every chunk infers the same types as a full read
+RAW_TEXT_DTYPES = {'headline': str, 'url': str, 'publisher': str, 'date': str, 'stock': str}
 
 def download_from_gdrive(file_id, output_path):
     url = f"https://drive.google.com/uc?id={file_id}"
     gdown.download(url, output_path, quiet=False)
 
-def load_and_clean_data():
+def clean_ratings(data):
+    """
+    Clean a block of raw analyst-ratings rows: parse the timestamps and drop the
+    leftover index column.
+
+    Args:
+        data (pd.DataFrame): Raw rows (the whole file or one chunk of it).
+
+    Returns:
+        tuple: (cleaned DataFrame, number of rows that needed the dateutil fallback)
+    """
+    # Parse timestamps in bulk; only layouts the vectorized path doesn't know go through dateutil
+    data['date'], fallback_rows = parse_timestamps(data['date'])
+
+    # Drop the Unnamed column
+    data = data.drop(columns=['Unnamed: 0'])
+    return data, fallback_rows
+
+def clean_ratings_file(data_path, cleaned_data_path, manifest, chunk_size=None, incremental=False):
+    """
+    Clean a raw analyst-ratings file into cleaned_data_path and record it in the manifest.
+
+    Args:
+        data_path (str): Path to the raw analyst-ratings CSV file.
+        cleaned_data_path (str): Path of the cleaned CSV file; the Parquet copy sits next to it.
+        manifest (dict): The ingestion manifest, updated in place.
+        chunk_size (int): When set, stream the file in chunks of this many rows so peak
+            memory stays bounded; the output is the same as the in-memory path.
+        incremental (bool): Skip the feed if its content hash matches the manifest and the
+            cleaned file exists. Otherwise append only the new headlines: the rows added
+            to the end of the raw file, or, if it was rewritten, the rows from the
+            watermark on that are not stored yet.
+
+    Returns:
+        int: Number of cleaned rows written.
+    """
+    # Skip the feed entirely if it hasn't changed since the last run
+    source_hash = file_hash(data_path)
+    if incremental and is_unchanged(manifest, 'raw_analyst_ratings', source_hash, cleaned_data_path):
+        print("raw_analyst_ratings unchanged since the last run, skipping.")
+        return 0
+
+    # If the feed only had headlines appended since the last run, read just those
+    offset = raw_offset(manifest, 'raw_analyst_ratings', data_path, cleaned_data_path) if incremental else 0
+    fallback_rows = []
+
+    def cleaned_chunks():
+        # Clean one chunk at a time (or the whole file when chunk_size is None)
+        for chunk in read_raw_csv(data_path, offset, chunk_size, dtype=RAW_TEXT_DTYPES):
+            chunk, chunk_fallback_rows = clean_ratings(chunk)
+            fallback_rows.append(chunk_fallback_rows)
+            yield chunk
+
+    # Save the cleaned data to a new CSV file plus its columnar copy (or append the new rows)
+    rows_written = write_cleaned_rows(manifest, 'raw_analyst_ratings', cleaned_chunks(), cleaned_data_path,
+                                      source_hash, date_column='date', ticker_column='stock',
+                                      incremental=incremental, appended=offset > 0,
+                                      source_size=os.path.getsize(data_path), date_format=NEWS_DATE_FORMAT)
+    print(f"Parsed timestamps ({sum(fallback_rows)} rows needed the dateutil fallback)")
+    if offset:
+        print(f"Read the raw feed from byte {offset} on (rows appended since the last run).")
+    if chunk_size:
+        print(f"Saved {rows_written} cleaned rows in chunks of {chunk_size}.")
+    else:
+        print(f"Saved {rows_written} cleaned rows.")
+    return rows_written
+
+def load_and_clean_data(chunk_size=None, incremental=False):
+    """
+    Download (if needed) and clean the raw analyst-ratings feed.
+
+    Args:
+        chunk_size (int): When set, stream the file in chunks of this many rows so peak
+            memory stays bounded; the output is the same as the in-memory path.
+        incremental (bool): Only clean and append headlines that are new since the last
+            run (see clean_ratings_file).
+
+    Returns:
+        None
+    """
 
     file_ids = {
         "raw_analyst_ratings": "1AM3ksWQGfdOklFd1H9x8h25Zra-cmWMD"
@@ -25,34 +113,20 @@ def load_and_clean_data():
         print("Downloading data...")
         download_from_gdrive(file_ids["raw_analyst_ratings"], data_path)
     
-    # Load the data (after confirming they are downloaded)
-    data = pd.read_csv(data_path)
-
-    """ 
-    # Print the first few rows to verify successful load
-        print(data.head())
-    """
-
-    data['date'] = data['date'].apply(lambda x: parser.parse(x, fuzzy=True, ignoretz=True))
-
-    # Drop the Unnamed column
-    data = data.drop(columns=['Unnamed: 0'])
-
     # Define local paths to save the data temporarily
     cleaned_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'raw_analyst_ratings'))
     os.makedirs(cleaned_path, exist_ok=True)  
-
-    # Save the cleaned data to a new CSV file
     cleaned_data_path = os.path.join(cleaned_path, 'raw_analyst_ratings.csv')
-    data.to_csv(cleaned_data_path, index=False)  # Save without the index column
-    print(data.dtypes)
-
-    """
-    # Check the data types of the columns
-    print(data.dtypes)
 
-    # Check for missing data
-    print(data.isnull().sum())
-    """
+    manifest = load_manifest()
+    clean_ratings_file(data_path, cleaned_data_path, manifest, chunk_size=chunk_size, incremental=incremental)
+    save_manifest(manifest)
 
-load_and_clean_data()
+if __name__ == '__main__':
+    arg_parser = argparse.ArgumentParser(description='Download and clean the raw analyst-ratings feed.')
+    arg_parser.add_argument('--chunk-size', type=int, default=None,
+                            help='Stream the raw file in chunks of this many rows to bound memory.')
+    arg_parser.add_argument('--incremental', action='store_true',
+                            help='Only clean and append headlines added since the last run.')
+    args = arg_parser.parse_args()
+    load_and_clean_data(chunk_size=args.chunk_size, incremental=args.incremental)
@@ -0,0 +1,330 @@
+import os
+import json
+import hashlib
+import pandas as pd
+from data_store import ChunkedDataWriter, append_cleaned_data, load_cleaned_rows_at
+
+# Manifest of the cleaned datasets, kept next to them in cleaned_data/
+MANIFEST_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'manifest.json'))
+
+
+def file_hash(file_path, block_size=1 << 20, length=None):
+    """
+    Compute the SHA-256 of a file without reading it into memory at once.
+
+    Args:
+        file_path (str): Path to the file.
+        block_size (int): Number of bytes read per step.
+        length (int): Only hash the first `length` bytes (default: the whole file).
+
+    Returns:
+        str: Hex digest of the file contents.
+    """
+    digest = hashlib.sha256()
+    remaining = length
+    with open(file_path, 'rb') as f:
+        while remaining is None or remaining > 0:
+            block = f.read(block_size if remaining is None else min(block_size, remaining))
+            if not block:
+                break
+            digest.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_path=MANIFEST_PATH):
+    """
+    Load the ingestion manifest, or an empty one if no run has written it yet.
+
+    The manifest has one entry per dataset (e.g. 'aapl_historical_data' or
+    'raw_analyst_ratings') holding the hash and size of the raw file last processed, the
+    watermark (latest date already in cleaned_data/) and the dates each ticker got
+    new rows for in the last run.
+
+    Args:
+        manifest_path (str): Path to the manifest JSON file.
+
+    Returns:
+        dict: The manifest.
+    """
+    if not os.path.exists(manifest_path):
+        return {'datasets': {}}
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, manifest_path=MANIFEST_PATH):
+    """
+    Write the ingestion manifest.
+
+    Args:
+        manifest (dict): The manifest to save.
+        manifest_path (str): Path to the manifest JSON file.
+
+    Returns:
+        None
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(manifest_path)), exist_ok=True)
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+
+
+def is_unchanged(manifest, name, source_hash, csv_path):
+    """
+    Check whether a raw file is identical to the one processed in the previous run and its
+    cleaned output is still there. If so, its entry is marked as having no changes in this
+    run.
+
+    Args:
+        manifest (dict): The manifest.
+        name (str): Dataset name.
+        source_hash (str): Hash of the raw file as it is now.
+        csv_path (str): Path of the cleaned CSV file written from it.
+
+    Returns:
+        bool: True if the file can be skipped.
+    """
+    entry = manifest['datasets'].get(name)
+    if entry is None or entry.get('source_hash') != source_hash or not os.path.exists(csv_path):
+        return False
+    entry['changed'] = {}
+    return True
+
+
+def raw_offset(manifest, name, file_path, csv_path):
+    """
+    Find where the unprocessed rows of a raw file start.
+
+    A raw file whose first bytes are exactly the file processed in the previous run only
+    had rows appended, so only the bytes after it need to be read and cleaned. In any
+    other case (no previous run, the file was rewritten or shortened, the cleaned output
+    is gone) the whole file has to be read.
+
+    Args:
+        manifest (dict): The manifest.
+        name (str): Dataset name.
+        file_path (str): Path to the raw file.
+        csv_path (str): Path of the cleaned CSV file written from it.
+
+    Returns:
+        int: Byte offset of the first new row, or 0 to read the whole file.
+    """
+    entry = manifest['datasets'].get(name, {})
+    processed_size = entry.get('source_size')
+    if not processed_size or not os.path.exists(csv_path) or os.path.getsize(file_path) <= processed_size:
+        return 0
+    with open(file_path, 'rb') as f:
+        # The processed part must end with a complete row for the rest to start a new one
+        f.seek(processed_size - 1)
+        if f.read(1) != b'\n':
+            return 0
+    if file_hash(file_path, length=processed_size) != entry.get('source_hash'):
+        return 0
+    return processed_size
+
+
+def read_raw_csv(file_path, offset=0, chunk_size=None, **read_csv_args):
+    """
+    Read the rows of a raw CSV file that start at a byte offset.
+
+    Args:
+        file_path (str): Path to the raw CSV file.
+        offset (int): Byte offset from raw_offset; 0 reads the whole file. Rows read from
+            an offset get the column names of the file's header.
+        chunk_size (int): Yield chunks of this many rows instead of one DataFrame.
+        **read_csv_args: Further arguments for pd.read_csv, e.g. dtype.
+
+    Yields:
+        pd.DataFrame: The rows, in one frame or in chunks.
+    """
+    if offset == 0:
+        if chunk_size:
+            yield from pd.read_csv(file_path, chunksize=chunk_size, **read_csv_args)
+        else:
+            yield pd.read_csv(file_path, **read_csv_args)
+        return
+
+    columns = list(pd.read_csv(file_path, nrows=0).columns)
+    with open(file_path, 'rb') as f:
+        f.seek(offset)
+        if chunk_size:
+            yield from pd.read_csv(f, header=None, names=columns, chunksize=chunk_size, **read_csv_args)
+        else:
+            yield pd.read_csv(f, header=None, names=columns, **read_csv_args)
+
+
+def write_cleaned_rows(manifest, name, data, csv_path, source_hash, date_column, ticker=None,
+                       ticker_column=None, incremental=False, appended=False, source_size=None,
+                       date_format=None):
+    """
+    Write a cleaned dataset and record it in the manifest.
+
+    Without incremental mode, or when there is nothing to append to, the cleaned files are
+    rewritten. In incremental mode the rows are appended to the existing files instead:
+    all of them when they come from the appended tail of the raw file (see raw_offset),
+    otherwise only those dated at or after the dataset's watermark, minus rows identical
+    to ones already stored at the watermark.
+
+    Args:
+        manifest (dict): The manifest, updated in place.
+        name (str): Dataset name.
+        data (pd.DataFrame or iterable): Cleaned rows, in one DataFrame or as chunks.
+        csv_path (str): Path of the cleaned CSV file.
+        source_hash (str): Hash of the raw file the data came from.
+        date_column (str): Column holding the row dates.
+        ticker (str): Ticker all rows belong to (price files).
+        ticker_column (str): Column holding each row's ticker (news feed).
+        incremental (bool): Append new rows instead of rewriting the files.
+        appended (bool): The rows are only the tail of the raw file appended since the
+            previous run.
+        source_size (int): Size in bytes of the raw file the data came from.
+        date_format (str): strftime format for datetime columns in the CSV.
+
+    Returns:
+        int: Number of rows written.
+    """
+    chunks = [data] if isinstance(data, pd.DataFrame) else data
+    watermark = manifest['datasets'].get(name, {}).get('watermark')
+    watermark = pd.Timestamp(watermark) if watermark is not None else None
+    if not incremental or not os.path.exists(csv_path) or (watermark is None and not appended):
+        written = _rewrite_rows(chunks, csv_path, date_format)
+    else:
+        written = _append_rows(chunks, csv_path, date_column, None if appended else watermark, date_format)
+
+    rows_written = 0
+    latest = watermark
+    changed = {}
+    for chunk in written:
+        rows_written += len(chunk)
+        if len(chunk):
+            chunk_latest = chunk[date_column].max()
+            latest = chunk_latest if latest is None else max(latest, chunk_latest)
+        merge_changed_dates(changed, changed_dates(chunk, date_column, ticker=ticker, ticker_column=ticker_column))
+
+    record_dataset(manifest, name, source_hash, latest, changed, source_size=source_size)
+    return rows_written
+
+
+def _rewrite_rows(chunks, csv_path, date_format):
+    """
+    Replace a cleaned dataset with the given chunks, yielding each chunk once written.
+    """
+    with ChunkedDataWriter(csv_path, date_format=date_format) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+            yield chunk
+
+
+def _append_rows(chunks, csv_path, date_column, watermark, date_format):
+    """
+    Append the given chunks to a cleaned dataset, yielding the rows written from each.
+
+    With a watermark, rows dated before it are dropped, and so are rows at it that are
+    identical to a row already stored at it.
+    """
+    stored_keys = None
+    for chunk in chunks:
+        if watermark is not None:
+            chunk = chunk[chunk[date_column] >= watermark]
+            at_watermark = (chunk[date_column] == watermark).to_numpy()
+            if at_watermark.any():
+                if stored_keys is None:
+                    stored_keys = _row_keys(load_cleaned_rows_at(csv_path, date_column, watermark), chunk.columns)
+                chunk = chunk[~(at_watermark & _row_keys(chunk, chunk.columns).isin(stored_keys).to_numpy())]
+        if chunk.empty:
+            continue
+        append_cleaned_data(chunk, csv_path, date_format=date_format)
+        yield chunk
+
+
+def _row_keys(rows, columns):
+    """
+    Hash every row over the given columns, for matching rows between the stored data and
+    new data whatever their dtypes (e.g. categorical vs plain strings).
+    """
+    return pd.util.hash_pandas_object(rows[list(columns)].astype(str), index=False)
+
+
+def changed_dates(rows, date_column, ticker=None, ticker_column=None):
+    """
+    List the days each ticker has rows for.
+
+    Args:
+        rows (pd.DataFrame): Newly written rows.
+        date_column (str): Column holding the row dates.
+        ticker (str): Ticker all rows belong to (price files).
+        ticker_column (str): Column holding each row's ticker (news feed).
+
+    Returns:
+        dict: Ticker -> sorted list of 'YYYY-MM-DD' dates.
+    """
+    if rows.empty:
+        return {}
+    days = rows[date_column].dt.strftime('%Y-%m-%d')
+    if ticker_column is None:
+        return {ticker: sorted(days.unique())}
+    grouped = days.groupby(rows[ticker_column].astype(str)).unique()
+    return {key: sorted(values) for key, values in grouped.items()}
+
+
+def merge_changed_dates(changed, more):
+    """
+    Merge the output of changed_dates for another block of rows into `changed`, in place.
+
+    Args:
+        changed (dict): Ticker -> sorted list of dates, updated in place.
+        more (dict): Ticker -> sorted list of dates to add.
+
+    Returns:
+        None
+    """
+    for key, days in more.items():
+        changed[key] = sorted(set(changed.get(key, [])).union(days))
+
+
+def record_dataset(manifest, name, source_hash, watermark, changed, source_size=None):
+    """
+    Store a dataset's entry in the manifest.
+
+    Args:
+        manifest (dict): The manifest, updated in place.
+        name (str): Dataset name.
+        source_hash (str): Hash of the raw file that was processed.
+        watermark (pd.Timestamp): Latest date now present in the cleaned data (None if empty).
+        changed (dict): Ticker -> dates that got new rows in this run.
+        source_size (int): Size in bytes of the raw file that was processed, for raw_offset.
+
+    Returns:
+        None
+    """
+    manifest['datasets'][name] = {
+        'source_hash': source_hash,
+        'source_size': source_size,
+        'watermark': watermark.isoformat() if watermark is not None else None,
+        'changed': changed,
+    }
+
+
+def changed_tickers(manifest=None, datasets=None):
+    """
+    Report which tickers and dates got new cleaned rows in the last run, so downstream
+    stages can limit themselves to those.
+
+    Args:
+        manifest (dict): The manifest (default: loaded from MANIFEST_PATH).
+        datasets (list): Only consider these dataset names (default: all).
+
+    Returns:
+        dict: Ticker -> sorted list of 'YYYY-MM-DD' dates with new rows.
+    """
+    if manifest is None:
+        manifest = load_manifest()
+
+    changes = {}
+    for name, entry in manifest['datasets'].items():
+        if datasets is not None and name not in datasets:
+            continue
+        for ticker, days in entry.get('changed', {}).items():
+            changes.setdefault(ticker, set()).update(days)
+    return {ticker: sorted(days) for ticker, days in sorted(changes.items())}
@@ -0,0 +1,203 @@
+import numpy as np
+import pandas as pd
+from trading_calendar import DEFAULT_CUTOFF_HOUR, session_calendar, next_sessions
+
+
+def _date_values(dates):
+    """Return dates as a datetime64[ns] array, whatever unit the column was stored in."""
+    return np.asarray(dates, dtype='datetime64[ns]')
+
+
+def match_dates(left_dates, right_dates):
+    """
+    Find every pair of equal dates between two date arrays with sorted-array searches
+    instead of a hash join.
+
+    Args:
+        left_dates (np.ndarray): Dates of the left rows (any order, NaT never matches).
+        right_dates (np.ndarray): Dates of the right rows (any order, NaT never matches).
+
+    Returns:
+        tuple: (left row positions, right row positions) of the matching pairs, in left row
+        order and, within a left row, in right row order.
+    """
+    left_dates = _date_values(left_dates)
+    right_dates = _date_values(right_dates)
+    order = np.argsort(right_dates, kind='stable')
+    sorted_dates = right_dates[order]
+
+    first = np.searchsorted(sorted_dates, left_dates, side='left')
+    counts = np.searchsorted(sorted_dates, left_dates, side='right') - first
+    counts[np.isnat(left_dates)] = 0
+
+    left_rows = np.repeat(np.arange(len(left_dates)), counts)
+    # Position of each pair within its left row's run of equal right dates
+    within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    right_rows = order[np.repeat(first, counts) + within]
+    return left_rows, right_rows
+
+
+def merge_on_dates(left, right, left_on, right_on):
+    """
+    Inner-join two frames on a date column each, like pd.merge(left, right, left_on=left_on,
+    right_on=right_on, how='inner'), using match_dates.
+
+    Args:
+        left (pd.DataFrame): Left frame, e.g. one ticker's news.
+        right (pd.DataFrame): Right frame, e.g. one ticker's price data.
+        left_on (str): Date column of the left frame.
+        right_on (str): Date column of the right frame.
+
+    Returns:
+        pd.DataFrame: Columns of both frames (right columns whose name is already on the
+        left are left out), one row per matching pair.
+    """
+    left_rows, right_rows = match_dates(left[left_on].to_numpy(), right[right_on].to_numpy())
+    return _join_rows(left, right, left_rows, right_rows)
+
+
+def _join_rows(left, right, left_rows, right_rows):
+    """
+    Put the given rows of two frames side by side; right columns whose name is already on
+    the left are left out.
+    """
+    right = right[right.columns.difference(left.columns, sort=False)]
+    return pd.concat([left.iloc[left_rows].reset_index(drop=True), right.iloc[right_rows].reset_index(drop=True)],
+                     axis=1)
+
+
+class NewsIndex:
+    """
+    News data grouped by ticker once, so per-ticker work doesn't scan the whole frame.
+
+    The rows are sorted by (ticker, date) a single time and each ticker's rows are found
+    through an offset range, so slicing a ticker is a zero-copy view instead of a boolean
+    filter over every row. Rows without a ticker are left out.
+    """
+
+    def __init__(self, news_df, ticker_column='stock', date_column='date'):
+        """
+        Args:
+            news_df (pd.DataFrame): News data with a ticker and a date column.
+            ticker_column (str): Column holding the ticker.
+            date_column (str): Column holding the headline timestamp.
+        """
+        self.ticker_column = ticker_column
+        self.date_column = date_column
+
+        codes, tickers = pd.factorize(news_df[ticker_column].astype(str).where(news_df[ticker_column].notna()), sort=True)
+        dates = _date_values(news_df[date_column].to_numpy())
+        keep = np.flatnonzero(codes >= 0)
+        # NaT sorts after every date, so dateless rows come last within their ticker
+        order = keep[np.lexsort((dates[keep], codes[keep]))]
+
+        self.frame = news_df.iloc[order].reset_index(drop=True)
+        self.dates = dates[order]
+        bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[order], minlength=len(tickers)))])
+        self.offsets = {ticker: (int(bounds[i]), int(bounds[i + 1])) for i, ticker in enumerate(tickers)}
+
+    def __contains__(self, ticker):
+        return ticker in self.offsets
+
+    def __len__(self):
+        return len(self.frame)
+
+    @property
+    def tickers(self):
+        """Tickers with at least one headline, in sorted order."""
+        return list(self.offsets)
+
+    def get(self, ticker):
+        """
+        Get one ticker's news, sorted by timestamp.
+
+        Args:
+            ticker (str): Ticker symbol, e.g. 'AAPL'.
+
+        Returns:
+            pd.DataFrame: View of the ticker's rows (empty if the ticker has no news).
+        """
+        start, stop = self.offsets.get(ticker, (0, 0))
+        return self.frame.iloc[start:stop]
+
+    def ticker_dates(self, ticker):
+        """
+        Get the sorted timestamps of one ticker's news as a datetime64[ns] array view.
+        """
+        start, stop = self.offsets.get(ticker, (0, 0))
+        return self.dates[start:stop]
+
+    def sessions(self, ticker, price_dates, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+        """
+        Map one ticker's headlines to their effective trading sessions.
+
+        Args:
+            ticker (str): Ticker symbol.
+            price_dates: Dates of the ticker's price rows, its trading calendar.
+            cutoff_hour (float): Hour of the day from which headlines count for the next session.
+
+        Returns:
+            np.ndarray: Session date (datetime64[ns]) of each of the ticker's headlines, in
+            index order; NaT where the headline has no timestamp or comes after the last
+            session.
+        """
+        calendar = session_calendar(price_dates)
+        positions = next_sessions(self.ticker_dates(ticker), calendar, cutoff_hour)
+        # Position -1 picks the NaT appended after the last session
+        return np.append(calendar, np.datetime64('NaT', 'ns'))[positions]
+
+    def align(self, ticker, price_df, price_date_column='Date', cutoff_hour=DEFAULT_CUTOFF_HOUR):
+        """
+        Join one ticker's news to the price rows of their effective trading sessions.
+
+        Headlines published at or after the cutoff hour, or on a day without trading, are
+        matched to the next session in the price data, so only headlines after the last
+        price row are left out.
+
+        Args:
+            ticker (str): Ticker symbol.
+            price_df (pd.DataFrame): The ticker's price data with normalized dates.
+            price_date_column (str): Date column of the price data.
+            cutoff_hour (float): Hour of the day from which headlines count for the next session.
+
+        Returns:
+            pd.DataFrame: The ticker's news with the matching price columns added;
+            `price_date_column` holds each headline's session.
+        """
+        news = self.get(ticker)
+        sessions = self.sessions(ticker, price_df[price_date_column], cutoff_hour)
+        news_rows, price_rows = match_dates(sessions, price_df[price_date_column].to_numpy())
+        return _join_rows(news, price_df, news_rows, price_rows)
+
+    def session_mean(self, ticker, column, price_dates, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+        """
+        Average a column of one ticker's news per effective trading session, the
+        session-aligned version of news.groupby('date')[column].mean().reset_index().
+
+        Args:
+            ticker (str): Ticker symbol.
+            column (str): Numeric column to average, e.g. 'sentiment_score'.
+            price_dates: Dates of the ticker's price rows, its trading calendar.
+            cutoff_hour (float): Hour of the day from which headlines count for the next session.
+
+        Returns:
+            pd.DataFrame: One row per session with news: the session date (in the index's
+            date column) and the mean of `column`.
+        """
+        start, stop = self.offsets.get(ticker, (0, 0))
+        sessions = self.sessions(ticker, price_dates, cutoff_hour)
+        values = self.frame[column].iloc[start:stop].to_numpy(dtype=float)
+        matched = ~np.isnat(sessions)
+        sessions, values = sessions[matched], values[matched]
+
+        if not len(sessions):
+            return pd.DataFrame({self.date_column: sessions, column: values})
+
+        # The news is sorted by timestamp, so each session is one run of rows
+        firsts = np.flatnonzero(np.concatenate([[True], sessions[1:] != sessions[:-1]]))
+        present = ~np.isnan(values)
+        sums = np.add.reduceat(np.where(present, values, 0.0), firsts)
+        counts = np.add.reduceat(present.astype(int), firsts)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = sums / counts
+        return pd.DataFrame({self.date_column: sessions[firsts], column: means})
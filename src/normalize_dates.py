@@ -1,6 +1,7 @@
 import os
-import pandas as pd
 import matplotlib.pyplot as plt
+from data_store import load_cleaned_data, load_news_data
+from news_index import NewsIndex
 
 def normalize_dates(news_file, input_folder_stock, output_folder):
     """
@@ -18,8 +19,11 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
     os.makedirs(output_folder, exist_ok=True)
     
     # Load the news data
-    news_df = pd.read_csv(news_file, parse_dates=['date'])
-    news_df['date'] = news_df['date'].dt.normalize()  # Normalize dates to yyyy-mm-dd
+    news_df = load_news_data(news_file, columns=['date', 'stock'])
+
+    # Group the news by ticker once; each stock below takes its slice from the index. The
+    # full timestamps are kept so headlines can be matched to their trading session.
+    news_index = NewsIndex(news_df)
 
     # List all stock files
     stock_files = [f for f in os.listdir(input_folder_stock) if f.endswith('.csv')]
@@ -29,18 +33,16 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
         stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
         
         # Load each stock dataset
-        stock_df = pd.read_csv(os.path.join(input_folder_stock, stock_file), parse_dates=['Date'])
+        stock_df = load_cleaned_data(os.path.join(input_folder_stock, stock_file), columns=['Date'])
         stock_df['Date'] = stock_df['Date'].dt.normalize()
 
-        # Filter the news data for the corresponding stock symbol
-        stock_news_df = news_df[news_df['stock'] == stock_symbol]
-        
-        if stock_news_df.empty:
+        # Look up the news data for the corresponding stock symbol
+        if stock_symbol not in news_index:
             print(f"Warning: No news data found for stock {stock_symbol}. Skipping...")
             continue
         
-        # Merge datasets on the date
-        aligned_df = pd.merge(stock_news_df, stock_df, left_on='date', right_on='Date', how='inner')
+        # Align the ticker's news with the price data of its next tradable session
+        aligned_df = news_index.align(stock_symbol, stock_df)
         
         # Save results into output subfolder
         stock_output_folder = os.path.join(output_folder, stock_symbol)
@@ -48,11 +50,11 @@ def normalize_dates(news_file, input_folder_stock, output_folder):
         
         # Visualization: Group data by quarter for NVDA, else group by month
         if stock_symbol == 'NVDA':
-            aligned_df['period'] = aligned_df['date'].dt.to_period('Q')  # Group by quarter
+            aligned_df['period'] = aligned_df['Date'].dt.to_period('Q')  # Group by quarter
             grouped_counts = aligned_df['period'].value_counts().sort_index()
             x_label = "Quarter"
         else:
-            aligned_df['period'] = aligned_df['date'].dt.to_period('M')  # Group by month
+            aligned_df['period'] = aligned_df['Date'].dt.to_period('M')  # Group by month
             grouped_counts = aligned_df['period'].value_counts().sort_index()
             x_label = "Month"
 
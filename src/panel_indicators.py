@@ -0,0 +1,350 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy.signal import lfilter
+from data_store import load_cleaned_data
+from indicator_stream import DEFAULT_INDICATORS
+
+# Price fields loaded into the panel
+PANEL_FIELDS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+
+def load_price_panel(input_folder_stock, fields=PANEL_FIELDS):
+    """
+    Load every stock file into aligned (date x ticker) price matrices.
+
+    Args:
+        input_folder_stock (str): Path to the folder containing stock CSV files.
+        fields (list): Price columns to load.
+
+    Returns:
+        dict: Field name -> pd.DataFrame indexed by date with one column per ticker
+        (e.g. aapl_historical_data.csv -> AAPL), NaN where a ticker has no bar.
+    """
+    prices = {}
+    for stock_file in sorted(f for f in os.listdir(input_folder_stock) if f.endswith('.csv')):
+        stock_symbol = os.path.splitext(stock_file)[0].replace('_historical_data', '').upper()
+        stock_df = load_cleaned_data(os.path.join(input_folder_stock, stock_file), columns=['Date'] + fields)
+        prices[stock_symbol] = stock_df.drop_duplicates('Date', keep='last').set_index('Date')
+
+    panel = {}
+    for field in fields:
+        matrix = pd.DataFrame({symbol: df[field] for symbol, df in prices.items() if field in df.columns}).sort_index()
+        matrix.index.name = 'date'
+        matrix.columns.name = 'stock'
+        panel[field] = matrix
+    return panel
+
+
+def _compact(arrays):
+    """
+    Move each ticker's complete rows to the top of its column, keeping their order, so
+    every column starts at row 0 and has no gaps. Indicators computed on the compacted
+    arrays then have the same warm-up as TA-Lib run on each ticker's own series.
+
+    Args:
+        arrays (list): (date x ticker) float arrays of equal shape.
+
+    Returns:
+        tuple: (compacted arrays, flat source position of every compacted cell for
+        _expand, number of complete rows per column). The positions are None if no column
+        has a gap, in which case nothing is moved.
+    """
+    valid = np.logical_and.reduce([np.isfinite(values) for values in arrays])
+    lengths = valid.sum(axis=0)
+    if valid.all():
+        return arrays, None, lengths
+    rows, columns = valid.shape
+    order = np.argsort(~valid, axis=0, kind='stable')
+    positions = (order * columns + np.arange(columns)).ravel()
+    beyond = np.arange(rows)[:, np.newaxis] >= lengths
+    compacted = []
+    for values in arrays:
+        values = values.ravel()[positions].reshape(rows, columns)
+        values[beyond] = np.nan
+        compacted.append(values)
+    return compacted, positions, lengths
+
+
+def _expand(values, positions, lengths):
+    """Put compacted results back on the rows they came from (NaN on incomplete rows)."""
+    if positions is None:
+        return values
+    values = np.where(np.arange(values.shape[0])[:, np.newaxis] >= lengths, np.nan, values)
+    expanded = np.empty(values.size)
+    expanded[positions] = values.ravel()
+    return expanded.reshape(values.shape)
+
+
+def _window_sums(values, period, start=0):
+    """
+    Sum `period` consecutive rows of every column; a result row holds the window ending
+    there. Rows before start + period - 1 are NaN.
+
+    The sums come from one cumulative sum of the values minus the column's first value,
+    which keeps the rounding error at the scale of the price changes instead of the prices.
+    """
+    sums = np.empty(values.shape)
+    first = start + period - 1
+    sums[:first] = np.nan
+    if first >= len(values):
+        return sums
+    anchor = values[start]
+    totals = np.subtract(values[start:], anchor)
+    np.cumsum(totals, axis=0, out=totals)
+    sums[first] = totals[period - 1]
+    np.subtract(totals[period:], totals[:-period], out=sums[first + 1:])
+    sums[first:] += period * anchor
+    return sums
+
+
+def _window_extremes(values, period, function):
+    """
+    Highest (np.maximum) or lowest (np.minimum) value of every window of `period` rows,
+    one result row per complete window.
+
+    Uses the van Herk/Gil-Werman scheme: running extremes forward and backward within
+    blocks of `period` rows give every window's extreme from two lookups, so the cost
+    doesn't grow with the window length.
+    """
+    rows, columns = values.shape
+    blocks = -(-rows // period)
+    padded = np.empty((blocks * period, columns))
+    padded[:rows] = values
+    padded[rows:] = values[-1]
+    padded = padded.reshape(blocks, period, columns)
+    forward = function.accumulate(padded, axis=1).reshape(-1, columns)
+    backward = function.accumulate(padded[:, ::-1], axis=1)[:, ::-1].reshape(-1, columns)
+    # A window [i, i + period - 1] spans the end of i's block and the start of the next one
+    return function(backward[:rows - period + 1], forward[period - 1:rows])
+
+
+def _smooth(values, seed, decay):
+    """
+    Run the recursion y[t] = decay * y[t - 1] + (1 - decay) * values[t] down every column,
+    starting from y = seed, as a first-order linear filter in compiled code.
+    """
+    smoothed, _ = lfilter([1.0 - decay], [1.0, -decay], values, axis=0, zi=decay * seed[np.newaxis])
+    return smoothed
+
+
+def _sma(values, period, start=0):
+    """Simple moving average of compacted columns whose data starts at row `start`."""
+    return _window_sums(values, period, start) / period
+
+
+def _ema(values, period, start=0, seed_period=None):
+    """
+    Exponential moving average of compacted columns, seeded (as TA-Lib does) with the
+    simple average of the first `seed_period` rows from `start`.
+    """
+    seed_period = seed_period or period
+    result = np.full(values.shape, np.nan)
+    first = start + seed_period - 1
+    if first >= len(values):
+        return result
+    k = 2.0 / (period + 1)
+    result[first] = values[start:first + 1].sum(axis=0) / seed_period
+    result[first + 1:] = _smooth(values[first + 1:], result[first], 1.0 - k)
+    return result
+
+
+def _wilder_rsi(close, period):
+    """RSI of compacted columns with Wilder smoothing of the average gain and loss."""
+    if period >= len(close):
+        return np.full(close.shape, np.nan)
+    changes = np.diff(close, axis=0)
+    gains = np.maximum(changes, 0.0)
+    losses = gains - changes
+    average_gain = np.full(close.shape, np.nan)
+    average_loss = np.full(close.shape, np.nan)
+    average_gain[period] = gains[:period].sum(axis=0) / period
+    average_loss[period] = losses[:period].sum(axis=0) / period
+    average_gain[period + 1:] = _smooth(gains[period:], average_gain[period], (period - 1) / period)
+    average_loss[period + 1:] = _smooth(losses[period:], average_loss[period], (period - 1) / period)
+    # TA-Lib reports 0 only for an exactly zero total, however small the averages get
+    # after a flat stretch. A missing close makes its change, and so the averages, NaN
+    total = average_gain + average_loss
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = np.divide(average_gain, total, out=average_gain)
+    result *= 100.0
+    result[total == 0.0] = 0.0
+    return result
+
+
+def _sma_indicator(close, timeperiod=30):
+    return (_sma(close, timeperiod),)
+
+
+def _ema_indicator(close, timeperiod=30):
+    return (_ema(close, timeperiod),)
+
+
+def _rsi_indicator(close, timeperiod=14):
+    return (_wilder_rsi(close, timeperiod),)
+
+
+def _macd_indicator(close, fastperiod=12, slowperiod=26, signalperiod=9):
+    if slowperiod < fastperiod:
+        fastperiod, slowperiod = slowperiod, fastperiod
+    slow = _ema(close, slowperiod)
+    # TA-Lib starts the fast EMA at the slow EMA's first row
+    fast = _ema(close, fastperiod, start=slowperiod - fastperiod)
+    macd = fast - slow
+    signal = _ema(macd, signalperiod, start=slowperiod - 1)
+    macd[:slowperiod + signalperiod - 2] = np.nan
+    return macd, signal, macd - signal
+
+
+def _bbands_indicator(close, timeperiod=5, nbdevup=2, nbdevdn=2, matype=0):
+    if matype != 0:
+        raise ValueError("Panel Bollinger bands only support a simple moving average (matype=0).")
+    # Population variance from the window means of the values and their squares, both
+    # centered on the first value to keep the cancellation error small
+    centered = close - close[0]
+    mean = _window_sums(centered, timeperiod) / timeperiod
+    middle = mean + close[0]
+    variance = _window_sums(centered * centered, timeperiod) / timeperiod - mean * mean
+    # Only a variance rounded to zero or below is clamped, as in TA-Lib, and windows whose
+    # values are all equal get exactly zero width rather than rounding noise
+    flat = variance <= 0.0
+    if timeperiod > 1:
+        changes = np.zeros(close.shape)
+        changes[1:] = close[1:] != close[:-1]
+        flat |= _window_sums(changes, timeperiod - 1) == 0.0
+    with np.errstate(invalid='ignore'):
+        std = np.sqrt(variance)
+    std[flat] = 0.0
+    return middle + std * nbdevup, middle, middle - std * nbdevdn
+
+
+def _atr_indicator(high, low, close, timeperiod=14):
+    result = np.full(close.shape, np.nan)
+    if timeperiod >= len(close):
+        return (result,)
+    previous_close = close[:-1]
+    true_range = np.maximum.reduce([high[1:] - low[1:], np.abs(previous_close - high[1:]), np.abs(previous_close - low[1:])])
+    result[timeperiod] = true_range[:timeperiod].sum(axis=0) / timeperiod
+    result[timeperiod + 1:] = _smooth(true_range[timeperiod:], result[timeperiod], (timeperiod - 1) / timeperiod)
+    return (result,)
+
+
+def _stoch_indicator(high, low, close, fastk_period=5, slowk_period=3, slowk_matype=0, slowd_period=3, slowd_matype=0):
+    if slowk_matype != 0 or slowd_matype != 0:
+        raise ValueError("Panel stochastics only support simple moving averages (matype=0).")
+    fast_k = np.full(close.shape, np.nan)
+    if fastk_period <= len(close):
+        highest = _window_extremes(high, fastk_period, np.maximum)
+        lowest = _window_extremes(low, fastk_period, np.minimum)
+        difference = (highest - lowest) / 100.0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            fast_k[fastk_period - 1:] = np.where(difference != 0.0, (close[fastk_period - 1:] - lowest) / difference, 0.0)
+        fast_k[np.isnan(close)] = np.nan
+    slow_k = _sma(fast_k, slowk_period, start=fastk_period - 1)
+    slow_d = _sma(slow_k, slowd_period, start=fastk_period + slowk_period - 2)
+    slow_k[:fastk_period + slowk_period + slowd_period - 3] = np.nan
+    return slow_k, slow_d
+
+
+# Panel indicators by TA-Lib name -> (function, price fields it takes)
+PANEL_INDICATORS = {
+    'SMA': (_sma_indicator, ['Close']),
+    'EMA': (_ema_indicator, ['Close']),
+    'RSI': (_rsi_indicator, ['Close']),
+    'MACD': (_macd_indicator, ['Close']),
+    'BBANDS': (_bbands_indicator, ['Close']),
+    'ATR': (_atr_indicator, ['High', 'Low', 'Close']),
+    'STOCH': (_stoch_indicator, ['High', 'Low', 'Close']),
+}
+
+
+def matrix_indicator(indicator, *arrays, **params):
+    """
+    Compute one indicator on (date x ticker) NumPy arrays, each column as its own series.
+
+    Args:
+        indicator (str): Indicator name, one of PANEL_INDICATORS.
+        *arrays: Price arrays of equal shape, in the order of PANEL_INDICATORS[indicator][1].
+        **params: Keyword arguments as for the TA-Lib function, e.g. timeperiod=20.
+
+    Returns:
+        tuple: One array of the input shape per output, in TA-Lib's output order.
+    """
+    if indicator not in PANEL_INDICATORS:
+        raise ValueError(f"Unknown indicator '{indicator}'.")
+    compacted, positions, lengths = _compact([np.asarray(values, dtype=float) for values in arrays])
+    with np.errstate(invalid='ignore'):
+        outputs = PANEL_INDICATORS[indicator][0](*compacted, **params)
+    return tuple(_expand(values, positions, lengths) for values in outputs)
+
+
+def _panel_outputs(panel, indicator, params, compacted):
+    """
+    Compute one indicator for a price panel, reusing compacted input fields.
+
+    Args:
+        panel (dict): Field name -> (date x ticker) DataFrame, from load_price_panel.
+        indicator (str): Indicator name, one of PANEL_INDICATORS.
+        params (dict): Keyword arguments as for the TA-Lib function.
+        compacted (dict): Field tuple -> result of _compact, filled on first use.
+
+    Returns:
+        tuple: One (date x ticker) DataFrame per output, in TA-Lib's output order.
+    """
+    if indicator not in PANEL_INDICATORS:
+        raise ValueError(f"Unknown indicator '{indicator}'.")
+    function, fields = PANEL_INDICATORS[indicator]
+    index, columns = panel[fields[0]].index, panel[fields[0]].columns
+    if tuple(fields) not in compacted:
+        compacted[tuple(fields)] = _compact([panel[field].reindex(index=index, columns=columns).to_numpy(dtype=float) for field in fields])
+    arrays, positions, lengths = compacted[tuple(fields)]
+    with np.errstate(invalid='ignore'):
+        outputs = function(*arrays, **params)
+    return tuple(pd.DataFrame(_expand(values, positions, lengths), index=index, columns=columns) for values in outputs)
+
+
+def panel_indicator(panel, indicator, **params):
+    """
+    Compute one indicator for every ticker of a price panel in one vectorized call.
+
+    Each ticker is treated as its own series: its warm-up starts at its first complete
+    bar, and days it has no bar for are skipped, as if TA-Lib were run on its price file.
+
+    Args:
+        panel (dict): Field name -> (date x ticker) DataFrame, from load_price_panel.
+        indicator (str): Indicator name, one of PANEL_INDICATORS.
+        **params: Keyword arguments as for the TA-Lib function, e.g. timeperiod=20.
+
+    Returns:
+        tuple: One (date x ticker) DataFrame per output, in TA-Lib's output order.
+    """
+    return _panel_outputs(panel, indicator, params, {})
+
+
+def panel_indicators(panel, indicators=DEFAULT_INDICATORS):
+    """
+    Compute a set of indicators for every ticker of a price panel.
+
+    Args:
+        panel (dict): Field name -> (date x ticker) DataFrame, from load_price_panel.
+        indicators (list): (output columns, indicator, parameters) per indicator.
+
+    Returns:
+        pd.DataFrame: Indicator values indexed by date, with (indicator, stock) column
+        levels, e.g. result['RSI_14']['AAPL'].
+    """
+    results = {}
+    # Indicators on the same price fields share one compaction of the panel
+    compacted = {}
+    for columns, indicator, params in indicators:
+        results.update(zip(columns, _panel_outputs(panel, indicator, params, compacted)))
+    return pd.concat(results, axis=1, names=['indicator', 'stock'])
+
+
+if __name__ == '__main__':
+    # Compute the default indicators of all tickers at once
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    indicators = panel_indicators(load_price_panel(input_folder))
+    print(f"Computed {indicators.columns.get_level_values('indicator').nunique()} indicator series for "
+          f"{indicators.columns.get_level_values('stock').nunique()} tickers over {len(indicators)} dates")
+    print(indicators.iloc[-1].unstack('stock').to_string())
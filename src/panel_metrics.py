@@ -0,0 +1,175 @@
+import os
+import numpy as np
+import pandas as pd
+from panel_indicators import load_price_panel
+
+# Trading days per year used to annualize daily returns
+TRADING_DAYS = 252
+
+# Columns of the metrics table, one row per ticker
+FINANCIAL_METRICS = [
+    'Annualized Return',
+    'Annualized Volatility',
+    'Sharpe Ratio',
+    'Sortino Ratio',
+    'Max Drawdown',
+    'Max Drawdown Duration',
+    'Calmar Ratio',
+    'Skewness',
+    'Kurtosis',
+    'Hit Rate',
+]
+
+
+def load_returns_panel(input_folder_stock):
+    """
+    Load the daily returns of every stock file as one (date x ticker) matrix.
+
+    Args:
+        input_folder_stock (str): Path to the folder containing stock CSV files.
+
+    Returns:
+        pd.DataFrame: Close-to-close returns indexed by date with one column per ticker,
+        each from the ticker's previous bar, NaN before its second bar and on dates it
+        has no bar.
+    """
+    close = load_price_panel(input_folder_stock, fields=['Close'])['Close']
+    return close.ffill().pct_change(fill_method=None).where(close.notna())
+
+
+def _drawdowns(log_returns):
+    """
+    Compute the deepest and the longest drawdown of every column.
+
+    Wealth compounds the returns from a start value of 1, so a loss on the first return
+    already counts as a drawdown. Missing returns leave the wealth unchanged. The loop
+    runs over the dates with every ticker updated at once, which is faster than
+    accumulating along the date axis.
+
+    Args:
+        log_returns (np.ndarray): (date x ticker) log(1 + return), 0 where missing.
+
+    Returns:
+        tuple: (max drawdown as a negative fraction, longest time below a previous peak in
+        rows, total log growth) per column.
+    """
+    tickers = log_returns.shape[1]
+    log_wealth, peak, deepest, gap = np.zeros(tickers), np.zeros(tickers), np.zeros(tickers), np.empty(tickers)
+    last_peak, longest = np.full(tickers, -1), np.zeros(tickers, dtype=int)
+    for row, values in enumerate(log_returns):
+        log_wealth += values
+        np.maximum(peak, log_wealth, out=peak)
+        np.subtract(log_wealth, peak, out=gap)
+        np.minimum(deepest, gap, out=deepest)
+        np.copyto(last_peak, row, where=gap >= 0)
+        np.maximum(longest, row - last_peak, out=longest)
+    return np.expm1(deepest), longest, log_wealth
+
+
+def _metrics(returns, risk_free_rate, trading_days):
+    """
+    Compute FINANCIAL_METRICS for every column of a returns matrix.
+
+    Args:
+        returns (np.ndarray): (date x ticker) returns, NaN where missing. Overwritten.
+        risk_free_rate (float): Annual risk-free rate.
+        trading_days (int): Trading days per year.
+
+    Returns:
+        np.ndarray: (ticker x metric) values in FINANCIAL_METRICS order.
+    """
+    valid = ~np.isnan(returns)
+    filled = returns
+    np.copyto(filled, 0.0, where=~valid)
+    count = valid.sum(axis=0)
+    hits = (filled > 0).sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = filled.sum(axis=0) / count
+
+    # Central moments from the deviations of each ticker's returns from its mean
+    deviations = np.subtract(filled, np.nan_to_num(mean))
+    deviations *= valid
+    squares = np.multiply(deviations, deviations)
+    sum_squares = squares.sum(axis=0)
+    sum_cubes = np.einsum('ij,ij->j', squares, deviations)
+    sum_fourths = np.einsum('ij,ij->j', squares, squares)
+
+    # Returns below the daily risk-free rate for the downside deviation
+    daily_risk_free = risk_free_rate / trading_days
+    excess = np.subtract(filled, daily_risk_free, out=deviations)
+    downside = excess < 0
+    downside &= valid
+    excess *= downside
+    downside_count = downside.sum(axis=0)
+    downside_sum = excess.sum(axis=0)
+    downside_squares = np.einsum('ij,ij->j', excess, excess)
+
+    max_drawdown, duration, log_growth = _drawdowns(np.log1p(filled, out=squares))
+
+    metrics = np.empty((returns.shape[1], len(FINANCIAL_METRICS)))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        volatility = np.sqrt(sum_squares / (count - 1) * trading_days)
+        excess_return = (mean - daily_risk_free) * trading_days
+        downside_variance = (downside_squares - downside_sum ** 2 / downside_count) / (downside_count - 1)
+        compound_growth = np.expm1(log_growth * trading_days / count)
+
+        metrics[:, 0] = mean * trading_days
+        metrics[:, 1] = volatility
+        metrics[:, 2] = excess_return / volatility
+        metrics[:, 3] = excess_return / np.sqrt(np.maximum(downside_variance, 0.0) * trading_days)
+        metrics[:, 4] = max_drawdown
+        metrics[:, 5] = duration
+        metrics[:, 6] = np.where(max_drawdown < 0, compound_growth / -max_drawdown, np.nan)
+        # Bias-corrected sample skewness and excess kurtosis, as pandas' skew() and kurt()
+        metrics[:, 7] = np.sqrt(count * (count - 1.0)) / (count - 2.0) * (sum_cubes / count) / (sum_squares / count) ** 1.5
+        metrics[:, 8] = ((count + 1.0) * count * (count - 1.0) * sum_fourths / sum_squares ** 2
+                         - 3.0 * (count - 1.0) ** 2) / ((count - 2.0) * (count - 3.0))
+        metrics[:, 9] = hits / count
+
+    # Flat returns (squared deviations below pandas' rounding floor) have no skew or
+    # excess kurtosis; too few returns leave them undefined
+    metrics[sum_squares < 1e-14, 7:9] = 0.0
+    metrics[count < 3, 7] = np.nan
+    metrics[count < 4, 8] = np.nan
+    metrics[count == 0] = np.nan
+    return metrics
+
+
+def panel_financial_metrics(returns, risk_free_rate=0.0, trading_days=TRADING_DAYS):
+    """
+    Compute risk and return metrics for every ticker of a returns matrix in a few
+    vectorized reductions over the dates.
+
+    Each ticker uses its own non-missing returns. The Sharpe and Sortino ratios annualize
+    the mean return in excess of the risk-free rate; the Sortino ratio divides by the
+    standard deviation of the excess returns below zero. The Calmar ratio divides the
+    compound annual growth rate by the depth of the max drawdown. Max Drawdown Duration is
+    the longest stretch, in rows, spent below a previous peak. Hit Rate is the share of
+    positive returns.
+
+    Args:
+        returns (pd.DataFrame or pd.Series): (date x ticker) periodic returns, e.g. from
+            load_returns_panel, or one ticker's returns.
+        risk_free_rate (float): Annual risk-free rate, e.g. 0.04 for 4%.
+        trading_days (int): Return periods per year.
+
+    Returns:
+        pd.DataFrame: One row per ticker and one column per FINANCIAL_METRICS entry.
+    """
+    if trading_days <= 0:
+        raise ValueError("trading_days must be positive.")
+    frame = returns if isinstance(returns, pd.DataFrame) else returns.to_frame()
+    if frame.empty:
+        raise ValueError("The returns matrix has no dates or no tickers.")
+
+    result = _metrics(frame.to_numpy(dtype=float, copy=True), risk_free_rate, trading_days)
+    metrics = pd.DataFrame(result, index=frame.columns, columns=FINANCIAL_METRICS)
+    metrics['Max Drawdown Duration'] = metrics['Max Drawdown Duration'].astype('Int64')
+    return metrics
+
+
+if __name__ == '__main__':
+    # Metrics of every ticker from one returns matrix
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    metrics = panel_financial_metrics(load_returns_panel(input_folder))
+    print(metrics.to_string(float_format='{:.4f}'.format))
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from date_parsing import parse_timestamps
+from manifest import read_raw_csv
+
+# Columns of the yfinance price files that must never hold negative values
+STOCK_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Adj Close', 'Volume', 'Dividends', 'Stock Splits']
+
+
+def clean_price_data(data):
+    """
+    Clean one ticker's price history with whole-column operations: parse dates, adjust
+    for dividends and stock splits, and correct negative values.
+
+    Args:
+        data (pd.DataFrame): Raw price data as read from a *_historical_data.csv file.
+
+    Returns:
+        tuple: (cleaned DataFrame, dict mapping each checked column to the number of
+        negative cells that were corrected)
+    """
+    # Convert the 'Date' column to datetime format
+    data['Date'], _ = parse_timestamps(data['Date'])
+
+    # Adjust for Dividends and Stock Splits
+    if 'Dividends' in data.columns:
+        # Adjust stock prices based on the dividends
+        data['Adj Close'] = data['Close'] - data['Dividends']
+
+    if 'Stock Splits' in data.columns:
+        # Adjust stock prices based on stock splits (example: for a 2-for-1 split, price halved);
+        # rows without a split keep the Close price
+        close = data['Close'].to_numpy(dtype=float)
+        splits = data['Stock Splits'].to_numpy(dtype=float)
+        has_split = splits != 0
+        data['Adj Close'] = np.where(has_split, close / np.where(has_split, splits, 1.0), close)
+
+    # Check and correct negative values, one vectorized pass per column
+    corrections = {}
+    for col in STOCK_COLUMNS:
+        if col in data.columns:
+            negative = data[col] < 0
+            corrections[col] = int(negative.sum())
+            if corrections[col]:
+                # Convert negative values to positive
+                data[col] = data[col].abs()
+
+    return data, corrections
+
+
+def clean_price_file(file_path, offset=0):
+    """
+    Load and clean one raw price file. Module-level so it can run in a process pool.
+
+    Args:
+        file_path (str): Path to a raw *_historical_data.csv file.
+        offset (int): Byte offset of the first row to clean (see manifest.raw_offset);
+            0 cleans the whole file.
+
+    Returns:
+        tuple: Same as clean_price_data.
+    """
+    return clean_price_data(next(read_raw_csv(file_path, offset)))
+
+
+def print_correction_summary(file_name, corrections):
+    """
+    Print one line per file summarizing how many negative cells were corrected per column.
+
+    Args:
+        file_name (str): Name of the dataset the corrections belong to.
+        corrections (dict): Column name -> number of corrected cells.
+
+    Returns:
+        None
+    """
+    total = sum(corrections.values())
+    details = ', '.join(f"{col}={count}" for col, count in corrections.items())
+    print(f"{file_name}: corrected {total} negative values ({details})")
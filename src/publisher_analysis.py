@@ -2,6 +2,7 @@ import pandas as pd
 import os
 import matplotlib.pyplot as plt
 from collections import Counter
+from data_store import load_news_data
 
 def analyze_publishers(file_path, publisher_column='publisher', email_column=None, category_column=None):
     """
@@ -17,8 +18,8 @@ def analyze_publishers(file_path, publisher_column='publisher', email_column=Non
     # Create the 'results/publisher_analysis' folder if it doesn't exist
     os.makedirs('results/publisher_analysis', exist_ok=True)
 
-    # Load the dataset
-    df = pd.read_csv(file_path)
+    # Load only the columns used below from the cleaned data store
+    df = load_news_data(file_path, columns=[col for col in (publisher_column, email_column, category_column) if col])
 
     # Check if the necessary columns exist
     if publisher_column not in df.columns:
@@ -58,7 +59,7 @@ def analyze_publishers(file_path, publisher_column='publisher', email_column=Non
     # 3. If email addresses are used as publisher names, identify unique domains using Counter
     if email_column and email_column in df.columns:
         print("Extracting unique email domains from publishers using Counter...")
-        df['domain'] = df[email_column].str.extract(r'@([A-Za-z0-9.-]+)')[0]
+        df['domain'] = df[email_column].str.extract(r'@([A-Za-z0-9.-]+)')[0].astype('category')
         
         # Count the occurrences of each domain using Counter
         domain_counts = Counter(df['domain'])
@@ -1,17 +1,14 @@
 import os
 import pandas as pd
-import talib
 import matplotlib.pyplot as plt
-import nltk
-from nltk.sentiment.vader import SentimentIntensityAnalyzer
 import numpy as np
-
-# Download VADER lexicon
-nltk.download('vader_lexicon')
+from feature_store import IndicatorStore
+from rolling_moments import rolling_moments
+from sentiment_scoring import score_headlines
 
 def apply_ta_indicators_and_save_images(file_path, output_folder, sentiment_data=None):
     """
-    Apply technical analysis indicators using TA-Lib, perform sentiment analysis, create plots, 
+    Apply technical analysis indicators from the indicator store, perform sentiment analysis, create plots, 
     and save as PNG images.
     
     Args:
@@ -22,28 +19,30 @@ def apply_ta_indicators_and_save_images(file_path, output_folder, sentiment_data
     Returns:
         None
     """
-    # Load the CSV file into a DataFrame
-    df = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
+    # Load the price data together with its stored indicators
+    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    store = IndicatorStore(file_path)
+    df = store.prices.copy()
 
     # Ensure necessary columns are present
-    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     if not all(col in df.columns for col in required_columns):
         raise ValueError(f"File '{file_path}' is missing required columns.")
 
-    # Apply technical indicators using TA-Lib
-    df['SMA_20'] = talib.SMA(df['Close'], timeperiod=20)
-    df['EMA_20'] = talib.EMA(df['Close'], timeperiod=20)
-    df['RSI_14'] = talib.RSI(df['Close'], timeperiod=14)
-    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = talib.MACD(df['Close'], fastperiod=12, slowperiod=26, signalperiod=9)
-    df['Bollinger_Upper'], df['Bollinger_Middle'], df['Bollinger_Lower'] = talib.BBANDS(df['Close'], timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
-    df['ATR'] = talib.ATR(df['High'], df['Low'], df['Close'], timeperiod=14)
-    df['Stochastic_K'], df['Stochastic_D'] = talib.STOCH(df['High'], df['Low'], df['Close'], fastk_period=14, slowk_period=3, slowd_period=3)
-
-    # Calculate correlation between Close and Volume
-    df['Correlation_Close_Volume'] = df['Close'].rolling(window=20).corr(df['Volume'])
-
-    # Calculate the rolling volatility (standard deviation) for Close
-    df['Volatility'] = df['Close'].rolling(window=20).std()
+    # Apply technical indicators (computed once per ticker by the indicator store)
+    df['SMA_20'] = store.get('SMA', timeperiod=20)
+    df['EMA_20'] = store.get('EMA', timeperiod=20)
+    df['RSI_14'] = store.get('RSI', timeperiod=14)
+    df['MACD'], df['MACD_Signal'], df['MACD_Hist'] = store.get('MACD', fastperiod=12, slowperiod=26, signalperiod=9)
+    df['Bollinger_Upper'], df['Bollinger_Middle'], df['Bollinger_Lower'] = store.get('BBANDS', timeperiod=20, nbdevup=2, nbdevdn=2, matype=0)
+    df['ATR'] = store.get('ATR', timeperiod=14)
+    df['Stochastic_K'], df['Stochastic_D'] = store.get('STOCH', fastk_period=14, slowk_period=3, slowd_period=3)
+    store.save()  # Persist newly computed indicators in one write
+
+    # Calculate the correlation between Close and Volume and the rolling volatility
+    # (standard deviation) of Close in one pass over the data
+    moments = rolling_moments(df['Close'], df['Volume'], windows=[20], statistics=['corr', 'std'])
+    df['Correlation_Close_Volume'] = moments['corr', 20]
+    df['Volatility'] = moments['std', 20]
 
     # Print relevant values to the console
     print(f"\nProcessing file: {file_path}")
@@ -55,8 +54,7 @@ def apply_ta_indicators_and_save_images(file_path, output_folder, sentiment_data
     # Perform Sentiment Analysis if sentiment data is provided
     if sentiment_data:
         sentiment_df = pd.read_csv(sentiment_data)
-        sentiment_analyzer = SentimentIntensityAnalyzer()
-        sentiment_df['Sentiment'] = sentiment_df['Text'].apply(lambda x: sentiment_analyzer.polarity_scores(x)['compound'])
+        sentiment_df['Sentiment'] = score_headlines(sentiment_df['Text'], implementation='nltk')['compound']
         sentiment_df['Date'] = pd.to_datetime(sentiment_df['Date'])
         sentiment_df.set_index('Date', inplace=True)
         
@@ -108,13 +106,14 @@ def apply_ta_indicators_and_save_images(file_path, output_folder, sentiment_data
 
     print(f"Indicators plotted and saved to {output_file}")
 
-# Define the folder paths
-input_folder = os.path.join('cleaned_data', 'yfinance_data')
-output_folder = os.path.join('results', 'technical_indicators')
+if __name__ == '__main__':
+    # Define the folder paths
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    output_folder = os.path.join('results', 'technical_indicators')
 
-# Apply the function to all files in the input folder
-stock_files = [f for f in os.listdir(input_folder) if f.endswith('.csv')]
+    # Apply the function to all files in the input folder
+    stock_files = [f for f in os.listdir(input_folder) if f.endswith('.csv')]
 
-for stock_file in stock_files:
-    file_path = os.path.join(input_folder, stock_file)
-    apply_ta_indicators_and_save_images(file_path, output_folder)
+    for stock_file in stock_files:
+        file_path = os.path.join(input_folder, stock_file)
+        apply_ta_indicators_and_save_images(file_path, output_folder)
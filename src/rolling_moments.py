@@ -0,0 +1,284 @@
+import os
+import numpy as np
+import pandas as pd
+from panel_indicators import load_price_panel
+
+# Statistics the engine computes
+ROLLING_STATISTICS = ['mean', 'var', 'std', 'cov', 'corr', 'skew', 'zscore']
+
+# Statistics of the pair (x, y), available only when a second series is given
+PAIR_STATISTICS = ['cov', 'corr']
+
+# Shortest run of rows whose moments are summed about one anchor; longer windows get
+# blocks of their own length
+MIN_BLOCK_LENGTH = 128
+
+# Tickers accumulated at once on panels; bounds the working memory to a few arrays of
+# (dates x DEFAULT_COLUMN_CHUNK) per moment
+DEFAULT_COLUMN_CHUNK = 512
+
+
+def _blocks(values, block):
+    """
+    Split (date x ticker) values into blocks of `block` rows, each centered on its first
+    valid value, with missing values set to 0.
+
+    Centering per block keeps the power sums at the scale of the recent price changes
+    rather than of the whole price history, so moments derived from their differences
+    lose little precision to cancellation.
+
+    Returns:
+        tuple: (centered values of shape (blocks, block, tickers), anchor per block and
+        ticker, validity mask).
+    """
+    rows, columns = values.shape
+    padded = np.full((-(-rows // block) * block, columns), np.nan)
+    padded[:rows] = values
+    padded = padded.reshape(-1, block, columns)
+    valid = ~np.isnan(padded)
+    first = np.argmax(valid, axis=1)[:, np.newaxis]
+    anchors = np.where(valid.any(axis=1), np.take_along_axis(padded, first, axis=1)[:, 0], 0.0)
+    return np.where(valid, padded - anchors[:, np.newaxis], 0.0), anchors, valid
+
+
+def _changes(values, block):
+    """1.0 on rows whose value differs from the previous row's, 0.0 elsewhere, in blocks."""
+    changes = np.zeros((-(-len(values) // block) * block, values.shape[1]))
+    changes[1:len(values)] = values[1:] != values[:-1]
+    return changes.reshape(-1, block, values.shape[1])
+
+
+def _recenter(sums, index, dx, dy):
+    """
+    Move power sums from one block's anchors to the next block's, in place. With d the
+    old anchor minus the new one, x - new = (x - old) + d, and the sums expand binomially.
+    """
+    count = sums[index['count']]
+    x, xx = sums[index['x']], sums[index['xx']]
+    if 'pair_xy' in index:
+        pair_count, pair_x, pair_y = sums[index['pair_count']], sums[index['pair_x']], sums[index['pair_y']]
+        sums[index['pair_xy']] += dy * pair_x + dx * pair_y + pair_count * dx * dy
+        sums[index['pair_yy']] += 2.0 * dy * pair_y + pair_count * dy * dy
+        pair_y += pair_count * dy
+        if index['pair_x'] != index['x']:
+            sums[index['pair_xx']] += 2.0 * dx * pair_x + pair_count * dx * dx
+            pair_x += pair_count * dx
+    if 'xxx' in index:
+        sums[index['xxx']] += 3.0 * dx * xx + 3.0 * dx * dx * x + count * dx ** 3
+    xx += 2.0 * dx * x + count * dx * dx
+    x += count * dx
+
+
+def _window_sums(prefix, index, window, x_anchors, y_anchors):
+    """
+    Sum every moment over the window ending on each row, about that row's block anchors.
+
+    Args:
+        prefix (np.ndarray): Moments summed within each block, shape (moments, blocks,
+            block + 1, tickers) with a leading zero row per block.
+        index (dict): Moment name -> position in prefix.
+        window (int): Window length, at most the block length.
+        x_anchors, y_anchors (np.ndarray): Anchors per block and ticker.
+
+    Returns:
+        np.ndarray: Window sums of shape (moments, rows, tickers), rows padded to whole
+        blocks. Windows starting before the first row hold partial sums.
+    """
+    moments, blocks, block, columns = prefix.shape[0], prefix.shape[1], prefix.shape[2] - 1, prefix.shape[3]
+    sums = np.empty((moments, blocks, block, columns))
+    sums[:, :, window - 1:] = prefix[:, :, window:] - prefix[:, :, :block + 1 - window]
+    if window > 1:
+        # Windows ending on a block's first rows start in the block before
+        head = prefix[:, :, 1:window].copy()
+        previous = prefix[:, :-1, block:] - prefix[:, :-1, block + 1 - window:block]
+        dy = None if y_anchors is None else (y_anchors[:-1] - y_anchors[1:])[:, np.newaxis]
+        _recenter(previous, index, (x_anchors[:-1] - x_anchors[1:])[:, np.newaxis], dy)
+        head[:, 1:] += previous
+        sums[:, :, :window - 1] = head
+    return sums.reshape(moments, blocks * block, columns)
+
+
+def _moments(x, y, windows, statistics, ddof, out):
+    """
+    Compute rolling statistics of (date x ticker) arrays from a single cumulative sum of
+    every power and cross product the statistics need, into `out`.
+
+    A window yields a value only when all its rows are present (pandas' default
+    min_periods). Windows whose values are all equal get exactly zero variance and skew
+    and no correlation, as pandas gives.
+
+    Args:
+        out (np.ndarray): NaN-filled result of shape (dates, statistics, windows, tickers).
+    """
+    rows, columns = x.shape
+    block = max([MIN_BLOCK_LENGTH] + [window for window in windows if window <= rows])
+    xc, x_anchors, x_valid = _blocks(x, block)
+    pair = any(statistic in PAIR_STATISTICS for statistic in statistics)
+    names = ['count', 'x', 'xx', 'x_changes'] + (['xxx'] if 'skew' in statistics else [])
+    y_anchors = None
+    if pair:
+        yc, y_anchors, y_valid = _blocks(y, block)
+        joint = x_valid & y_valid
+        separate = not np.array_equal(joint, x_valid)
+        names += (['pair_count', 'pair_x', 'pair_xx'] if separate else []) + ['pair_y', 'pair_yy', 'pair_xy', 'y_changes']
+
+    # Every power and cross product is a layer of one array, summed in one pass; index
+    # maps a moment to its layer
+    index = {name: layer for layer, name in enumerate(names)}
+    prefix = np.empty((len(names), len(x_anchors), block + 1, columns))
+    prefix[:, :, 0] = 0.0
+    layers = prefix[:, :, 1:]
+    changes = {'x_changes': _changes(x, block)}
+    layers[index['count']] = x_valid
+    layers[index['x']] = xc
+    np.multiply(xc, xc, out=layers[index['xx']])
+    layers[index['x_changes']] = changes['x_changes']
+    if 'skew' in statistics:
+        np.multiply(layers[index['xx']], xc, out=layers[index['xxx']])
+    if pair:
+        if separate:
+            layers[index['pair_count']] = joint
+            np.multiply(xc, joint, out=layers[index['pair_x']])
+            np.multiply(layers[index['pair_x']], layers[index['pair_x']], out=layers[index['pair_xx']])
+        else:
+            index.update(pair_count=index['count'], pair_x=index['x'], pair_xx=index['xx'])
+        np.multiply(yc, joint, out=layers[index['pair_y']])
+        np.multiply(layers[index['pair_y']], layers[index['pair_y']], out=layers[index['pair_yy']])
+        np.multiply(layers[index['pair_x']], layers[index['pair_y']], out=layers[index['pair_xy']])
+        changes['y_changes'] = _changes(y, block)
+        layers[index['y_changes']] = changes['y_changes']
+    np.cumsum(prefix, axis=2, out=prefix)
+    current = xc.reshape(-1, columns)[:rows]
+    anchors = np.repeat(x_anchors, block, axis=0)[:rows]
+    changes = {name: values.reshape(-1, columns) for name, values in changes.items()}
+
+    for position, window in enumerate(windows):
+        if window > rows:
+            continue
+        sums = _window_sums(prefix, index, window, x_anchors, y_anchors)[:, window - 1:rows]
+        outputs = {statistic: out[window - 1:, statistics.index(statistic), position] for statistic in statistics}
+        # A window is constant when no row after its first changes value
+        x_constant = sums[index['x_changes']] - changes['x_changes'][:rows - window + 1] == 0
+        with np.errstate(invalid='ignore', divide='ignore'):
+            _window_statistics(outputs, sums, index, x_constant, current[window - 1:], anchors[window - 1:], window, ddof)
+            if pair:
+                y_constant = sums[index['y_changes']] - changes['y_changes'][:rows - window + 1] == 0
+                _pair_statistics(outputs, sums, index, x_constant | y_constant, window, ddof)
+        incomplete = sums[index['count']] < window
+        pair_incomplete = sums[index['pair_count']] < window if pair else None
+        for statistic, values in outputs.items():
+            values[pair_incomplete if statistic in PAIR_STATISTICS else incomplete] = np.nan
+
+
+def _window_statistics(outputs, sums, index, constant, current, anchors, window, ddof):
+    """
+    Fill the single-series statistics of the windows ending on rows window - 1 onwards.
+    Windows with a missing row are masked afterwards, so every window counts `window` rows.
+    """
+    sum_x, sum_xx = sums[index['x']], sums[index['xx']]
+    mean = sum_x / window
+    squares = sum_xx - sum_x * mean
+    np.maximum(squares, 0.0, out=squares)
+    squares[constant] = 0.0
+
+    if 'mean' in outputs:
+        np.add(mean, anchors, out=outputs['mean'])
+    if 'var' in outputs:
+        np.divide(squares, window - ddof, out=outputs['var'])
+    if 'std' in outputs or 'zscore' in outputs:
+        std = outputs['std'] if 'std' in outputs else np.empty(squares.shape)
+        np.sqrt(np.divide(squares, window - ddof, out=std), out=std)
+        if 'zscore' in outputs:
+            zscore = np.subtract(current, mean, out=outputs['zscore'])
+            zscore /= std
+            zscore[std == 0.0] = np.nan
+    if 'skew' in outputs:
+        # Bias-corrected sample skewness from the central moments, as pandas computes it
+        skew = outputs['skew']
+        if window < 3:
+            return
+        second = squares / window
+        np.multiply(mean, 2.0 * mean, out=skew)
+        skew -= 3.0 * sum_xx / window
+        skew *= mean
+        skew += sums[index['xxx']] / window
+        skew /= second * np.sqrt(second)
+        skew *= np.sqrt(window * (window - 1.0)) / (window - 2.0)
+        skew[constant] = 0.0
+
+
+def _pair_statistics(outputs, sums, index, constant, window, ddof):
+    """Fill the covariance and correlation of the windows ending on rows window - 1 onwards."""
+    sum_x, sum_y = sums[index['pair_x']], sums[index['pair_y']]
+    products = sums[index['pair_xy']] - sum_x * sum_y / window
+    if 'cov' in outputs:
+        np.divide(products, window - ddof, out=outputs['cov'])
+    if 'corr' in outputs:
+        squares_x = np.maximum(sums[index['pair_xx']] - sum_x * sum_x / window, 0.0)
+        squares_y = np.maximum(sums[index['pair_yy']] - sum_y * sum_y / window, 0.0)
+        squares_x *= squares_y
+        correlation = np.divide(products, np.sqrt(squares_x, out=squares_x), out=outputs['corr'])
+        correlation[constant] = np.nan
+
+
+def rolling_moments(x, y=None, windows=(20,), statistics=None, ddof=1, column_chunk=DEFAULT_COLUMN_CHUNK):
+    """
+    Compute rolling mean, variance, standard deviation, skew and z-score of a series, and
+    its covariance and correlation with a second series, for several windows at once.
+
+    All statistics and windows come from one cumulative sum over the data, instead of one
+    rolling pass per statistic and window. Results match pandas' rolling methods
+    (e.g. x.rolling(20).std(), x.rolling(20).corr(y)) to rounding error.
+
+    Args:
+        x (pd.Series or pd.DataFrame): One series, or a (date x ticker) panel.
+        y (pd.Series or pd.DataFrame): Optional second series or panel for 'cov' and
+            'corr', aligned to x.
+        windows (list): Window lengths in rows.
+        statistics (list): Statistics to compute, from ROLLING_STATISTICS. None computes
+            all of them that the inputs allow.
+        ddof (int): Delta degrees of freedom of the variance, std and covariance.
+        column_chunk (int): Tickers computed at once on panels.
+
+    Returns:
+        pd.DataFrame: Indexed like x, with (statistic, window) column levels, e.g.
+        result['std', 20], and a third 'stock' level for panels.
+    """
+    if statistics is None:
+        statistics = [s for s in ROLLING_STATISTICS if y is not None or s not in PAIR_STATISTICS]
+    unknown = [statistic for statistic in statistics if statistic not in ROLLING_STATISTICS]
+    if unknown:
+        raise ValueError(f"Unknown rolling statistics {unknown}.")
+    if y is None and any(statistic in PAIR_STATISTICS for statistic in statistics):
+        raise ValueError(f"Statistics {PAIR_STATISTICS} need a second series y.")
+    windows = list(windows)
+    if not windows or any(int(window) != window or window < 1 for window in windows):
+        raise ValueError("Windows must be one or more positive integers.")
+
+    panel = isinstance(x, pd.DataFrame)
+    frame = x if panel else x.to_frame()
+    values = frame.to_numpy(dtype=float)
+    if y is not None:
+        other = y.reindex(index=frame.index, columns=frame.columns) if panel else y.reindex(frame.index)
+        other_values = other.to_numpy(dtype=float).reshape(values.shape)
+
+    result = np.full((len(frame), len(statistics), len(windows), values.shape[1]), np.nan)
+    for start in range(0, values.shape[1], column_chunk):
+        block = slice(start, start + column_chunk)
+        _moments(values[:, block], None if y is None else other_values[:, block], windows, statistics, ddof, result[:, :, :, block])
+
+    if panel:
+        columns = pd.MultiIndex.from_product([statistics, windows, frame.columns], names=['statistic', 'window', 'stock'])
+        return pd.DataFrame(result.reshape(len(frame), -1), index=frame.index, columns=columns)
+    columns = pd.MultiIndex.from_product([statistics, windows], names=['statistic', 'window'])
+    return pd.DataFrame(result.reshape(len(frame), -1), index=frame.index, columns=columns)
+
+
+if __name__ == '__main__':
+    # Rolling statistics of every ticker's closes, and their correlation with its volume
+    input_folder = os.path.join('cleaned_data', 'yfinance_data')
+    panel = load_price_panel(input_folder, fields=['Close', 'Volume'])
+    moments = rolling_moments(panel['Close'], panel['Volume'], windows=[20, 60])
+    print(f"Computed {len(ROLLING_STATISTICS)} statistics over windows [20, 60] for "
+          f"{panel['Close'].shape[1]} tickers and {len(moments)} dates")
+    print(moments.iloc[-1].unstack('stock').to_string())
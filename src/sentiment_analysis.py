@@ -1,7 +1,8 @@
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
-from nltk.sentiment import SentimentIntensityAnalyzer
+from data_store import load_news_data
+from sentiment_scoring import score_headlines
 
 def perform_sentiment_analysis(news_file, output_folder):
     """
@@ -18,13 +19,10 @@ def perform_sentiment_analysis(news_file, output_folder):
     os.makedirs(output_folder, exist_ok=True)
     
     # Load the news data
-    news_df = pd.read_csv(news_file)
+    news_df = load_news_data(news_file, columns=['headline'])
     
-    # Initialize VADER SentimentIntensityAnalyzer
-    sia = SentimentIntensityAnalyzer()
-
-    # Perform sentiment analysis on each headline and store the scores
-    news_df['sentiment_score'] = news_df['headline'].apply(lambda x: sia.polarity_scores(str(x))['compound'])
+    # Perform sentiment analysis on each headline with NLTK's VADER and store the scores
+    news_df['sentiment_score'] = score_headlines(news_df['headline'], implementation='nltk')['compound']
 
     # Print out the sentiment scores for the first few headlines
     print("\nSentiment analysis results (headline and sentiment score):")
@@ -49,9 +47,10 @@ def perform_sentiment_analysis(news_file, output_folder):
     print("\nSentiment score statistics:")
     print(news_df['sentiment_score'].describe())
 
-# Define file and folder paths
-news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
-output_folder = os.path.join('results', 'sentiment_analysis')
+if __name__ == '__main__':
+    # Define file and folder paths
+    news_file = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
+    output_folder = os.path.join('results', 'sentiment_analysis')
 
-# Run sentiment analysis
-perform_sentiment_analysis(news_file, output_folder)
\ No newline at end of file
+    # Run sentiment analysis
+    perform_sentiment_analysis(news_file, output_folder)
\ No newline at end of file
@@ -0,0 +1,191 @@
+import os
+import time
+from contextlib import contextmanager
+from importlib.metadata import version
+import numpy as np
+import pandas as pd
+
+# On-disk score cache, one Parquet file per analyzer implementation and version
+CACHE_FOLDER = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'cleaned_data', 'sentiment_cache'))
+
+# VADER score components, in the order they are stored
+SCORE_COLUMNS = ['neg', 'neu', 'pos', 'compound']
+
+# Supported VADER implementations -> distribution whose version goes into the cache key
+IMPLEMENTATIONS = {
+    'vader': 'vaderSentiment',
+    'nltk': 'nltk',
+    'array': 'vaderSentiment',
+}
+
+# Implementations that share a distribution with another one get their own key prefix
+KEY_PREFIXES = {
+    'array': 'array-',
+}
+
+# Seconds to wait for another process to release a cache file before giving up
+LOCK_TIMEOUT = 60
+
+# Cache tables already read in this process, keyed by cache file path
+_loaded_caches = {}
+
+
+def analyzer_key(implementation):
+    """
+    Build the cache key of an analyzer implementation, e.g. 'vaderSentiment-3.3.2' or
+    'array-vaderSentiment-3.3.2'. Scores from different implementations or versions are
+    never mixed.
+
+    Args:
+        implementation (str): 'vader', 'nltk' or 'array'.
+
+    Returns:
+        str: Implementation name and installed version.
+    """
+    if implementation not in IMPLEMENTATIONS:
+        raise ValueError(f"Unknown sentiment implementation '{implementation}'.")
+    distribution = IMPLEMENTATIONS[implementation]
+    return f"{KEY_PREFIXES.get(implementation, '')}{distribution}-{version(distribution)}"
+
+
+def hash_headlines(headlines):
+    """
+    Hash headlines to 64-bit keys in one vectorized pass. The cache also stores each
+    headline's text, so a hash collision is a cache miss rather than a wrong score.
+
+    Args:
+        headlines (pd.Series): Headlines, as returned by sentiment_scoring.headline_strings.
+
+    Returns:
+        np.ndarray: uint64 hash per headline.
+    """
+    return pd.util.hash_pandas_object(headlines, index=False).to_numpy()
+
+
+def cache_path(implementation, cache_folder=CACHE_FOLDER):
+    return os.path.join(cache_folder, f"{analyzer_key(implementation)}.parquet")
+
+
+@contextmanager
+def _cache_lock(path, timeout=LOCK_TIMEOUT):
+    """
+    Hold an exclusive lock on a cache file while it is read and rewritten, so concurrent
+    runs don't lose each other's scores. The lock is a '<path>.lock' file created with
+    O_EXCL, which works on every platform.
+
+    Args:
+        path (str): Path to the cache file.
+        timeout (float): Seconds to wait for the lock.
+    """
+    lock_path = f"{path}.lock"
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            break
+        except FileExistsError:
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Timed out waiting for {lock_path}; delete it if no other run is using the cache.")
+            time.sleep(0.05)
+    try:
+        yield
+    finally:
+        os.remove(lock_path)
+
+
+def _read_cache(path):
+    """
+    Read a cache file, keeping the first entry of any duplicated hash.
+
+    Args:
+        path (str): Path to the cache file.
+
+    Returns:
+        pd.DataFrame: Text and scores indexed by headline hash (empty if the file doesn't
+        exist or predates the stored text).
+    """
+    if os.path.exists(path):
+        cache = pd.read_parquet(path)
+        if 'text' in cache.columns:
+            cache = cache.drop_duplicates(subset='hash').set_index('hash')
+            return cache[['text'] + SCORE_COLUMNS]
+    cache = pd.DataFrame(columns=SCORE_COLUMNS, dtype='float64', index=pd.Index([], dtype='uint64', name='hash'))
+    cache.insert(0, 'text', pd.Series(dtype=object))
+    return cache
+
+
+def load_cache(implementation, cache_folder=CACHE_FOLDER):
+    """
+    Load the cached scores of one analyzer implementation.
+
+    Args:
+        implementation (str): 'vader', 'nltk' or 'array'.
+        cache_folder (str): Folder holding the cache files.
+
+    Returns:
+        pd.DataFrame: Headline text and scores indexed by headline hash (empty if nothing
+        is cached yet).
+    """
+    path = cache_path(implementation, cache_folder)
+    if path not in _loaded_caches:
+        _loaded_caches[path] = _read_cache(path)
+    return _loaded_caches[path]
+
+
+def lookup_scores(hashes, texts, implementation, cache_folder=CACHE_FOLDER):
+    """
+    Look up cached scores for many headline hashes at once. A hash whose cached text
+    differs from the headline's is treated as a miss.
+
+    Args:
+        hashes (np.ndarray): uint64 headline hashes.
+        texts (pd.Series): The hashed headlines, in the same order.
+        implementation (str): 'vader', 'nltk' or 'array'.
+        cache_folder (str): Folder holding the cache files.
+
+    Returns:
+        tuple: (float array of shape (len(hashes), 4) with NaN rows for misses,
+        boolean array marking the hits)
+    """
+    cache = load_cache(implementation, cache_folder)
+    positions = cache.index.get_indexer(hashes)
+    hits = positions >= 0
+    hits[hits] = cache['text'].to_numpy()[positions[hits]] == np.asarray(texts, dtype=object)[hits]
+    scores = np.full((len(hashes), len(SCORE_COLUMNS)), np.nan)
+    scores[hits] = cache[SCORE_COLUMNS].to_numpy()[positions[hits]]
+    return scores, hits
+
+
+def store_scores(hashes, texts, scores, implementation, cache_folder=CACHE_FOLDER):
+    """
+    Add newly computed scores to the cache and persist it.
+
+    The cache file is re-read under a lock, so entries added by other runs since it was
+    loaded are kept, and replaced through a temporary file so readers never see a partial
+    write. Entries already cached under a hash are kept; a colliding headline stays
+    uncached and is scored again when it is next seen.
+
+    Args:
+        hashes (np.ndarray): uint64 headline hashes.
+        texts (pd.Series): The hashed headlines, in the same order.
+        scores (np.ndarray): Array of shape (len(hashes), 4) in SCORE_COLUMNS order.
+        implementation (str): 'vader', 'nltk' or 'array'.
+        cache_folder (str): Folder holding the cache files.
+
+    Returns:
+        None
+    """
+    if len(hashes) == 0:
+        return
+    path = cache_path(implementation, cache_folder)
+    new_scores = pd.DataFrame(scores, columns=SCORE_COLUMNS, index=pd.Index(hashes, dtype='uint64', name='hash'))
+    new_scores.insert(0, 'text', np.asarray(texts, dtype=object))
+    os.makedirs(cache_folder, exist_ok=True)
+    with _cache_lock(path):
+        cache = pd.concat([_read_cache(path), new_scores])
+        cache = cache[~cache.index.duplicated()]
+        temp_path = os.path.join(cache_folder, f".{os.path.basename(path)}.tmp")
+        cache.reset_index().to_parquet(temp_path, index=False)
+        os.replace(temp_path, path)
+    _loaded_caches[path] = cache
+
@@ -0,0 +1,153 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sentiment_cache import SCORE_COLUMNS, CACHE_FOLDER, analyzer_key, hash_headlines, lookup_scores, store_scores
+
+# Headlines per task sent to a worker process
+DEFAULT_CHUNK_SIZE = 20000
+
+# Analyzer of the current worker process, created once by _init_worker
+_worker_analyzer = None
+
+
+def make_analyzer(implementation):
+    """
+    Create a VADER analyzer for one of the supported implementations.
+
+    Args:
+        implementation (str): 'vader' for vaderSentiment or 'nltk' for NLTK's VADER port.
+
+    Returns:
+        SentimentIntensityAnalyzer: The analyzer.
+    """
+    if implementation == 'vader':
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        return SentimentIntensityAnalyzer()
+    if implementation == 'nltk':
+        import nltk
+        from nltk.sentiment.vader import SentimentIntensityAnalyzer
+        nltk.download('vader_lexicon', quiet=True)
+        return SentimentIntensityAnalyzer()
+    raise ValueError(f"Unknown sentiment implementation '{implementation}'.")
+
+
+def headline_strings(headlines):
+    """
+    Convert headlines to a plain object Series of strings, so hashes don't depend on the
+    column's dtype (object, Arrow-backed or categorical). Missing headlines become 'nan',
+    which is what str(x) gave the old per-row scoring.
+    """
+    values = headlines.to_numpy(dtype=object, na_value='nan')
+    return pd.Series(values, dtype=object).map(str)
+
+
+def _init_worker(implementation):
+    global _worker_analyzer
+    _worker_analyzer = make_analyzer(implementation)
+
+
+def _score_chunk(texts):
+    """
+    Score a list of headlines with the worker's analyzer.
+
+    Returns:
+        np.ndarray: Array of shape (len(texts), 4) in SCORE_COLUMNS order.
+    """
+    scores = np.empty((len(texts), len(SCORE_COLUMNS)))
+    for i, text in enumerate(texts):
+        result = _worker_analyzer.polarity_scores(text)
+        scores[i] = [result[col] for col in SCORE_COLUMNS]
+    return scores
+
+
+def batch_polarity_scores(headlines, implementation='vader', workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Score headlines with VADER on a process pool, one analyzer per worker.
+
+    Headlines are split into chunks of `chunk_size` that are scored in parallel; the
+    results come back in input order. Inputs that fit in a single chunk are scored in
+    this process, since starting workers would cost more than it saves. The 'array'
+    implementation is vectorized over the whole input and always runs in this process.
+
+    Args:
+        headlines (pd.Series): Headlines to score.
+        implementation (str): 'vader' (vaderSentiment), 'nltk' (NLTK's VADER port) or
+            'array' (array_vader.ArrayVader, vaderSentiment's rules on NumPy arrays).
+        workers (int): Number of worker processes (default: one per CPU).
+        chunk_size (int): Headlines per task.
+
+    Returns:
+        pd.DataFrame: neg/neu/pos/compound columns aligned with `headlines`.
+    """
+    texts = headline_strings(headlines).tolist()
+    workers = workers or os.cpu_count() or 1
+    chunks = [texts[start:start + chunk_size] for start in range(0, len(texts), chunk_size)]
+
+    start_time = time.perf_counter()
+    if implementation == 'array':
+        from array_vader import ArrayVader
+        results = [ArrayVader().polarity_scores(pd.Series(texts, dtype=object)).to_numpy()]
+        workers = 1
+    elif workers == 1 or len(chunks) <= 1:
+        _init_worker(implementation)
+        results = [_score_chunk(chunk) for chunk in chunks]
+        workers = 1
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks)), initializer=_init_worker,
+                                 initargs=(implementation,)) as pool:
+            results = list(pool.map(_score_chunk, chunks))
+    elapsed = time.perf_counter() - start_time
+
+    if texts:
+        rate = len(texts) / elapsed if elapsed > 0 else float('inf')
+        print(f"Scored {len(texts)} headlines in {elapsed:.2f}s ({rate:,.0f} headlines/s, {workers} workers)")
+
+    scores = np.vstack(results) if results else np.empty((0, len(SCORE_COLUMNS)))
+    return pd.DataFrame(scores, columns=SCORE_COLUMNS, index=headlines.index)
+
+
+def score_headlines(headlines, implementation='vader', workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                    use_cache=True, cache_folder=CACHE_FOLDER):
+    """
+    Score headlines with VADER, serving known headlines from the on-disk score cache and
+    batch-scoring the rest on a process pool.
+
+    Headlines are factorized first, so every distinct string is looked up and scored once
+    and the scores are broadcast back to the rows through the factor codes.
+
+    Args:
+        headlines (pd.Series): Headlines to score.
+        implementation (str): 'vader' (vaderSentiment), 'nltk' (NLTK's VADER port) or
+            'array' (vaderSentiment's rules on NumPy arrays, see array_vader).
+        workers (int): Number of worker processes for uncached headlines (default: one per CPU).
+        chunk_size (int): Headlines per worker task.
+        use_cache (bool): Read and update the score cache.
+        cache_folder (str): Folder holding the cache files.
+
+    Returns:
+        pd.DataFrame: neg/neu/pos/compound columns aligned with `headlines`.
+    """
+    # Reduce the column to its distinct headlines; codes map every row back to one of them
+    codes, uniques = pd.factorize(headline_strings(headlines))
+    texts = pd.Series(uniques, dtype=object)
+    if len(texts):
+        print(f"Deduplicated {len(codes)} headlines to {len(texts)} distinct ({len(codes) / len(texts):.1f}x fewer to score)")
+
+    if not use_cache:
+        scores = batch_polarity_scores(texts, implementation, workers=workers, chunk_size=chunk_size).to_numpy()
+    else:
+        hashes = hash_headlines(texts)
+        scores, hits = lookup_scores(hashes, texts, implementation, cache_folder)
+        print(f"Sentiment cache: {int(hits.sum())} of {len(hashes)} distinct headlines served from {analyzer_key(implementation)} cache")
+
+        if not hits.all():
+            # Score the headlines the cache hasn't seen and add them to it
+            new_scores = batch_polarity_scores(texts[~hits], implementation, workers=workers, chunk_size=chunk_size)
+            store_scores(hashes[~hits], texts[~hits], new_scores.to_numpy(), implementation, cache_folder)
+            scores[~hits] = new_scores.to_numpy()
+
+    # Broadcast the per-headline scores back to every row
+    scores = scores.reshape(-1, len(SCORE_COLUMNS))[codes]
+    return pd.DataFrame(scores, columns=SCORE_COLUMNS, index=headlines.index)
@@ -0,0 +1,321 @@
+import os
+import io
+import sys
+import csv
+import json
+import time
+import asyncio
+import numpy as np
+import pandas as pd
+from array_vader import ArrayVader
+from date_parsing import parse_timestamps
+from trading_calendar import DEFAULT_CUTOFF_HOUR, session_calendar, next_sessions
+
+# Fields of an incoming headline record, as in the analyst-ratings feed
+RECORD_FIELDS = ['headline', 'publisher', 'stock', 'date']
+
+# Columns of the per-ticker daily aggregate table
+AGGREGATE_COLUMNS = ['stock', 'date', 'sentiment_score', 'count', 'decayed_sentiment']
+
+# Half-life of the decayed mean: a headline counts half as much one half-life later
+DEFAULT_HALF_LIFE = pd.Timedelta(days=1)
+
+
+def _parse_dates(values):
+    """
+    Parse the timestamps of a batch with date_parsing.parse_timestamps, leaving NaT where
+    a record's timestamp can't be parsed, so one malformed record doesn't stop the feed.
+
+    Args:
+        values (pd.Series): Timestamp strings.
+
+    Returns:
+        pd.Series: datetime64 values aligned with `values`.
+    """
+    try:
+        return parse_timestamps(values)[0]
+    except (ValueError, OverflowError):
+        # Parse the batch record by record to find the ones that fail
+        parsed = pd.Series(pd.NaT, index=values.index, dtype='datetime64[ns]')
+        for index, value in values.items():
+            try:
+                parsed[index] = parse_timestamps(pd.Series([value]))[0].iloc[0]
+            except (ValueError, OverflowError):
+                pass
+        return parsed
+
+
+class SentimentStream:
+    """
+    Score a live headline feed and keep per-ticker daily sentiment aggregates up to date.
+
+    Headlines arrive one at a time or in micro-batches. Each batch is scored with the
+    array VADER scorer (the same scores the batch scripts use) and folded into running
+    state, so an aggregate is updated without reloading or rescoring anything:
+
+    - per (ticker, day): headline count and score sum, giving the daily mean. Given the
+      price dates, the day is the headline's trading session, as in
+      aggregate_sentiments.normalize_dates; otherwise it is the calendar day;
+    - per ticker: an exponentially decayed mean of all scores so far, where a headline's
+      weight halves every `half_life`, reported for each day as of its latest headline.
+    """
+
+    def __init__(self, half_life=DEFAULT_HALF_LIFE, scorer=None, price_dates=None, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+        """
+        Args:
+            half_life (pd.Timedelta or str): Half-life of the decayed mean, e.g. '12h'.
+            scorer (ArrayVader): Scorer to use (default: a new ArrayVader).
+            price_dates: Trading calendar to bucket headlines by session instead of by
+                calendar day: the price dates shared by every ticker, or a dict of ticker ->
+                price dates (headlines of other tickers are left out, as normalize_dates
+                only aggregates tickers with price data).
+            cutoff_hour (float): Hour of the day from which headlines count for the next session.
+        """
+        self.half_life = pd.Timedelta(half_life)
+        self.scorer = scorer or ArrayVader()
+        self.cutoff_hour = cutoff_hour
+        if isinstance(price_dates, dict):
+            self.calendars = {stock: session_calendar(dates) for stock, dates in price_dates.items()}
+        elif price_dates is not None:
+            self.calendars = session_calendar(price_dates)
+        else:
+            self.calendars = None
+        # (stock, day) -> [count, score sum, decayed mean after the day's latest headline]
+        self.daily = {}
+        # stock -> [decayed score sum, decayed weight, epoch seconds of the latest headline]
+        self.decay = {}
+
+    def _days(self, batch):
+        """
+        Get the day each record of a batch is aggregated under: its trading session if the
+        stream has a calendar, its calendar day otherwise. NaT where the record has no
+        timestamp or comes after the last session of its ticker.
+        """
+        if self.calendars is None:
+            return batch['date'].dt.normalize()
+
+        timestamps = batch['date'].to_numpy(dtype='datetime64[ns]')
+        days = np.full(len(batch), np.datetime64('NaT', 'ns'))
+        if isinstance(self.calendars, dict):
+            stocks = batch['stock'].astype(str).to_numpy()
+            groups = pd.Series(stocks).groupby(stocks).indices
+            calendars = [(self.calendars[stock], rows) for stock, rows in groups.items() if stock in self.calendars]
+        else:
+            calendars = [(self.calendars, np.arange(len(batch)))]
+        for calendar, rows in calendars:
+            positions = next_sessions(timestamps[rows], calendar, self.cutoff_hour)
+            # Position -1 picks the NaT appended after the last session
+            days[rows] = np.append(calendar, np.datetime64('NaT', 'ns'))[positions]
+        return pd.Series(days, index=batch.index)
+
+    def update(self, records):
+        """
+        Score new headlines and fold them into the aggregates.
+
+        Args:
+            records: One record (dict), a list of records or a DataFrame with at least the
+                'headline', 'stock' and 'date' fields ('publisher' is passed through).
+
+        Returns:
+            tuple: (scored records as a DataFrame with 'sentiment_score' and the 'day' they
+            are aggregated under added, aggregate rows of the (stock, day) pairs the batch touched)
+        """
+        if isinstance(records, dict):
+            records = [records]
+        batch = records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+        for field in RECORD_FIELDS:
+            if field not in batch.columns:
+                batch[field] = None
+        if batch.empty:
+            return batch, pd.DataFrame(columns=AGGREGATE_COLUMNS)
+
+        if not pd.api.types.is_datetime64_any_dtype(batch['date']):
+            batch['date'] = _parse_dates(batch['date'].astype(str))
+        batch['day'] = self._days(batch)
+        batch['sentiment_score'] = self.scorer.polarity_scores(batch['headline'].fillna('').astype(str))['compound']
+
+        # Fold the records in arrival order; the decayed state is per ticker. Rows without a
+        # day (no timestamp, or after the last session) are scored but left out, as the
+        # batch aggregation leaves them out.
+        dated = batch[batch['day'].notna()]
+        seconds = dated['date'].to_numpy(dtype='datetime64[ns]').astype(np.int64) / 1e9
+        half_life = self.half_life.total_seconds()
+        touched = {}
+        for stock, day, when, score in zip(dated['stock'].astype(str).tolist(), dated['day'].tolist(),
+                                           seconds.tolist(), dated['sentiment_score'].tolist()):
+            state = self.decay.get(stock)
+            if state is None:
+                state = self.decay[stock] = [0.0, 0.0, when]
+            if when >= state[2]:
+                factor = 0.5 ** ((when - state[2]) / half_life)
+                state[0] = state[0] * factor + score
+                state[1] = state[1] * factor + 1.0
+                state[2] = when
+            else:
+                # Late headline: add it with the weight it has at the ticker's current time
+                weight = 0.5 ** ((state[2] - when) / half_life)
+                state[0] += score * weight
+                state[1] += weight
+
+            daily = self.daily.setdefault((stock, day), [0, 0.0, np.nan])
+            daily[0] += 1
+            daily[1] += score
+            daily[2] = state[0] / state[1]
+            touched[(stock, day)] = daily
+
+        aggregates = pd.DataFrame(
+            [(stock, day, total / count, count, decayed) for (stock, day), (count, total, decayed) in touched.items()],
+            columns=AGGREGATE_COLUMNS,
+        )
+        return batch, aggregates
+
+    def daily_aggregates(self):
+        """
+        Get the current aggregate table of every ticker and day seen so far.
+
+        Returns:
+            pd.DataFrame: AGGREGATE_COLUMNS, sorted by stock and date. 'sentiment_score' is
+            the daily mean, as in aggregate_sentiments.normalize_dates.
+        """
+        rows = [(stock, day, total / count, count, decayed) for (stock, day), (count, total, decayed) in self.daily.items()]
+        aggregates = pd.DataFrame(rows, columns=AGGREGATE_COLUMNS)
+        return aggregates.sort_values(['stock', 'date'], ignore_index=True)
+
+    def run(self, batches):
+        """
+        Process a feed of micro-batches as it arrives.
+
+        Args:
+            batches: Iterable of records or lists of records, e.g. tail_csv(...).
+
+        Yields:
+            tuple: (scored records, updated aggregate rows, milliseconds from receiving the
+            batch to its updated aggregates)
+        """
+        for batch in batches:
+            start_time = time.perf_counter()
+            scored, aggregates = self.update(batch)
+            yield scored, aggregates, (time.perf_counter() - start_time) * 1000
+
+    async def arun(self, batches):
+        """
+        Async version of run() for async feeds, e.g. socket_batches(...).
+
+        Args:
+            batches: Async iterable of records or lists of records.
+
+        Yields:
+            tuple: (scored records, updated aggregate rows, latency in milliseconds)
+        """
+        async for batch in batches:
+            start_time = time.perf_counter()
+            scored, aggregates = self.update(batch)
+            yield scored, aggregates, (time.perf_counter() - start_time) * 1000
+
+
+def tail_csv(csv_path, poll_interval=0.5, from_start=True, idle_timeout=None):
+    """
+    Follow a CSV file that another process appends headline rows to, like `tail -f`.
+    Stands in for a live feed. The file's first line is its header; if the file is still
+    empty when it is opened, rows are read once the writer has written the header.
+
+    Args:
+        csv_path (str): Path to the CSV file.
+        poll_interval (float): Seconds to wait between checks for new rows.
+        from_start (bool): Replay the rows already in the file before following it.
+        idle_timeout (float): Stop after this many seconds without new rows (default: never).
+
+    Yields:
+        list: The complete rows (dicts keyed by the header) appended since the last poll.
+    """
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        pending = f.read()
+        if not from_start:
+            # Keep the header, if it is there yet, and skip the rows already in the file
+            header_line, newline, _ = pending.partition('\n')
+            pending = header_line + newline
+
+        header = None
+        idle_since = time.monotonic()
+        while True:
+            # Only parse up to the last newline; a partially written row waits for the next poll
+            complete, _, pending = pending.rpartition('\n')
+            if complete and header is None:
+                header_line, _, complete = complete.partition('\n')
+                header = next(csv.reader([header_line]))
+                if not any(header):
+                    raise ValueError(f"The first line of {csv_path} is not a CSV header.")
+                idle_since = time.monotonic()
+            if complete:
+                idle_since = time.monotonic()
+                yield list(csv.DictReader(io.StringIO(complete + '\n'), fieldnames=header))
+            elif idle_timeout is not None and time.monotonic() - idle_since > idle_timeout:
+                return
+            else:
+                time.sleep(poll_interval)
+            pending += f.read()
+
+
+async def socket_batches(host, port, max_batch=500, max_wait=0.05):
+    """
+    Read newline-delimited JSON headline records from a TCP socket and group them into
+    micro-batches. Stands in for a live feed, e.g. `nc -lk 9000` fed from another shell.
+
+    A batch is handed on once it holds `max_batch` records or `max_wait` seconds after its
+    first record arrived, whichever comes first.
+
+    Args:
+        host (str): Host to connect to.
+        port (int): Port to connect to.
+        max_batch (int): Largest number of records per batch.
+        max_wait (float): Longest time in seconds a record waits for its batch to fill.
+
+    Yields:
+        list: Records (dicts) in arrival order.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        batch = []
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+            try:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+            except asyncio.TimeoutError:
+                line = None
+
+            if line:
+                if line.strip():
+                    batch.append(json.loads(line))
+                    if deadline is None:
+                        deadline = time.monotonic() + max_wait
+            if batch and (line is None or line == b'' or len(batch) >= max_batch or time.monotonic() >= deadline):
+                yield batch
+                batch = []
+                deadline = None
+            if line == b'':
+                return
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def print_updates(updates):
+    """
+    Print the aggregate rows and latency of each processed batch.
+
+    Args:
+        updates: Output of SentimentStream.run().
+
+    Returns:
+        None
+    """
+    for scored, aggregates, latency in updates:
+        print(f"Scored {len(scored)} headlines, updated {len(aggregates)} ticker-days in {latency:.1f} ms")
+        print(aggregates.to_string(index=False))
+
+
+if __name__ == '__main__':
+    # Follow a headline feed file (default: data/live_feed/headlines.csv) until interrupted
+    feed_file = sys.argv[1] if len(sys.argv) > 1 else os.path.join('data', 'live_feed', 'headlines.csv')
+    print_updates(SentimentStream().run(tail_csv(feed_file)))
@@ -1,4 +1,3 @@
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 import pandas as pd
 import os
 import matplotlib.pyplot as plt
@@ -8,19 +7,16 @@ from gensim.models import LdaModel
 import pandas as pd
 import nltk
 from nltk.corpus import stopwords
+from data_store import load_news_data
+from sentiment_scoring import score_headlines
 import matplotlib.pyplot as plt
-nltk.download('stopwords')
-print("Stopwords downloaded.")
 
 def perform_sentiment_analysis(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the headline column from the cleaned data store
+    df = load_news_data(file_path, columns=['headline'])
 
-    # Initialize VADER Sentiment Analyzer
-    analyzer = SentimentIntensityAnalyzer()
-
-    # Step 1: Perform sentiment analysis on the headlines
-    df['sentiment_score'] = df['headline'].apply(lambda x: analyzer.polarity_scores(x)['compound'])
+    # Step 1: Perform VADER sentiment analysis on the headlines (cached scores are reused)
+    df['sentiment_score'] = score_headlines(df['headline'], implementation='array')['compound']
 
     # Step 2: Classify sentiment as Positive, Negative, or Neutral
     df['sentiment'] = df['sentiment_score'].apply(
@@ -48,8 +44,8 @@ def perform_sentiment_analysis(file_path):
     plt.close()  # Close the plot to free up memory
 
 def perform_topic_modeling(file_path):
-    # Load the CSV file into a pandas DataFrame
-    df = pd.read_csv(file_path)
+    # Load the headline column from the cleaned data store
+    df = load_news_data(file_path, columns=['headline'])
     print("file is here")
 
     # Ensure there are no missing values in the 'headline' column
@@ -104,8 +100,13 @@ def perform_topic_modeling(file_path):
     os.makedirs('results/text_analysis', exist_ok=True)
     plt.savefig('results/text_analysis/topic_modeling_word_freq.png', dpi=300)
 
-# Define the file path
-file_path = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
+if __name__ == '__main__':
+    # Stopwords used by the topic modeling
+    nltk.download('stopwords')
+    print("Stopwords downloaded.")
+
+    # Define the file path
+    file_path = os.path.join('cleaned_data', 'raw_analyst_ratings', 'raw_analyst_ratings.csv')
 
-# Call the function to perform topic modeling
-perform_sentiment_analysis(file_path)
\ No newline at end of file
+    # Call the function to perform topic modeling
+    perform_sentiment_analysis(file_path)
\ No newline at end of file
@@ -3,6 +3,7 @@ import os
 import matplotlib.pyplot as plt
 from dateutil import parser
 import seaborn as sns
+from data_store import load_news_data
 
 def analyze_publication_frequency(file_path, timestamp_column='date', threshold_factor=3):
     """
@@ -19,8 +20,8 @@ def analyze_publication_frequency(file_path, timestamp_column='date', threshold_
     # Create the 'results/time_series_analysis' folder if it doesn't exist
     os.makedirs('results/time_series_analysis', exist_ok=True)
 
-    # Load the dataset
-    df = pd.read_csv(file_path)
+    # Load the timestamp column from the cleaned data store
+    df = load_news_data(file_path, columns=[timestamp_column])
 
     df[timestamp_column] = pd.to_datetime(df[timestamp_column], errors='coerce')
 
@@ -29,10 +30,13 @@ def analyze_publication_frequency(file_path, timestamp_column='date', threshold_
         print(f"Error: '{timestamp_column}' column not found in the dataset.")
         return
     
+    # Rows without a valid timestamp can't be placed in time
+    df = df.dropna(subset=[timestamp_column])
+
     # Extract useful time-based features
     df['date'] = pd.to_datetime(df[timestamp_column])
-    df['hour'] = df[timestamp_column].dt.hour
-    df['day_of_week'] = df[timestamp_column].dt.day_name()
+    df['hour'] = df[timestamp_column].dt.hour.astype('int32')
+    df['day_of_week'] = df[timestamp_column].dt.day_name().astype('category')
 
     # 1. Publication frequency over time
     print("Analyzing publication frequency over time...")
@@ -0,0 +1,58 @@
+import numpy as np
+
+# Hour of the day (in the wall-clock time of the news timestamps, US/Eastern for the
+# analyst-ratings feed) from which a headline counts towards the next trading session
+DEFAULT_CUTOFF_HOUR = 16
+
+
+def session_calendar(price_dates):
+    """
+    Build a ticker's trading calendar: the distinct days it has a price row for.
+
+    Args:
+        price_dates: Dates of the ticker's price rows (any order, any time of day).
+
+    Returns:
+        np.ndarray: Sorted distinct trading days as datetime64[ns], without NaT.
+    """
+    days = np.asarray(price_dates, dtype='datetime64[ns]').astype('datetime64[D]')
+    return np.unique(days[~np.isnat(days)]).astype('datetime64[ns]')
+
+
+def effective_dates(timestamps, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+    """
+    Get the first calendar day a headline can move the price: its own day if it was
+    published before the cutoff hour, the next day otherwise.
+
+    Args:
+        timestamps: Headline timestamps (date-only values count as midnight).
+        cutoff_hour (float): Hour of the day from which headlines count for the next day.
+
+    Returns:
+        np.ndarray: Days as datetime64[ns], NaT where the timestamp is missing.
+    """
+    timestamps = np.asarray(timestamps, dtype='datetime64[ns]')
+    days = timestamps.astype('datetime64[D]')
+    after_cutoff = (timestamps - days) >= np.timedelta64(int(cutoff_hour * 3600 * 1e9), 'ns')
+    return (days + after_cutoff.astype('timedelta64[D]')).astype('datetime64[ns]')
+
+
+def next_sessions(timestamps, sessions, cutoff_hour=DEFAULT_CUTOFF_HOUR):
+    """
+    Map headline timestamps to their effective trading session: the first session on or
+    after the headline's effective date. Weekend, holiday and after-hours headlines go to
+    the next open instead of being dropped.
+
+    Args:
+        timestamps: Headline timestamps.
+        sessions (np.ndarray): Trading calendar from session_calendar.
+        cutoff_hour (float): Hour of the day from which headlines count for the next day.
+
+    Returns:
+        np.ndarray: Position of each headline's session in `sessions`, -1 for headlines
+        without a timestamp or after the last session.
+    """
+    days = effective_dates(timestamps, cutoff_hour)
+    positions = np.searchsorted(sessions, days, side='left')
+    positions[(positions >= len(sessions)) | np.isnat(days)] = -1
+    return positions
@@ -1,7 +1,7 @@
 import os
 import pandas as pd
 import matplotlib.pyplot as plt
-import talib
+from feature_store import IndicatorStore
 
 def plot_technical_indicators(file_path, output_folder):
     """
@@ -14,22 +14,24 @@ def plot_technical_indicators(file_path, output_folder):
     Returns:
         None
     """
-    # Load the CSV file into a DataFrame
-    df = pd.read_csv(file_path, parse_dates=['Date'], index_col='Date')
+    # Load the price data together with its stored indicators
+    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
+    store = IndicatorStore(file_path)
+    df = store.prices.copy()
 
     # Ensure necessary columns are present
-    required_columns = ['Open', 'High', 'Low', 'Close', 'Volume']
     if not all(col in df.columns for col in required_columns):
         raise ValueError(f"File '{file_path}' is missing required columns.")
     
-    # Calculate technical indicators using TA-Lib
-    df['SMA_50'] = talib.SMA(df['Close'], timeperiod=50)  # 50-day Simple Moving Average
-    df['SMA_200'] = talib.SMA(df['Close'], timeperiod=200)  # 200-day Simple Moving Average
-    df['EMA_50'] = talib.EMA(df['Close'], timeperiod=50)  # 50-day Exponential Moving Average
-    df['RSI'] = talib.RSI(df['Close'], timeperiod=14)  # 14-day Relative Strength Index
-    macd, macd_signal, _ = talib.MACD(df['Close'], fastperiod=12, slowperiod=26, signalperiod=9)  # MACD
+    # Read the technical indicators from the indicator store (computed on first use)
+    df['SMA_50'] = store.get('SMA', timeperiod=50)  # 50-day Simple Moving Average
+    df['SMA_200'] = store.get('SMA', timeperiod=200)  # 200-day Simple Moving Average
+    df['EMA_50'] = store.get('EMA', timeperiod=50)  # 50-day Exponential Moving Average
+    df['RSI'] = store.get('RSI', timeperiod=14)  # 14-day Relative Strength Index
+    macd, macd_signal, _ = store.get('MACD', fastperiod=12, slowperiod=26, signalperiod=9)  # MACD
     df['MACD'] = macd
     df['MACD_Signal'] = macd_signal
+    store.save()  # Persist newly computed indicators in one write
 
     # Create the plots
     stock_name = os.path.splitext(os.path.basename(file_path))[0]
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The analysis modules import each other as top-level modules (e.g. from data_store import ...)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
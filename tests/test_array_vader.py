@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+vader = pytest.importorskip('vaderSentiment.vaderSentiment')
+
+from array_vader import ArrayVader
+
+# Largest accepted difference between the array scorer's and vaderSentiment's scores
+TOLERANCE = 1e-4
+
+# Headlines exercising each of VADER's rules, grouped by rule
+HEADLINES = {
+    'plain': [
+        'Apple shares rise after strong quarterly earnings',
+        'Tesla recalls vehicles over safety defect',
+        'Microsoft to report results on Tuesday',
+        '',
+    ],
+    'negation': [
+        'Analysts are not happy with the guidance',
+        "Investors aren't worried about the slowdown",
+        'Nvidia never disappoints on revenue',
+        'Without doubt the best quarter in years',
+        'Results were not bad at all',
+    ],
+    'but': [
+        'Revenue beat estimates but margins were terrible',
+        'Weak outlook, but the buyback is great news',
+        'Good product but bad timing but great team',
+    ],
+    'idioms': [
+        'The new chip is the bomb',
+        'Management has a lot of work ahead, kind of disappointing',
+        'Sales are the shit this quarter',
+        'Shares cut the mustard after the upgrade',
+    ],
+    'caps': [
+        'Amazon stock is GREAT today',
+        'HUGE LOSS for investors',
+        'Meta posts TERRIBLE results, shares fall',
+    ],
+    'punctuation': [
+        'Great news for shareholders!!!',
+        'Is this a good time to buy???',
+        'Record profits!?',
+        'Shares plunge... again!',
+        'Great results :) buyers love it',
+    ],
+    'boosters': [
+        'Extremely strong demand for GPUs',
+        'Slightly better than expected',
+        'Incredibly bad week for tech stocks',
+        'The stock barely moved',
+    ],
+}
+
+
+@pytest.mark.parametrize('rule', sorted(HEADLINES))
+def test_scores_match_vader_sentiment(rule):
+    headlines = pd.Series(HEADLINES[rule], dtype=object)
+    analyzer = vader.SentimentIntensityAnalyzer()
+
+    array_scores = ArrayVader().polarity_scores(headlines)
+    vader_scores = pd.DataFrame([analyzer.polarity_scores(text) for text in headlines])[array_scores.columns]
+
+    np.testing.assert_allclose(array_scores.to_numpy(), vader_scores.to_numpy(), rtol=0, atol=TOLERANCE)
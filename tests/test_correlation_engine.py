@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from correlation_engine import RollingCorrelation, lagged_correlations, masked_pearson, rolling_correlations
+
+# Largest accepted difference to pandas' correlation
+TOLERANCE = 1e-9
+
+
+def synthetic_matrices(days=300, seed=0):
+    """Sentiment and returns for six tickers with gaps, late starts and flat stretches."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=days)
+    tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF']
+    returns = pd.DataFrame(rng.normal(0.0, 0.02, (days, len(tickers))), index=dates, columns=tickers)
+    sentiment = pd.DataFrame(rng.uniform(-1, 1, (days, len(tickers))), index=dates, columns=tickers)
+    # News on about 60% of the days, except for a ticker with news every day
+    present = rng.random((days, len(tickers))) < 0.6
+    present[:, 5] = True
+    sentiment = sentiment.where(present)
+    # Sentiment leading returns by three days
+    returns['AAA'] += 0.02 * sentiment['AAA'].shift(3).fillna(0.0)
+    # Late listing and a gap in the returns
+    returns.iloc[:80, 1] = np.nan
+    returns.iloc[150:170, 1] = np.nan
+    # Constant sentiment on every day
+    sentiment['CCC'] = sentiment['CCC'].mask(sentiment['CCC'].notna(), 0.5)
+    # Constant sentiment except for day 10, whose return is missing for lags 0..10
+    sentiment['DDD'] = np.nan
+    sentiment.iloc[100:140, 3] = 0.25
+    sentiment.iloc[10, 3] = -0.75
+    returns.iloc[10:21, 3] = np.nan
+    # Flat returns, and flat stretches in an otherwise varying series
+    returns['EEE'] = 0.001
+    returns.iloc[200:230, 5] = 0.013
+    sentiment.iloc[100:140, 1] = 0.5
+    return sentiment, returns
+
+
+def pair_correlation(x, y):
+    """Correlation over the common days with pandas; NaN if either series is flat there."""
+    both = x.notna() & y.notna()
+    x, y = x[both], y[both]
+    if x.nunique() < 2 or y.nunique() < 2:
+        return np.nan, len(x)
+    return x.corr(y), len(x)
+
+
+@pytest.mark.parametrize('max_lag', [0, 5, 12])
+def test_lag_sweep_matches_shift_and_corr(max_lag):
+    sentiment, returns = synthetic_matrices()
+
+    correlations, _, observations, _ = lagged_correlations(sentiment, returns, max_lag=max_lag)
+
+    aligned = sentiment.reindex(returns.index)
+    for lag in range(-max_lag, max_lag + 1):
+        shifted = aligned.shift(lag)
+        expected, counts = zip(*(pair_correlation(shifted[ticker], returns[ticker]) for ticker in returns.columns))
+        np.testing.assert_allclose(correlations[lag].to_numpy(), expected, rtol=0, atol=TOLERANCE)
+        np.testing.assert_array_equal(observations[lag].to_numpy(), counts)
+
+
+def test_flat_series_have_no_correlation():
+    sentiment, returns = synthetic_matrices()
+
+    correlations, p_values, _, best_lags = lagged_correlations(sentiment, returns, max_lag=12)
+
+    assert correlations.loc[['CCC', 'EEE']].isna().all().all()
+    assert p_values.loc[['CCC', 'EEE']].isna().all().all()
+    assert correlations.loc['DDD', 0:10].isna().all()
+    assert correlations.loc['DDD', -10:-1].notna().all()
+    assert best_lags.set_index('stock').loc['AAA', 'best_lag'] == 3
+
+
+@pytest.mark.parametrize('constant', [0.3, 0.7, 1e6 + 0.1])
+def test_masked_pearson_flat_column_has_no_correlation(constant):
+    rng = np.random.default_rng(1)
+    x = rng.normal(size=(50, 3))
+    y = rng.normal(size=(50, 3))
+    x[::4, 0] = np.nan
+    # A flat column whose value isn't exactly representable, on the present rows of each side
+    x[:, 1] = constant
+    y[:, 2] = constant
+    y[7, 2] = np.nan
+
+    r, p, n = masked_pearson(x, y)
+
+    both = np.isfinite(x[:, 0]) & np.isfinite(y[:, 0])
+    expected = stats.pearsonr(x[both, 0], y[both, 0])
+    np.testing.assert_allclose([r[0], p[0]], [expected.statistic, expected.pvalue], rtol=0, atol=TOLERANCE)
+    assert np.isnan(r[1:]).all()
+    assert np.isnan(p[1:]).all()
+    assert n.tolist() == [both.sum(), 50, 49]
+
+
+def reference_rolling(x, y, window, min_periods):
+    """pd.Series.rolling(window).corr, with NaN where either series is flat over the window."""
+    both = x.notna() & y.notna()
+
+    def flat(values):
+        rolling = values.where(both).rolling(window, min_periods=1)
+        return rolling.max() == rolling.min()
+
+    return x.rolling(window, min_periods=min_periods).corr(y).mask(flat(x) | flat(y))
+
+
+@pytest.mark.parametrize('window, min_periods', [(20, None), (20, 5), (60, 20)])
+def test_rolling_correlations_match_pandas(window, min_periods):
+    sentiment, returns = synthetic_matrices()
+
+    correlations, _ = rolling_correlations(sentiment, returns, window=window, min_periods=min_periods)
+
+    aligned = sentiment.reindex(returns.index)
+    expected = pd.DataFrame({ticker: reference_rolling(aligned[ticker], returns[ticker], window, min_periods)
+                             for ticker in returns.columns})
+    np.testing.assert_allclose(correlations.to_numpy(), expected.to_numpy(), rtol=0, atol=TOLERANCE)
+
+
+def test_rolling_append_continues_the_history():
+    sentiment, returns = synthetic_matrices()
+    aligned = sentiment.reindex(returns.index)
+
+    full, _ = rolling_correlations(sentiment, returns, window=20, min_periods=5)
+    engine = RollingCorrelation(window=20, min_periods=5)
+    parts = [engine.append(aligned.iloc[start:stop], returns.iloc[start:stop]) for start, stop in [(0, 137), (137, 138), (138, None)]]
+
+    pd.testing.assert_frame_equal(pd.concat(parts), full)
@@ -0,0 +1,59 @@
+import numpy as np
+import pandas as pd
+
+from correlation_resampling import resampled_significance
+
+
+def synthetic_matrices(days=250, seed=0):
+    """Sentiment and returns for five tickers with gaps and one ticker with too few days."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2021-01-01', periods=days)
+    tickers = ['AAA', 'BBB', 'CCC', 'DDD', 'EEE']
+    sentiment = pd.DataFrame(rng.uniform(-1, 1, (days, len(tickers))), index=dates, columns=tickers)
+    sentiment = sentiment.where(rng.random((days, len(tickers))) < 0.7)
+    returns = pd.DataFrame(rng.standard_t(3, (days, len(tickers))) * 0.01, index=dates, columns=tickers)
+    returns['AAA'] += 0.01 * sentiment['AAA'].fillna(0.0)
+    returns.iloc[:100, 2] = np.nan
+    # Only two common days
+    returns.iloc[2:, 4] = np.nan
+    sentiment.iloc[:2, 4] = 0.5
+    return sentiment, returns
+
+
+def test_results_do_not_depend_on_the_number_of_workers():
+    sentiment, returns = synthetic_matrices()
+
+    single = resampled_significance(sentiment, returns, n_resamples=999, seed=7, workers=1, chunk_size=128)
+    pooled = resampled_significance(sentiment, returns, n_resamples=999, seed=7, workers=4, chunk_size=128)
+
+    pd.testing.assert_frame_equal(single, pooled)
+    assert single['ci_low'].iloc[:4].notna().all()
+    assert single['permutation_p_value'].iloc[:4].notna().all()
+
+
+def test_seed_changes_the_resamples_and_short_tickers_get_nan():
+    sentiment, returns = synthetic_matrices()
+
+    first = resampled_significance(sentiment, returns, n_resamples=199, seed=1, workers=1)
+    second = resampled_significance(sentiment, returns, n_resamples=199, seed=2, workers=1)
+
+    pd.testing.assert_series_equal(first['correlation'], second['correlation'])
+    assert not np.allclose(first['ci_low'].iloc[:4], second['ci_low'].iloc[:4])
+    assert first.iloc[4][['correlation', 'ci_low', 'ci_high', 'permutation_p_value']].isna().all()
+    assert first['observations'].iloc[4] == 2
+    assert first['block_length'].iloc[4] == 0
+
+
+def test_correlated_ticker_is_significant_and_inside_its_interval():
+    sentiment, returns = synthetic_matrices()
+
+    table = resampled_significance(sentiment, returns, n_resamples=999, seed=3, workers=1).set_index('stock')
+
+    common = sentiment.notna() & returns.notna()
+    assert table['observations'].tolist() == common.sum().tolist()
+    # AAA's returns follow its sentiment; the others are independent noise
+    assert table.loc['AAA', 'permutation_p_value'] <= 0.01
+    assert (table.loc[['BBB', 'CCC', 'DDD'], 'permutation_p_value'] > 0.01).all()
+    for stock in ['AAA', 'BBB', 'CCC', 'DDD']:
+        row = table.loc[stock]
+        assert row['ci_low'] <= row['correlation'] <= row['ci_high']
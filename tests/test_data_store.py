@@ -0,0 +1,47 @@
+import shutil
+
+import pandas as pd
+
+from data_store import load_cleaned_data, load_news_data, object_memory, save_cleaned_data, store_path
+
+
+def test_csv_fallback_coerces_malformed_dates(tmp_path):
+    csv_path = tmp_path / 'prices.csv'
+    csv_path.write_text("Date,Close\n2024-01-02,10.0\nnot a date,11.0\n2024-01-04,12.0\n")
+
+    data = load_cleaned_data(str(csv_path))
+
+    assert data['Date'].dtype.kind == 'M'
+    assert data['Date'].isna().tolist() == [False, True, False]
+    assert data['Close'].tolist() == [10.0, 11.0, 12.0]
+
+
+def test_parquet_copy_matches_csv_fallback(tmp_path):
+    csv_path = str(tmp_path / 'prices.csv')
+    data = pd.DataFrame({'Date': ['2024-01-02', 'bad', '2024-01-04'], 'Close': [10.0, 11.0, 12.0]})
+    save_cleaned_data(data, csv_path)
+
+    from_parquet = load_cleaned_data(csv_path)
+    shutil.rmtree(store_path(csv_path))
+    from_csv = load_cleaned_data(csv_path)
+
+    pd.testing.assert_frame_equal(from_parquet, from_csv, check_dtype=False)
+
+
+def test_news_memory_report_measures_the_object_layout(tmp_path, capsys):
+    csv_path = str(tmp_path / 'news.csv')
+    rows = 2000
+    news = pd.DataFrame({
+        'headline': [f'Headline number {i}' for i in range(rows)],
+        'publisher': ['Benzinga Insights', 'Lisa Levin'] * (rows // 2),
+        'date': pd.date_range('2020-01-01', periods=rows, freq='h'),
+        'stock': ['AAPL', 'TSLA', 'MSFT', 'NVDA'] * (rows // 4),
+    })
+    save_cleaned_data(news, csv_path)
+
+    data = load_news_data(csv_path)
+
+    before = news.astype({'headline': object, 'publisher': object, 'stock': object}).memory_usage(deep=True).sum()
+    assert object_memory(load_cleaned_data(csv_path)) == before
+    assert f"{before / 1e6:.1f} MB -> {data.memory_usage(deep=True).sum() / 1e6:.1f} MB" in capsys.readouterr().out
+    assert data['stock'].dtype == 'category'
@@ -0,0 +1,53 @@
+import pandas as pd
+import pytest
+from dateutil import parser
+
+from date_parsing import parse_timestamps
+
+# Timestamps in every layout of TIMESTAMP_FORMATS, with and without UTC offsets
+FAST_PATH_TIMESTAMPS = [
+    '2020-06-05 10:30:54-04:00',
+    '2020-06-05 10:30:54+0530',
+    '2020-06-05 10:30:54+05',
+    '2020-06-05 23:59:59Z',
+    '2020-05-22 00:00:00',
+    '2020-05-21T16:05:00',
+    '2020-05-21T16:05:00+00:00',
+    '2020-05-22',
+    '  2020-05-23 ',
+]
+
+# Timestamps only dateutil's fuzzy parser understands
+FUZZY_TIMESTAMPS = [
+    'May 20, 2020 9:15 AM',
+    'Published 2020-05-19 at 09:00',
+    '5/18/2020 08:01:02 -0400',
+    '2020-05-17 8:01',
+]
+
+
+def dateutil_timestamps(values):
+    """The loader's original per-row parse."""
+    return pd.to_datetime(values.apply(lambda x: parser.parse(x, fuzzy=True, ignoretz=True)))
+
+
+@pytest.mark.parametrize('timestamp', FAST_PATH_TIMESTAMPS + FUZZY_TIMESTAMPS)
+def test_each_layout_matches_dateutil(timestamp):
+    values = pd.Series([timestamp])
+
+    parsed, fallback_rows = parse_timestamps(values)
+
+    assert parsed.iloc[0] == dateutil_timestamps(values).iloc[0]
+    assert fallback_rows == (timestamp in FUZZY_TIMESTAMPS)
+
+
+def test_column_matches_dateutil_and_counts_fallback_rows():
+    # Repeated strings are parsed once but counted on every row
+    timestamps = FAST_PATH_TIMESTAMPS * 3 + FUZZY_TIMESTAMPS * 2
+    values = pd.Series(timestamps, index=range(100, 100 + len(timestamps)), name='date')
+
+    parsed, fallback_rows = parse_timestamps(values)
+
+    pd.testing.assert_series_equal(parsed, dateutil_timestamps(values), check_dtype=False)
+    assert parsed.dtype.kind == 'M'
+    assert fallback_rows == 2 * len(FUZZY_TIMESTAMPS)
@@ -0,0 +1,57 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import save_cleaned_data
+from feature_store import IndicatorStore
+
+
+@pytest.fixture
+def price_file(tmp_path):
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 120)))
+    prices = pd.DataFrame({
+        'Date': pd.bdate_range('2022-01-03', periods=120).strftime('%Y-%m-%d'),
+        'Open': close * 0.99, 'High': close * 1.01, 'Low': close * 0.98, 'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, 120),
+    })
+    csv_path = str(tmp_path / 'test_historical_data.csv')
+    save_cleaned_data(prices, csv_path)
+    return csv_path
+
+
+def stored_files(store):
+    return sorted(os.listdir(store.folder)) if os.path.isdir(store.folder) else []
+
+
+def test_indicators_are_written_once_on_save(price_file, tmp_path):
+    store = IndicatorStore(price_file, store_folder=str(tmp_path / 'store'), backend='numpy')
+    sma = store.get('SMA', timeperiod=10)
+    macd = store.get('MACD', fastperiod=12, slowperiod=26, signalperiod=9)
+    assert stored_files(store) == []
+
+    store.save()
+    reopened = IndicatorStore(price_file, store_folder=str(tmp_path / 'store'), backend='numpy')
+
+    assert stored_files(store) == [os.path.basename(store.path)]
+    pd.testing.assert_series_equal(reopened.get('SMA', timeperiod=10), sma)
+    for stored, computed in zip(reopened.get('MACD', fastperiod=12, slowperiod=26, signalperiod=9), macd):
+        pd.testing.assert_series_equal(stored, computed)
+    # Both were served from the file, so there is nothing new to save
+    assert not reopened.unsaved
+
+
+def test_save_keeps_other_backends_and_drops_stale_files(price_file, tmp_path):
+    store = IndicatorStore(price_file, store_folder=str(tmp_path / 'store'), backend='numpy')
+    os.makedirs(store.folder)
+    stale = os.path.join(store.folder, 'numpy-0.0.0-oldpricehash.parquet')
+    other_backend = os.path.join(store.folder, 'talib-0.4.0-oldpricehash.parquet')
+    for path in (stale, other_backend):
+        pd.DataFrame({'x': [1.0]}).to_parquet(path)
+
+    store.get('RSI', timeperiod=14)
+    store.save()
+
+    assert stored_files(store) == sorted([os.path.basename(store.path), os.path.basename(other_backend)])
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from feature_store import PRICE_COLUMNS
+from indicator_backends import INDICATORS, get_backend
+
+talib = pytest.importorskip('talib')
+
+# Largest accepted difference to TA-Lib, relative to the value (or absolute below 1)
+TOLERANCE = 1e-8
+
+# Parameter sets compared per indicator: the project's own settings, TA-Lib's defaults
+# and short or long windows
+PARAMETER_SETS = {
+    'SMA': [{'timeperiod': 20}, {'timeperiod': 50}, {'timeperiod': 200}, {'timeperiod': 2}],
+    'EMA': [{'timeperiod': 20}, {'timeperiod': 50}, {'timeperiod': 2}, {}],
+    'RSI': [{'timeperiod': 14}, {'timeperiod': 2}, {'timeperiod': 50}],
+    'MACD': [{'fastperiod': 12, 'slowperiod': 26, 'signalperiod': 9}, {'fastperiod': 26, 'slowperiod': 12, 'signalperiod': 1},
+             {'fastperiod': 5, 'slowperiod': 35, 'signalperiod': 5}],
+    'BBANDS': [{'timeperiod': 20, 'nbdevup': 2, 'nbdevdn': 2, 'matype': 0}, {'timeperiod': 5, 'nbdevup': 1.5, 'nbdevdn': 3}],
+    'ATR': [{'timeperiod': 14}, {'timeperiod': 1}, {'timeperiod': 30}],
+    'STOCH': [{'fastk_period': 14, 'slowk_period': 3, 'slowd_period': 3}, {}, {'fastk_period': 1, 'slowk_period': 1, 'slowd_period': 1}],
+}
+
+
+def synthetic_prices(seed=0):
+    """Price series covering the edge cases of the indicators, by case name."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 1000)))
+    spread = close * rng.uniform(0.0, 0.03, 1000)
+    walk = {'Open': close, 'High': close + spread, 'Low': close - spread, 'Close': close, 'Volume': rng.uniform(1e6, 1e7, 1000)}
+
+    leading = {column: values.copy() for column, values in walk.items()}
+    for values in leading.values():
+        values[:10] = np.nan
+    flat = {column: np.full(300, 50.0) for column in PRICE_COLUMNS}
+    short = {column: values[:15] for column, values in walk.items()}
+    # The walk at a cent, where the band variance is far below 1e-8
+    penny = {column: values / 10_000 if column != 'Volume' else values for column, values in walk.items()}
+    return {'random walk': walk, 'leading NaNs': leading, 'flat prices': flat, 'short series': short, 'penny stock': penny}
+
+
+@pytest.mark.parametrize('case', ['random walk', 'leading NaNs', 'flat prices', 'short series', 'penny stock'])
+@pytest.mark.parametrize('indicator', list(PARAMETER_SETS))
+def test_numpy_backend_matches_talib(case, indicator):
+    reference, candidate = get_backend('talib'), get_backend('numpy')
+    prices = synthetic_prices()[case]
+    inputs = [prices[column] for column in INDICATORS[indicator][0]]
+
+    for params in PARAMETER_SETS[indicator]:
+        expected = reference.compute(indicator, *inputs, **params)
+        actual = candidate.compute(indicator, *inputs, **params)
+        for output, values, reference_values in zip(INDICATORS[indicator][1], actual, expected):
+            label = f"{indicator}{params} {output}"
+            np.testing.assert_array_equal(np.isnan(values), np.isnan(reference_values), err_msg=f"{label}: warm-up differs")
+            present = ~np.isnan(reference_values)
+            difference = np.abs(values[present] - reference_values[present]) / np.maximum(np.abs(reference_values[present]), 1.0)
+            assert difference.max(initial=0.0) <= TOLERANCE, label
+
+
+def test_unknown_indicators_and_backends_are_rejected():
+    close = synthetic_prices()['random walk']['Close']
+
+    with pytest.raises(ValueError):
+        get_backend('numpy').compute('ADX', close)
+    with pytest.raises(ValueError):
+        get_backend('talib').compute('ADX', close)
+    with pytest.raises(ValueError):
+        get_backend('pandas')
@@ -0,0 +1,94 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from indicator_stream import DEFAULT_INDICATORS, STREAMING_INDICATORS, IndicatorEngine
+
+talib = pytest.importorskip('talib')
+
+# Largest accepted difference to TA-Lib for prices around 100, scaled with the price
+# level; the Bollinger bands' centered sums differ from TA-Lib's raw running sums by up to
+# a few 1e-10 there
+TOLERANCE = 1e-8
+
+# Price levels and daily volatilities of the parity tests: penny-stock prices whose band
+# variance is far below 1e-8, and prices where raw sums of squares lose many digits
+PRICE_SCALES = [(100, 0.02), (0.01, 0.02), (1.0, 0.00005), (1e5, 0.02)]
+
+# Bar after which the engine is checkpointed and restored
+CHECKPOINT_BAR = 250
+
+
+def synthetic_prices(bars=600, seed=0, level=100, volatility=0.02):
+    """Random-walk bars with a flat stretch."""
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0, volatility, bars)))
+    close[300:340] = close[299]
+    high = close * (1 + rng.uniform(0, 0.02, bars))
+    low = close * (1 - rng.uniform(0, 0.02, bars))
+    high[300:340] = low[300:340] = close[299]
+    return pd.DataFrame({'High': high, 'Low': low, 'Close': close}, index=pd.bdate_range('2020-01-01', periods=bars))
+
+
+def talib_values(prices):
+    """Every DEFAULT_INDICATORS column computed with TA-Lib over the whole history."""
+    values = {}
+    for columns, name, params in DEFAULT_INDICATORS:
+        inputs = [prices[column].to_numpy() for column in STREAMING_INDICATORS[name][1]]
+        outputs = getattr(talib, name)(*inputs, **params)
+        values.update(zip(columns, outputs if len(columns) > 1 else [outputs]))
+    return pd.DataFrame(values, index=prices.index)
+
+
+def streamed_values(prices, checkpoint_path):
+    """Stream the bars, checkpointing and restoring the engine after CHECKPOINT_BAR."""
+    engine = IndicatorEngine()
+    first = engine.catch_up('TEST', prices.iloc[:CHECKPOINT_BAR])
+    engine.save(checkpoint_path)
+    restored = IndicatorEngine.load(checkpoint_path)
+    return pd.concat([first, restored.catch_up('TEST', prices)])
+
+
+def assert_matches_talib(actual, expected, level=100):
+    for column in expected.columns:
+        a, e = actual[column].to_numpy(), expected[column].to_numpy()
+        np.testing.assert_array_equal(np.isnan(a), np.isnan(e), err_msg=f"{column}: warm-up or NaN positions differ")
+        # Oscillators are bounded by 100 whatever the price level
+        scale = 1 if column in ['RSI_14', 'Stochastic_K', 'Stochastic_D'] else level / 100
+        np.testing.assert_allclose(a[~np.isnan(e)], e[~np.isnan(e)], rtol=0, atol=TOLERANCE * scale, err_msg=column)
+
+
+@pytest.mark.parametrize('level, volatility', PRICE_SCALES)
+def test_stream_matches_talib_across_a_checkpoint(tmp_path, level, volatility):
+    prices = synthetic_prices(level=level, volatility=volatility)
+
+    actual = streamed_values(prices, str(tmp_path / 'state.json'))
+
+    assert_matches_talib(actual, talib_values(prices), level)
+    assert os.listdir(tmp_path) == ['state.json']
+
+
+def test_stream_matches_talib_with_nan_bars(tmp_path):
+    prices = synthetic_prices()
+    # Leading bars without prices are skipped; later NaN prices propagate as in TA-Lib
+    prices.iloc[:5] = np.nan
+    prices.iloc[480, prices.columns.get_loc('High')] = np.nan
+    prices.iloc[520, prices.columns.get_loc('Close')] = np.nan
+
+    actual = streamed_values(prices, str(tmp_path / 'state.json'))
+
+    expected = talib_values(prices)
+    assert_matches_talib(actual, expected)
+    # RSI keeps reporting after a NaN close, like TA-Lib
+    assert expected['RSI_14'].iloc[530:].notna().all()
+
+
+def test_bars_must_be_newer_than_the_checkpoint(tmp_path):
+    prices = synthetic_prices().iloc[:50]
+    engine = IndicatorEngine()
+    engine.catch_up('TEST', prices)
+
+    with pytest.raises(ValueError):
+        engine.update('TEST', prices.index[10], prices.iloc[10])
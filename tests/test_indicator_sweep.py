@@ -0,0 +1,81 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from indicator_sweep import indicator_sweep, parameter_grid, sweep_chunks
+
+talib = pytest.importorskip('talib')
+
+# Largest accepted difference to TA-Lib, relative to the value (or absolute below 1)
+TOLERANCE = 1e-8
+
+# Grids compared with TA-Lib, including periods longer than the series
+SWEEPS = [
+    ('SMA', {'timeperiod': [2, 3, 10, 49, 50, 200, 700]}),
+    ('EMA', {'timeperiod': [2, 3, 10, 49, 50, 200, 700]}),
+    ('RSI', {'timeperiod': [2, 5, 14, 30, 700]}),
+    ('MACD', {'fastperiod': [3, 12, 30], 'slowperiod': [10, 26, 60], 'signalperiod': [2, 9]}),
+]
+
+
+def synthetic_close(length=600, seed=0):
+    """Random walk with leading NaNs and a flat stretch long enough for RSI(2)'s averages to decay below 1e-8."""
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, length)))
+    close[:7] = np.nan
+    close[300:340] = close[299]
+    return close
+
+
+@pytest.mark.parametrize('indicator, ranges', SWEEPS)
+def test_sweep_matches_talib_per_combination(indicator, ranges):
+    close = synthetic_close()
+
+    grid, tensor = indicator_sweep(close, indicator, chunk_size=4, **ranges)
+
+    names = list(grid)
+    for position in itertools.product(*(range(len(values)) for values in grid.values())):
+        params = {name: int(grid[name][i]) for name, i in zip(names, position)}
+        expected = getattr(talib, indicator)(close, **params)
+        expected = expected if isinstance(expected, tuple) else (expected,)
+        for actual, reference in zip(tensor[position], expected):
+            np.testing.assert_array_equal(np.isnan(actual), np.isnan(reference), err_msg=f"{indicator} {params}: warm-up differs")
+            present = ~np.isnan(reference)
+            differences = np.abs(actual[present] - reference[present]) / np.maximum(np.abs(reference[present]), 1.0)
+            assert differences.max(initial=0.0) <= TOLERANCE, f"{indicator} {params}"
+
+
+def test_chunks_follow_the_grid_order():
+    close = synthetic_close()
+    ranges = {'fastperiod': [5, 12], 'slowperiod': [26, 40], 'signalperiod': [9]}
+    grid, tensor = indicator_sweep(close, 'MACD', **ranges)
+
+    chunks = list(sweep_chunks(close, 'MACD', chunk_size=3, **ranges))
+
+    combinations = np.concatenate([chunk for chunk, _ in chunks])
+    np.testing.assert_array_equal(combinations, list(itertools.product(*grid.values())))
+    np.testing.assert_array_equal(np.concatenate([values for _, values in chunks]), tensor.reshape(-1, 3, len(close)))
+
+
+def test_sweep_writes_into_a_given_array():
+    close = synthetic_close()
+    out = np.empty((3, 1, len(close)))
+
+    _, tensor = indicator_sweep(close, 'EMA', out=out, timeperiod=[5, 10, 20])
+
+    assert tensor is out
+    with pytest.raises(ValueError):
+        indicator_sweep(close, 'EMA', out=out, timeperiod=[5, 10])
+
+
+@pytest.mark.parametrize('indicator, ranges', [
+    ('ADX', {'timeperiod': [14]}),
+    ('SMA', {'fastperiod': [5]}),
+    ('SMA', {'timeperiod': []}),
+    ('SMA', {'timeperiod': [0, 5]}),
+    ('EMA', {'timeperiod': [2.5]}),
+])
+def test_invalid_grids_are_rejected(indicator, ranges):
+    with pytest.raises(ValueError):
+        parameter_grid(indicator, **ranges)
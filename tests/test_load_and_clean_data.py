@@ -0,0 +1,82 @@
+import io
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import load_cleaned_data
+from load_and_clean_data import load_and_clean_data
+from price_cleaning import clean_price_data
+
+# Seconds each fake download takes, long enough for fetches to overlap
+FETCH_DELAY = 0.2
+
+
+def raw_price_csv(seed, rows=50):
+    """A raw yfinance-style price file with a split and a negative price."""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    prices = pd.DataFrame({
+        'Date': pd.bdate_range('2023-01-02', periods=rows).strftime('%Y-%m-%d'),
+        'Open': close, 'High': close * 1.01, 'Low': close * 0.99, 'Close': close,
+        'Adj Close': close, 'Volume': rng.integers(1000, 5000, rows),
+        'Dividends': 0.0, 'Stock Splits': 0.0,
+    })
+    prices.loc[10, 'Stock Splits'] = 2.0
+    prices.loc[20, 'Low'] = -prices.loc[20, 'Low']
+    return prices.to_csv(index=False)
+
+
+class FakeSource:
+    """Serves raw files from memory after a delay, recording the most fetches at once."""
+
+    def __init__(self, files):
+        self.files = files
+        self.fetched = []
+        self.active = 0
+        self.most_active = 0
+        self._lock = threading.Lock()
+
+    def fetch(self, name, output_path):
+        with self._lock:
+            self.fetched.append(name)
+            self.active += 1
+            self.most_active = max(self.most_active, self.active)
+        time.sleep(FETCH_DELAY)
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(self.files[name])
+        with self._lock:
+            self.active -= 1
+
+
+def run(source, tmp_path, **options):
+    load_and_clean_data(source=source, datasets=sorted(source.files), fetch_workers=4, clean_workers=2,
+                        raw_folder=str(tmp_path / 'raw'), cleaned_folder=str(tmp_path / 'cleaned'),
+                        manifest_path=str(tmp_path / 'manifest.json'), **options)
+
+
+def test_fetches_overlap_and_every_file_is_cleaned(tmp_path):
+    source = FakeSource({f't{i}_historical_data': raw_price_csv(i) for i in range(6)})
+
+    run(source, tmp_path)
+
+    assert sorted(source.fetched) == sorted(source.files)
+    assert source.most_active > 1
+    for name, text in source.files.items():
+        expected, _ = clean_price_data(pd.read_csv(io.StringIO(text)))
+        actual = load_cleaned_data(str(tmp_path / 'cleaned' / f'{name}.csv'))
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+        assert (actual['Low'] >= 0).all()
+
+
+def test_incremental_run_skips_fetched_and_unchanged_files(tmp_path, capsys):
+    source = FakeSource({f't{i}_historical_data': raw_price_csv(i) for i in range(3)})
+    run(source, tmp_path, incremental=True)
+    capsys.readouterr()
+
+    run(source, tmp_path, incremental=True)
+
+    # Raw files already on disk are not fetched again
+    assert len(source.fetched) == 3
+    assert capsys.readouterr().out.count('unchanged since the last run') == 3
@@ -0,0 +1,116 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+from data_store import load_cleaned_data, store_path
+from load_and_clean_ratings import clean_ratings_file
+
+# Raw feed rows covering every timestamp layout, quoted commas and repeated headlines
+RAW_RATINGS = (
+    ',headline,url,publisher,date,stock\n'
+    '0,Stocks That Hit 52-Week Highs On Friday,https://example.com/1,Benzinga Insights,2020-06-05 10:30:54-04:00,A\n'
+    '1,"Agilent, Inc. Q2 Earnings Beat",https://example.com/2,Vick Meyer,2020-05-22 00:00:00,A\n'
+    '2,Stocks That Hit 52-Week Highs On Friday,https://example.com/3,Lisa Levin,2020-05-22,AA\n'
+    '3,Alcoa Cut To Neutral,https://example.com/4,Benzinga Newsdesk,2020-05-21T16:05:00,AA\n'
+    '4,"Apple Up 2%, Leads Tech",https://example.com/5,Benzinga Insights,"May 20, 2020 9:15 AM",AAPL\n'
+    '5,Apple Unveils New iPhone,https://example.com/6,Vick Meyer,2020-05-19 09:00:00-04:00,AAPL\n'
+    '6,Tesla Deliveries Surge,https://example.com/7,Lisa Levin,2020-05-18 08:01:02-04:00,TSLA\n'
+)
+
+# Headlines published after the first delivery of the feed, appended to the raw file
+NEW_RATINGS = (
+    '7,Tesla Raised To Buy,https://example.com/8,Vick Meyer,2020-06-08 07:00:00-04:00,TSLA\n'
+    '8,"Apple, Microsoft Lead Gains",https://example.com/9,Lisa Levin,2020-06-08 09:30:00,AAPL\n'
+)
+
+
+def clean(tmp_path, chunk_size):
+    raw_path = tmp_path / 'raw_analyst_ratings.csv'
+    raw_path.write_text(RAW_RATINGS)
+    output_folder = tmp_path / f'chunks-{chunk_size}'
+    output_folder.mkdir()
+    cleaned_path = str(output_folder / 'raw_analyst_ratings.csv')
+    manifest = {'datasets': {}}
+    rows_written = clean_ratings_file(str(raw_path), cleaned_path, manifest, chunk_size=chunk_size)
+    return cleaned_path, manifest, rows_written
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 1000])
+def test_chunked_output_equals_in_memory_output(tmp_path, chunk_size):
+    expected_path, expected_manifest, expected_rows = clean(tmp_path, None)
+    actual_path, actual_manifest, actual_rows = clean(tmp_path, chunk_size)
+
+    assert actual_rows == expected_rows == 7
+    with open(expected_path, 'rb') as expected, open(actual_path, 'rb') as actual:
+        assert actual.read() == expected.read()
+    pd.testing.assert_frame_equal(load_cleaned_data(actual_path), load_cleaned_data(expected_path))
+    assert actual_manifest == expected_manifest
+
+
+def run(raw_path, cleaned_path, manifest, **options):
+    return clean_ratings_file(str(raw_path), str(cleaned_path), manifest, **options)
+
+
+def assert_same_output(actual_path, expected_path):
+    with open(expected_path, 'rb') as expected, open(actual_path, 'rb') as actual:
+        assert actual.read() == expected.read()
+    pd.testing.assert_frame_equal(load_cleaned_data(str(actual_path)), load_cleaned_data(str(expected_path)))
+
+
+@pytest.mark.parametrize('chunk_size', [None, 2])
+def test_incremental_run_reads_only_the_appended_rows(tmp_path, chunk_size):
+    raw_path = tmp_path / 'raw_analyst_ratings.csv'
+    raw_path.write_text(RAW_RATINGS)
+    cleaned_path = tmp_path / 'cleaned.csv'
+    manifest = {'datasets': {}}
+    assert run(raw_path, cleaned_path, manifest, chunk_size=chunk_size, incremental=True) == 7
+
+    with open(raw_path, 'a') as f:
+        f.write(NEW_RATINGS)
+    assert run(raw_path, cleaned_path, manifest, chunk_size=chunk_size, incremental=True) == 2
+
+    # The new rows went into their own part, and the result equals a full rebuild
+    assert len(os.listdir(store_path(str(cleaned_path)))) == 2
+    rebuilt_path = tmp_path / 'rebuilt.csv'
+    run(raw_path, rebuilt_path, {'datasets': {}})
+    assert_same_output(cleaned_path, rebuilt_path)
+    assert manifest['datasets']['raw_analyst_ratings']['changed'] == {'AAPL': ['2020-06-08'], 'TSLA': ['2020-06-08']}
+
+
+def test_rewritten_feed_keeps_new_rows_at_the_watermark(tmp_path):
+    raw_path = tmp_path / 'raw_analyst_ratings.csv'
+    raw_path.write_text(RAW_RATINGS)
+    cleaned_path = tmp_path / 'cleaned.csv'
+    manifest = {'datasets': {}}
+    run(raw_path, cleaned_path, manifest, incremental=True)
+    assert manifest['datasets']['raw_analyst_ratings']['watermark'] == '2020-06-05T10:30:54'
+
+    # A re-delivered feed in newest-first order: one headline shares the watermark's
+    # timestamp, the row already stored at the watermark comes again
+    raw_path.write_text(
+        ',headline,url,publisher,date,stock\n'
+        '9,Agilent Price Target Raised,https://example.com/10,Vick Meyer,2020-06-05 10:30:54-04:00,A\n'
+        + RAW_RATINGS.split('\n', 1)[1]
+    )
+    assert run(raw_path, cleaned_path, manifest, incremental=True) == 1
+
+    data = load_cleaned_data(str(cleaned_path))
+    assert len(data) == 8
+    assert data['headline'].iloc[-1] == 'Agilent Price Target Raised'
+    assert (data['headline'] == 'Stocks That Hit 52-Week Highs On Friday').sum() == 2
+
+
+def test_unchanged_feed_is_skipped_unless_its_output_is_gone(tmp_path):
+    raw_path = tmp_path / 'raw_analyst_ratings.csv'
+    raw_path.write_text(RAW_RATINGS)
+    cleaned_path = tmp_path / 'cleaned.csv'
+    manifest = {'datasets': {}}
+    run(raw_path, cleaned_path, manifest, incremental=True)
+    assert run(raw_path, cleaned_path, manifest, incremental=True) == 0
+
+    os.remove(cleaned_path)
+    shutil.rmtree(store_path(str(cleaned_path)))
+    assert run(raw_path, cleaned_path, manifest, incremental=True) == 7
+    assert len(load_cleaned_data(str(cleaned_path))) == 7
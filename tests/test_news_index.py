@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from news_index import NewsIndex, match_dates, merge_on_dates
+
+# Days both sides draw from, so most dates repeat on each side
+DAYS = pd.date_range('2020-06-01', periods=8, freq='D')
+
+
+def random_frames(seed, rows=60):
+    """News-like and price-like frames with repeated dates and NaT on both sides."""
+    rng = np.random.default_rng(seed)
+    left = pd.DataFrame({'date': rng.choice(DAYS, rows), 'score': rng.normal(size=rows),
+                         'stock': rng.choice(['AAPL', 'TSLA', 'MSFT', None], rows)})
+    right = pd.DataFrame({'Date': rng.choice(DAYS[2:], rows // 3), 'Close': rng.normal(size=rows // 3)})
+    left.loc[rng.random(rows) < 0.1, 'date'] = pd.NaT
+    right.loc[[0, 5], 'Date'] = pd.NaT
+    return left, right
+
+
+@pytest.mark.parametrize('seed', [0, 1, 2])
+def test_merge_on_dates_matches_pandas_merge(seed):
+    left, right = random_frames(seed)
+
+    actual = merge_on_dates(left, right, 'date', 'Date')
+
+    # pd.merge pairs NaT with NaT; match_dates never matches a missing date
+    expected = pd.merge(left[left['date'].notna()], right, left_on='date', right_on='Date', how='inner')
+    pd.testing.assert_frame_equal(actual, expected.reset_index(drop=True)[actual.columns])
+
+
+def test_match_dates_pairs_duplicates_in_row_order():
+    left = np.array(['2020-06-02', 'NaT', '2020-06-01', '2020-06-02'], dtype='datetime64[ns]')
+    right = np.array(['2020-06-02', '2020-06-01', 'NaT', '2020-06-02'], dtype='datetime64[ns]')
+
+    left_rows, right_rows = match_dates(left, right)
+
+    assert list(zip(left_rows.tolist(), right_rows.tolist())) == [(0, 0), (0, 3), (2, 1), (3, 0), (3, 3)]
+
+
+def test_get_matches_boolean_filter():
+    news, _ = random_frames(3)
+    news_index = NewsIndex(news)
+
+    assert news_index.tickers == ['AAPL', 'MSFT', 'TSLA']
+    assert len(news_index) == news['stock'].notna().sum()
+    for ticker in news_index.tickers + ['NVDA']:
+        expected = news[news['stock'] == ticker].sort_values('date', kind='stable')
+        pd.testing.assert_frame_equal(news_index.get(ticker).reset_index(drop=True), expected.reset_index(drop=True))
+        np.testing.assert_array_equal(news_index.ticker_dates(ticker), expected['date'].to_numpy(dtype='datetime64[ns]'))
+    assert 'NVDA' not in news_index
+
+
+def test_session_mean_matches_groupby_on_sessions():
+    news, prices = random_frames(4)
+    news_index = NewsIndex(news)
+
+    for ticker in news_index.tickers:
+        actual = news_index.session_mean(ticker, 'score', prices['Date'])
+
+        rows = news[news['stock'] == ticker].sort_values('date', kind='stable')
+        rows = rows.assign(date=news_index.sessions(ticker, prices['Date'])).dropna(subset=['date'])
+        expected = rows.groupby('date')['score'].mean().reset_index()
+        pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import save_cleaned_data
+from indicator_stream import DEFAULT_INDICATORS
+from panel_indicators import PANEL_FIELDS, PANEL_INDICATORS, load_price_panel, panel_indicator, panel_indicators
+
+talib = pytest.importorskip('talib')
+
+# Largest accepted difference to TA-Lib, relative to the value (or absolute below 1)
+TOLERANCE = 1e-8
+
+
+def synthetic_panel(days=600, seed=0):
+    """
+    Price matrices with late listings, gaps, flat stretches, single missing fields and a
+    penny stock.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=days, name='date')
+    tickers = pd.Index(['AAA', 'BBB', 'CCC', 'DDD', 'EEE', 'FFF', 'GGG'], name='stock')
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, (days, len(tickers))), axis=0))
+    # GGG trades around a cent, where the band variance is far below 1e-8
+    close[:, 6] /= 10_000
+    high = close * (1 + rng.uniform(0, 0.02, close.shape))
+    low = close * (1 - rng.uniform(0, 0.02, close.shape))
+    # DDD trades flat for a stretch and EEE never moves
+    for values in (close, high, low):
+        values[250:320, 3] = close[249, 3]
+        values[:, 4] = 42.0
+    panel = {
+        'Open': pd.DataFrame(close * (1 + rng.normal(0, 0.005, close.shape)), index=dates, columns=tickers),
+        'High': pd.DataFrame(high, index=dates, columns=tickers),
+        'Low': pd.DataFrame(low, index=dates, columns=tickers),
+        'Close': pd.DataFrame(close, index=dates, columns=tickers),
+        'Volume': pd.DataFrame(rng.integers(1_000_000, 5_000_000, close.shape).astype(float), index=dates, columns=tickers),
+    }
+    for matrix in panel.values():
+        # BBB lists late, CCC has a gap and FFF lists too late to finish MACD's warm-up
+        matrix.iloc[:200, 1] = np.nan
+        matrix.iloc[300:330, 2] = np.nan
+        matrix.iloc[:days - 20, 5] = np.nan
+    # AAA misses single fields on a few days
+    panel['High'].iloc[[100, 101, 400], 0] = np.nan
+    panel['Close'].iloc[450, 0] = np.nan
+    return panel
+
+
+def talib_outputs(panel, indicator, params, ticker):
+    """TA-Lib run on the ticker's complete rows, with the mask of those rows."""
+    prices = [panel[field][ticker].to_numpy() for field in PANEL_INDICATORS[indicator][1]]
+    complete = np.logical_and.reduce([~np.isnan(values) for values in prices])
+    expected = getattr(talib, indicator)(*(values[complete] for values in prices), **params)
+    return expected if isinstance(expected, tuple) else (expected,), complete
+
+
+def assert_matches_talib(actual, expected, complete, label):
+    assert np.isnan(actual[~complete]).all(), f"{label}: value on an incomplete row"
+    actual = actual[complete]
+    np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=f"{label}: warm-up differs from TA-Lib")
+    present = ~np.isnan(expected)
+    differences = np.abs(actual[present] - expected[present]) / np.maximum(np.abs(expected[present]), 1.0)
+    assert differences.max(initial=0.0) <= TOLERANCE, label
+
+
+def test_default_indicators_match_talib_per_ticker():
+    panel = synthetic_panel()
+
+    results = panel_indicators(panel)
+
+    for columns, indicator, params in DEFAULT_INDICATORS:
+        for ticker in panel['Close'].columns:
+            expected, complete = talib_outputs(panel, indicator, params, ticker)
+            for column, reference in zip(columns, expected):
+                assert_matches_talib(results[column][ticker].to_numpy(), reference, complete, f"{column} {ticker}")
+
+
+# RSI(2)'s averages decay far below 1e-8 in DDD's flat stretch without reaching zero
+@pytest.mark.parametrize('indicator, params', [
+    ('SMA', {'timeperiod': 2}),
+    ('EMA', {'timeperiod': 50}),
+    ('RSI', {'timeperiod': 2}),
+    ('MACD', {'fastperiod': 26, 'slowperiod': 12, 'signalperiod': 5}),
+    ('BBANDS', {'timeperiod': 20, 'nbdevup': 1.5, 'nbdevdn': 3}),
+    ('ATR', {'timeperiod': 30}),
+    ('STOCH', {'fastk_period': 14, 'slowk_period': 5, 'slowd_period': 4}),
+])
+def test_other_parameters_match_talib(indicator, params):
+    panel = synthetic_panel(seed=1)
+
+    outputs = panel_indicator(panel, indicator, **params)
+
+    for ticker in panel['Close'].columns:
+        expected, complete = talib_outputs(panel, indicator, params, ticker)
+        for number, (actual, reference) in enumerate(zip(outputs, expected)):
+            assert_matches_talib(actual[ticker].to_numpy(), reference, complete, f"{indicator}[{number}] {ticker}")
+
+
+def test_price_files_load_into_aligned_matrices(tmp_path):
+    panel = synthetic_panel()
+    for ticker in ['AAA', 'BBB']:
+        prices = pd.DataFrame({field: panel[field][ticker] for field in PANEL_FIELDS}).dropna(how='all')
+        prices.insert(0, 'Date', prices.index.strftime('%Y-%m-%d'))
+        # A repeated bar keeps its last version
+        prices = pd.concat([prices, prices.iloc[[-1]].assign(Close=1.0)], ignore_index=True)
+        save_cleaned_data(prices, str(tmp_path / f'{ticker.lower()}_historical_data.csv'))
+
+    loaded = load_price_panel(str(tmp_path))
+
+    assert list(loaded['Close'].columns) == ['AAA', 'BBB']
+    # BBB has no bars before its listing
+    assert len(loaded['Close']) == 600 and loaded['Close']['BBB'].iloc[:200].isna().all()
+    assert loaded['Close']['AAA'].iloc[-1] == 1.0
+    np.testing.assert_array_equal(loaded['High']['AAA'].to_numpy(), panel['High']['AAA'].to_numpy())
@@ -0,0 +1,86 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_store import save_cleaned_data
+from panel_metrics import FINANCIAL_METRICS, load_returns_panel, panel_financial_metrics
+
+# Largest accepted difference to the per-ticker pandas computation, relative to the
+# value (or absolute below 1)
+TOLERANCE = 1e-9
+
+# (risk-free rate, trading days) settings compared
+SETTINGS = [(0.0, 252), (0.04, 252), (0.02, 365)]
+
+
+def reference_metrics(returns, risk_free_rate, trading_days):
+    """One ticker's metrics from separate pandas passes, as calculate_financial_metrics did per file."""
+    daily_returns = returns.dropna()
+    daily_risk_free = risk_free_rate / trading_days
+    excess_return = (daily_returns.mean() - daily_risk_free) * trading_days
+    annualized_volatility = daily_returns.std() * np.sqrt(trading_days)
+    excess = daily_returns - daily_risk_free
+
+    # Wealth from a start value of 1; missing returns leave it unchanged
+    wealth = pd.concat([pd.Series([1.0]), (1 + returns.fillna(0.0)).cumprod()], ignore_index=True)
+    running_max = wealth.cummax()
+    max_drawdown = ((wealth - running_max) / running_max).min()
+    underwater = wealth < running_max
+    runs = underwater.groupby((~underwater).cumsum()).sum()
+    years = len(daily_returns) / trading_days
+    compound_growth = wealth.iloc[-1] ** (1 / years) - 1
+
+    return {
+        'Annualized Return': daily_returns.mean() * trading_days,
+        'Annualized Volatility': annualized_volatility,
+        'Sharpe Ratio': excess_return / annualized_volatility,
+        'Sortino Ratio': excess_return / (excess[excess < 0].std() * np.sqrt(trading_days)),
+        'Max Drawdown': max_drawdown,
+        'Max Drawdown Duration': runs.max(),
+        'Calmar Ratio': compound_growth / -max_drawdown if max_drawdown < 0 else np.nan,
+        'Skewness': daily_returns.skew(),
+        'Kurtosis': daily_returns.kurt(),
+        'Hit Rate': (daily_returns > 0).mean(),
+    }
+
+
+def synthetic_returns(shape=(600, 40), seed=0):
+    """Returns with late listings, a gap, a flat ticker and a short ticker."""
+    rng = np.random.default_rng(seed)
+    returns = pd.DataFrame(rng.standard_t(4, shape) * 0.015 + 0.0004)
+    returns.iloc[:300, ::7] = np.nan
+    returns.iloc[500:520, 3] = np.nan
+    returns.iloc[:, 5] = 0.001
+    returns.iloc[:-2, 6] = np.nan
+    return returns
+
+
+@pytest.mark.parametrize('risk_free_rate, trading_days', SETTINGS)
+def test_panel_metrics_match_per_ticker_pandas(risk_free_rate, trading_days):
+    returns = synthetic_returns()
+
+    actual = panel_financial_metrics(returns, risk_free_rate, trading_days).astype(float)
+
+    expected = pd.DataFrame({ticker: reference_metrics(returns[ticker], risk_free_rate, trading_days)
+                             for ticker in returns.columns}).T[FINANCIAL_METRICS].astype(float)
+    for metric in FINANCIAL_METRICS:
+        a, e = actual[metric].to_numpy(), expected[metric].to_numpy()
+        finite = np.isfinite(e)
+        np.testing.assert_array_equal(np.isfinite(a), finite, err_msg=f"{metric}: undefined values differ")
+        difference = np.abs(a[finite] - e[finite]) / np.maximum(np.abs(e[finite]), 1.0)
+        assert difference.max(initial=0.0) <= TOLERANCE, metric
+
+
+def test_returns_run_from_each_ticker_previous_bar(tmp_path):
+    dates = pd.bdate_range('2023-01-02', periods=6)
+    bars = {'aaa': [10.0, 11.0, 12.1, 12.1, 13.31, 14.641], 'bbb': [np.nan, 20.0, 22.0, np.nan, 24.2, 26.62]}
+    for ticker, closes in bars.items():
+        prices = pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'Close': closes}).dropna()
+        prices = prices.assign(Open=prices['Close'], High=prices['Close'], Low=prices['Close'], Volume=1000)
+        save_cleaned_data(prices, str(tmp_path / f'{ticker}_historical_data.csv'))
+
+    returns = load_returns_panel(str(tmp_path))
+
+    np.testing.assert_allclose(returns['AAA'], [np.nan, 0.1, 0.1, 0.0, 0.1, 0.1])
+    # BBB's return after its missing day runs from the bar before it
+    np.testing.assert_allclose(returns['BBB'], [np.nan, np.nan, 0.1, np.nan, 0.1, 0.1])
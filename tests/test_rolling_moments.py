@@ -0,0 +1,109 @@
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.lib.stride_tricks import sliding_window_view
+
+from rolling_moments import ROLLING_STATISTICS, rolling_moments
+
+# Windows compared
+WINDOWS = [5, 20, 60]
+
+# Largest accepted error per statistic: relative to the variance for 'var', to the
+# standard deviation for 'std', 'mean' and 'zscore' (in units of std), to the product of
+# the standard deviations for 'cov', absolute for 'corr' and 'skew'
+TOLERANCES = {'mean': 1e-9, 'var': 1e-7, 'std': 1e-7, 'cov': 1e-8, 'corr': 1e-7, 'skew': 1e-4, 'zscore': 1e-7}
+
+
+def reference_moments(x, y, window):
+    """Every rolling statistic from a two-pass formula over each window separately."""
+    windows_x = sliding_window_view(x, window, axis=0)
+    windows_y = sliding_window_view(y, window, axis=0)
+    deviations_x = windows_x - windows_x.mean(axis=-1, keepdims=True)
+    deviations_y = windows_y - windows_y.mean(axis=-1, keepdims=True)
+    variance_x = (deviations_x ** 2).sum(axis=-1) / (window - 1)
+    variance_y = (deviations_y ** 2).sum(axis=-1) / (window - 1)
+    constant_x = (windows_x == windows_x[..., :1]).all(axis=-1)
+    constant_y = (windows_y == windows_y[..., :1]).all(axis=-1)
+    variance_x[constant_x] = 0.0
+    variance_y[constant_y] = 0.0
+    second = (deviations_x ** 2).mean(axis=-1)
+    third = (deviations_x ** 3).mean(axis=-1)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        skew = np.sqrt(window * (window - 1.0)) / (window - 2.0) * third / second ** 1.5
+        skew[constant_x] = 0.0
+        covariance = (deviations_x * deviations_y).sum(axis=-1) / (window - 1)
+        correlation = covariance / np.sqrt(variance_x * variance_y)
+        correlation[constant_x | constant_y] = np.nan
+        zscore = deviations_x[..., -1] / np.sqrt(variance_x)
+        zscore[constant_x] = np.nan
+
+    statistics = {'mean': windows_x.mean(axis=-1), 'var': variance_x, 'std': np.sqrt(variance_x), 'cov': covariance,
+                  'corr': correlation, 'skew': skew, 'zscore': zscore}
+    padding = np.full((window - 1, x.shape[1]), np.nan)
+    padded = {name: np.concatenate([padding, values]) for name, values in statistics.items()}
+    return padded, np.concatenate([padding, np.sqrt(variance_x)]), np.concatenate([padding, np.sqrt(variance_y)])
+
+
+def assert_matches_reference(x, y, result):
+    """Check the engine's (statistic, window) arrays against the two-pass reference."""
+    for window in WINDOWS:
+        reference, std_x, std_y = reference_moments(x, y, window)
+        scales = {'mean': std_x, 'var': std_x ** 2, 'std': std_x, 'cov': std_x * std_y, 'corr': 1.0, 'skew': 1.0, 'zscore': 1.0}
+        for statistic in ROLLING_STATISTICS:
+            actual, expected = result[statistic, window], reference[statistic]
+            label = f"{statistic} {window}"
+            np.testing.assert_array_equal(np.isnan(actual), np.isnan(expected), err_msg=f"{label}: missing values differ")
+            with np.errstate(invalid='ignore', divide='ignore'):
+                error = np.abs(actual - expected) / np.broadcast_to(scales[statistic], expected.shape)
+            error = error[~np.isnan(expected) & np.isfinite(error)]
+            assert error.max(initial=0.0) <= TOLERANCES[statistic], label
+
+
+def synthetic_panel(rows=600, columns=20, seed=0):
+    """Closes and volumes with a late listing, gaps and a flat stretch."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range('2020-01-01', periods=rows)
+    close = pd.DataFrame(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, (rows, columns)), axis=0)), index=dates)
+    volume = pd.DataFrame(rng.uniform(1e6, 1e8, (rows, columns)), index=dates)
+    close.iloc[:50, 3] = np.nan
+    close.iloc[300:310, 5] = np.nan
+    volume.iloc[400:405, 7] = np.nan
+    close.iloc[200:230, 9] = 42.0
+    return close, volume
+
+
+def test_panel_matches_two_pass_reference_across_column_chunks():
+    close, volume = synthetic_panel()
+
+    moments = rolling_moments(close, volume, windows=WINDOWS, column_chunk=8).sort_index(axis=1)
+
+    result = {(statistic, window): moments[statistic, window].to_numpy() for statistic in ROLLING_STATISTICS for window in WINDOWS}
+    assert_matches_reference(close.to_numpy(), volume.to_numpy(), result)
+
+
+def test_series_matches_two_pass_reference_and_pandas():
+    close, volume = synthetic_panel()
+    x, y = close[9], volume[9]
+
+    moments = rolling_moments(x, y, windows=WINDOWS)
+
+    result = {key: moments[key].to_numpy()[:, np.newaxis] for key in moments.columns}
+    assert_matches_reference(x.to_frame().to_numpy(), y.to_frame().to_numpy(), result)
+    rolling = x.rolling(20)
+    np.testing.assert_allclose(moments['std', 20], rolling.std(), rtol=1e-7)
+    np.testing.assert_allclose(moments['mean', 20], rolling.mean(), rtol=1e-12)
+
+
+@pytest.mark.parametrize('arguments', [
+    {'statistics': ['kurt']},
+    {'statistics': ['corr']},
+    {'windows': []},
+    {'windows': [0]},
+    {'windows': [2.5]},
+])
+def test_invalid_arguments_are_rejected(arguments):
+    close, _ = synthetic_panel()
+
+    with pytest.raises(ValueError):
+        rolling_moments(close, **arguments)
@@ -0,0 +1,80 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import sentiment_cache
+from sentiment_cache import cache_path, hash_headlines, lookup_scores, store_scores
+
+HEADLINES = pd.Series(['Stocks rally on earnings', 'Shares slump after downgrade', 'Market flat'], dtype=object)
+
+SCORES = np.array([[0.0, 0.5, 0.5, 0.6], [0.4, 0.6, 0.0, -0.5], [0.0, 1.0, 0.0, 0.0]])
+
+
+@pytest.fixture(autouse=True)
+def fresh_process_cache():
+    # Every test starts as a new process would, with nothing read yet
+    sentiment_cache._loaded_caches.clear()
+    yield
+    sentiment_cache._loaded_caches.clear()
+
+
+def test_stored_scores_are_served_after_reload(tmp_path):
+    hashes = hash_headlines(HEADLINES)
+    store_scores(hashes[:2], HEADLINES[:2], SCORES[:2], 'vader', str(tmp_path))
+    sentiment_cache._loaded_caches.clear()
+
+    scores, hits = lookup_scores(hashes, HEADLINES, 'vader', str(tmp_path))
+
+    assert hits.tolist() == [True, True, False]
+    np.testing.assert_array_equal(scores[:2], SCORES[:2])
+    assert np.isnan(scores[2]).all()
+    assert not list(tmp_path.glob('*.tmp')) and not list(tmp_path.glob('*.lock'))
+
+
+def test_store_keeps_entries_written_by_another_run(tmp_path):
+    hashes = hash_headlines(HEADLINES)
+    store_scores(hashes[:1], HEADLINES[:1], SCORES[:1], 'vader', str(tmp_path))
+    # A second run that loaded the cache before the first one stored its scores
+    sentiment_cache._loaded_caches[cache_path('vader', str(tmp_path))] = sentiment_cache._read_cache(str(tmp_path / 'missing.parquet'))
+    store_scores(hashes[1:], HEADLINES[1:], SCORES[1:], 'vader', str(tmp_path))
+    sentiment_cache._loaded_caches.clear()
+
+    _, hits = lookup_scores(hashes, HEADLINES, 'vader', str(tmp_path))
+
+    assert hits.all()
+
+
+def test_duplicate_hashes_in_the_file_are_tolerated(tmp_path):
+    hashes = hash_headlines(HEADLINES)
+    store_scores(hashes, HEADLINES, SCORES, 'vader', str(tmp_path))
+    path = cache_path('vader', str(tmp_path))
+    stored = pd.read_parquet(path)
+    pd.concat([stored, stored]).to_parquet(path, index=False)
+    sentiment_cache._loaded_caches.clear()
+
+    scores, hits = lookup_scores(hashes, HEADLINES, 'vader', str(tmp_path))
+
+    assert hits.all()
+    np.testing.assert_array_equal(scores, SCORES)
+
+
+def test_hash_collision_is_a_miss(tmp_path):
+    hashes = hash_headlines(HEADLINES)
+    # Another headline stored under the first headline's hash
+    store_scores(hashes[:1], pd.Series(['Something else entirely']), SCORES[1:2], 'vader', str(tmp_path))
+
+    scores, hits = lookup_scores(hashes[:1], HEADLINES[:1], 'vader', str(tmp_path))
+
+    assert not hits.any()
+    assert np.isnan(scores).all()
+
+
+def test_cache_file_without_text_is_ignored(tmp_path):
+    hashes = hash_headlines(HEADLINES)
+    legacy = pd.DataFrame(SCORES, columns=sentiment_cache.SCORE_COLUMNS)
+    legacy.insert(0, 'hash', hashes)
+    legacy.to_parquet(cache_path('vader', str(tmp_path)), index=False)
+
+    _, hits = lookup_scores(hashes, HEADLINES, 'vader', str(tmp_path))
+
+    assert not hits.any()
@@ -0,0 +1,62 @@
+import collections
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sentiment_cache
+import sentiment_scoring
+from sentiment_cache import SCORE_COLUMNS
+from sentiment_scoring import score_headlines
+
+# Syndicated headlines repeat across rows; one is missing
+HEADLINES = pd.Series(
+    ['Apple beats estimates', 'Tesla recalls cars', 'Apple beats estimates', None,
+     'Market flat ahead of Fed', 'Tesla recalls cars', 'Apple beats estimates', None],
+    index=[70, 10, 30, 20, 50, 40, 60, 0], dtype=object,
+)
+
+
+class CountingAnalyzer:
+    """Scores a headline by its length and counts how often each text is scored."""
+
+    calls = collections.Counter()
+
+    def polarity_scores(self, text):
+        CountingAnalyzer.calls[text] += 1
+        return {'neg': 0.0, 'neu': 1.0, 'pos': 0.0, 'compound': len(text) / 100}
+
+
+@pytest.fixture(autouse=True)
+def counting_analyzer(monkeypatch):
+    CountingAnalyzer.calls.clear()
+    monkeypatch.setattr(sentiment_scoring, 'make_analyzer', lambda implementation: CountingAnalyzer())
+    sentiment_cache._loaded_caches.clear()
+    yield
+    sentiment_cache._loaded_caches.clear()
+
+
+@pytest.mark.parametrize('use_cache', [False, True])
+def test_repeated_headlines_are_scored_once_and_broadcast(tmp_path, use_cache):
+    scores = score_headlines(HEADLINES, workers=1, use_cache=use_cache, cache_folder=str(tmp_path))
+
+    assert CountingAnalyzer.calls == {'Apple beats estimates': 1, 'Tesla recalls cars': 1, 'nan': 1,
+                                      'Market flat ahead of Fed': 1}
+    assert list(scores.columns) == SCORE_COLUMNS
+    pd.testing.assert_index_equal(scores.index, HEADLINES.index)
+    # Missing headlines are scored as the text 'nan'
+    expected = HEADLINES.fillna('nan').map(lambda text: len(text) / 100)
+    np.testing.assert_array_equal(scores['compound'], expected)
+
+
+def test_cached_headlines_are_not_scored_again(tmp_path):
+    first = score_headlines(HEADLINES, workers=1, cache_folder=str(tmp_path))
+    sentiment_cache._loaded_caches.clear()
+
+    # The same headlines in another order, plus one new one
+    headlines = pd.concat([HEADLINES.iloc[::-1], pd.Series(['Apple beats estimates again'], index=[99])])
+    second = score_headlines(headlines, workers=1, cache_folder=str(tmp_path))
+
+    assert sum(CountingAnalyzer.calls.values()) == 5
+    pd.testing.assert_frame_equal(second.loc[HEADLINES.index], first)
+    assert second.loc[99, 'compound'] == len('Apple beats estimates again') / 100
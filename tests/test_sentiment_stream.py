@@ -0,0 +1,179 @@
+import threading
+
+import pandas as pd
+import pytest
+
+from array_vader import ArrayVader
+from news_index import NewsIndex
+from sentiment_stream import SentimentStream, tail_csv
+
+HEADER = 'headline,publisher,stock,date\n'
+
+# Records in arrival order: two tickers over two days, with a late AAPL headline and a
+# record without a valid timestamp
+RECORDS = [
+    {'headline': 'Apple shares rise after strong earnings', 'publisher': 'A', 'stock': 'AAPL', 'date': '2020-06-01 09:30:00'},
+    {'headline': 'Tesla recalls vehicles over safety defect', 'publisher': 'B', 'stock': 'TSLA', 'date': '2020-06-01 10:00:00'},
+    {'headline': 'Apple faces terrible supply problems', 'publisher': 'A', 'stock': 'AAPL', 'date': '2020-06-01 16:00:00'},
+    {'headline': 'Great quarter for Tesla', 'publisher': 'C', 'stock': 'TSLA', 'date': '2020-06-02 08:00:00'},
+    {'headline': 'Apple wins a good contract', 'publisher': 'B', 'stock': 'AAPL', 'date': '2020-06-02 12:00:00'},
+    {'headline': 'Apple analysts are not happy', 'publisher': 'C', 'stock': 'AAPL', 'date': '2020-06-01 11:00:00'},
+    {'headline': 'Apple stock is great', 'publisher': 'A', 'stock': 'AAPL', 'date': 'not a date'},
+    {'headline': 'Tesla shares plunge', 'publisher': 'A', 'stock': 'TSLA', 'date': '2020-06-02 15:45:00'},
+]
+
+HALF_LIFE = pd.Timedelta(hours=12)
+
+# Headlines around the weekend of 2020-06-06: Friday after the close, Saturday, Sunday,
+# Monday before the close, one without a headline and one after the last session
+WEEKEND_RECORDS = [
+    {'headline': 'Apple shares rise after strong earnings', 'stock': 'AAPL', 'date': '2020-06-05 10:00:00'},
+    {'headline': 'Apple faces terrible supply problems', 'stock': 'AAPL', 'date': '2020-06-05 17:30:00'},
+    {'headline': 'Tesla recalls vehicles over safety defect', 'stock': 'TSLA', 'date': '2020-06-06 12:00:00'},
+    {'headline': 'Apple wins a good contract', 'stock': 'AAPL', 'date': '2020-06-07 09:00:00'},
+    {'headline': None, 'stock': 'AAPL', 'date': '2020-06-08 09:00:00'},
+    {'headline': 'Great quarter for Tesla', 'stock': 'TSLA', 'date': '2020-06-08 15:59:00'},
+    {'headline': 'Tesla shares plunge', 'stock': 'TSLA', 'date': '2020-06-09 16:00:00'},
+]
+
+# Price dates of both tickers: Friday, Monday and Tuesday
+PRICE_DATES = pd.to_datetime(['2020-06-05', '2020-06-08', '2020-06-09'])
+
+
+def reference_aggregates(records, half_life):
+    """Daily means with groupby and decayed means recomputed from scratch per record."""
+    data = pd.DataFrame(records)
+    data['date'] = pd.to_datetime(data['date'], errors='coerce')
+    data['score'] = ArrayVader().polarity_scores(data['headline'])['compound'].to_numpy()
+    data = data[data['date'].notna()].reset_index(drop=True)
+    data['day'] = data['date'].dt.normalize()
+
+    decayed = {}
+    for k, row in data.iterrows():
+        seen = data.iloc[:k + 1]
+        seen = seen[seen['stock'] == row['stock']]
+        weights = 0.5 ** ((seen['date'].max() - seen['date']) / half_life)
+        decayed[row['stock'], row['day']] = (weights * seen['score']).sum() / weights.sum()
+
+    grouped = data.groupby(['stock', 'day'])['score']
+    expected = pd.DataFrame({'sentiment_score': grouped.mean(), 'count': grouped.size()}).reset_index()
+    expected['decayed_sentiment'] = [decayed[key] for key in zip(expected['stock'], expected['day'])]
+    return expected.rename(columns={'day': 'date'})
+
+
+@pytest.mark.parametrize('batch_size', [1, 3, len(RECORDS)])
+def test_aggregates_match_batch_computation(batch_size):
+    stream = SentimentStream(half_life=HALF_LIFE)
+    for start in range(0, len(RECORDS), batch_size):
+        stream.update(RECORDS[start:start + batch_size])
+
+    actual = stream.daily_aggregates()
+    expected = reference_aggregates(RECORDS, HALF_LIFE)
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+
+
+def test_update_returns_only_touched_days():
+    stream = SentimentStream(half_life=HALF_LIFE)
+    stream.update(RECORDS[:4])
+
+    scored, aggregates = stream.update(RECORDS[4:6])
+
+    assert len(scored) == 2
+    assert aggregates[['stock', 'date']].values.tolist() == [
+        ['AAPL', pd.Timestamp('2020-06-02')], ['AAPL', pd.Timestamp('2020-06-01')]]
+    assert aggregates['count'].tolist() == [1, 3]
+
+
+@pytest.mark.parametrize('price_dates', [PRICE_DATES, {'AAPL': PRICE_DATES, 'TSLA': PRICE_DATES}])
+def test_sessions_match_batch_aggregation_across_weekend(price_dates):
+    stream = SentimentStream(half_life=HALF_LIFE, price_dates=price_dates)
+    for record in WEEKEND_RECORDS:
+        stream.update(record)
+
+    news = pd.DataFrame(WEEKEND_RECORDS)
+    news['date'] = pd.to_datetime(news['date'])
+    news['sentiment_score'] = ArrayVader().polarity_scores(news['headline'].fillna(''))['compound'].to_numpy()
+    news_index = NewsIndex(news)
+    expected = pd.concat([news_index.session_mean(stock, 'sentiment_score', PRICE_DATES).assign(stock=stock)
+                          for stock in ['AAPL', 'TSLA']], ignore_index=True)
+
+    actual = stream.daily_aggregates()
+    pd.testing.assert_frame_equal(actual[['stock', 'date', 'sentiment_score']],
+                                  expected[['stock', 'date', 'sentiment_score']], check_dtype=False)
+    # The Friday after-hours and weekend headlines count for Monday; the last one is left out
+    assert actual['date'].tolist() == list(pd.to_datetime(['2020-06-05', '2020-06-08', '2020-06-08']))
+    assert actual['count'].tolist() == [1, 3, 2]
+
+
+class LengthScorer:
+    """Scores each headline by its length, so the text it was given can be told apart."""
+
+    def polarity_scores(self, headlines):
+        return pd.DataFrame({'compound': headlines.str.len().astype(float)}, index=headlines.index)
+
+
+def test_missing_headline_is_scored_as_empty_text():
+    stream = SentimentStream(scorer=LengthScorer())
+
+    scored, _ = stream.update(WEEKEND_RECORDS[3:5])
+
+    assert scored['sentiment_score'].tolist() == [len(WEEKEND_RECORDS[3]['headline']), 0.0]
+
+
+def write_rows(path, rows, header=False):
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        f.write(HEADER if header else '')
+        f.write(''.join(f"{row['headline']},{row['publisher']},{row['stock']},{row['date']}\n" for row in rows))
+
+
+def test_tail_csv_replays_rows_and_holds_back_partial_row(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text(HEADER)
+    write_rows(path, RECORDS[:2])
+    with open(path, 'a', encoding='utf-8', newline='') as f:
+        f.write('Partial headline,A,AA')
+
+    batches = list(tail_csv(str(path), poll_interval=0.01, idle_timeout=0.1))
+
+    assert [row['stock'] for batch in batches for row in batch] == ['AAPL', 'TSLA']
+
+
+def test_tail_csv_follows_appended_rows(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text(HEADER)
+    write_rows(path, RECORDS[:2])
+    timer = threading.Timer(0.1, write_rows, (path, RECORDS[2:4]))
+    timer.start()
+
+    batches = list(tail_csv(str(path), poll_interval=0.01, from_start=False, idle_timeout=0.5))
+    timer.join()
+
+    assert [row['headline'] for batch in batches for row in batch] == [r['headline'] for r in RECORDS[2:4]]
+
+
+def test_tail_csv_waits_for_header_of_empty_file(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text('')
+    timer = threading.Timer(0.1, write_rows, (path, RECORDS[:1]), {'header': True})
+    timer.start()
+
+    batches = list(tail_csv(str(path), poll_interval=0.01, idle_timeout=0.5))
+    timer.join()
+
+    assert batches == [[{key: RECORDS[0][key] for key in ['headline', 'publisher', 'stock', 'date']}]]
+
+
+def test_tail_csv_stops_on_empty_file(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text('')
+
+    assert list(tail_csv(str(path), poll_interval=0.01, idle_timeout=0.05)) == []
+
+
+def test_tail_csv_rejects_blank_header(tmp_path):
+    path = tmp_path / 'feed.csv'
+    path.write_text('\n' + HEADER)
+
+    with pytest.raises(ValueError):
+        list(tail_csv(str(path), poll_interval=0.01, idle_timeout=0.05))
@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from news_index import NewsIndex
+from trading_calendar import session_calendar, effective_dates, next_sessions
+
+# Trading days around the July 4th weekend of 2020: Thursday the 2nd, then Monday the 6th
+# and Tuesday the 7th (Friday the 3rd was a holiday)
+PRICE_DATES = pd.to_datetime(['2020-07-07', '2020-07-01', '2020-07-02', '2020-07-06', '2020-07-02 09:30'], format='ISO8601')
+
+# Headline timestamp -> expected session (None: no session)
+CASES = {
+    'before the close': ('2020-07-01 10:15', '2020-07-01'),
+    'exactly at the cutoff': ('2020-07-01 16:00', '2020-07-02'),
+    'after hours': ('2020-07-01 19:45', '2020-07-02'),
+    'after hours before the holiday': ('2020-07-02 17:00', '2020-07-06'),
+    'on the holiday': ('2020-07-03 11:00', '2020-07-06'),
+    'on the weekend': ('2020-07-05 08:00', '2020-07-06'),
+    'date only': ('2020-07-04', '2020-07-06'),
+    'after the last session': ('2020-07-07 16:30', None),
+    'missing timestamp': (None, None),
+}
+
+
+def test_session_calendar_is_sorted_distinct_days():
+    np.testing.assert_array_equal(session_calendar(PRICE_DATES),
+                                  pd.to_datetime(['2020-07-01', '2020-07-02', '2020-07-06', '2020-07-07']).to_numpy())
+
+
+def test_effective_dates_move_headlines_from_the_cutoff_on():
+    timestamps = pd.to_datetime(['2020-07-01 15:59:59', '2020-07-01 16:00', '2020-07-03 23:00', None], format='ISO8601')
+
+    days = effective_dates(timestamps, cutoff_hour=16)
+
+    assert pd.DatetimeIndex(days).tolist()[:3] == list(pd.to_datetime(['2020-07-01', '2020-07-02', '2020-07-04']))
+    assert np.isnat(days[3])
+    # A fractional cutoff hour, 9:30
+    assert pd.DatetimeIndex(effective_dates(timestamps[:1], cutoff_hour=9.5))[0] == pd.Timestamp('2020-07-02')
+
+
+@pytest.mark.parametrize('case', list(CASES))
+def test_next_sessions_maps_each_case(case):
+    timestamp, expected = CASES[case]
+    sessions = session_calendar(PRICE_DATES)
+
+    position = next_sessions(pd.to_datetime([timestamp], format='ISO8601'), sessions)[0]
+
+    if expected is None:
+        assert position == -1
+    else:
+        assert sessions[position] == np.datetime64(expected, 'ns')
+
+
+def test_align_joins_each_headline_to_its_session_price_row():
+    news = pd.DataFrame({'date': pd.to_datetime([timestamp for timestamp, _ in CASES.values()], format='ISO8601'),
+                         'headline': list(CASES), 'stock': 'AAPL'})
+    prices = pd.DataFrame({'Date': session_calendar(PRICE_DATES), 'Close': [10.0, 11.0, 12.0, 13.0]})
+    news_index = NewsIndex(news)
+
+    aligned = news_index.align('AAPL', prices)
+
+    expected = {case: pd.Timestamp(session) for case, (_, session) in CASES.items() if session is not None}
+    assert dict(zip(aligned['headline'], aligned['Date'])) == expected
+    assert len(aligned) == len(expected)
+    assert (aligned['Close'].to_numpy() == prices.set_index('Date').loc[aligned['Date'], 'Close'].to_numpy()).all()
+    # Headlines after the last session or without a timestamp map to NaT
+    sessions = dict(zip(news_index.get('AAPL')['headline'], news_index.sessions('AAPL', prices['Date'])))
+    assert np.isnat(sessions['after the last session'])
+    assert np.isnat(sessions['missing timestamp'])